@@ -5,6 +5,20 @@ from flask_mail import Mail
 from config import CurrentConfig
 from flask_cors import CORS
 from flask_migrate import Migrate
+from utils.mail_queue import mail_queue
+from utils.smtp_pool import smtp_pool
+from utils.identity import is_token_revoked, token_version_cache, user_cache
+from utils.task_counters import task_counters
+from utils.timeseries import bucket_cache
+from utils.http_cache import response_cache
+from utils.events import event_bus
+from utils.db_pool import pool_metrics
+from utils.replica import replica_router
+from utils.password_hasher import password_hasher
+from utils.rate_limit import rate_limiter
+from utils.otp import otp_store
+from utils.refresh_tokens import refresh_tokens
+from utils.serializers import init_json
 import os
 
 jwt = JWTManager()
@@ -16,23 +30,85 @@ front_end_url = [url.strip() for url in front_end_urls]
 
 def create_app():
     app = Flask(__name__)
+    init_json(app)
     app.config["SQLALCHEMY_DATABASE_URI"] = CurrentConfig.SQLALCHEMY_DATABASE_URI
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = CurrentConfig.SQLALCHEMY_TRACK_MODIFICATIONS
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = CurrentConfig.SQLALCHEMY_ENGINE_OPTIONS
+    app.config["SQLALCHEMY_BINDS"] = CurrentConfig.SQLALCHEMY_BINDS
+    app.config["REPLICA_MAX_LAG"] = CurrentConfig.REPLICA_MAX_LAG
+    app.config["REPLICA_LAG_CHECK_INTERVAL"] = CurrentConfig.REPLICA_LAG_CHECK_INTERVAL
+    app.config["REPLICA_STICKY_SECONDS"] = CurrentConfig.REPLICA_STICKY_SECONDS
+    app.config["BCRYPT_LOG_ROUNDS"] = CurrentConfig.BCRYPT_LOG_ROUNDS
+    app.config["BCRYPT_WORKERS"] = CurrentConfig.BCRYPT_WORKERS
+    app.config["BCRYPT_QUEUE_SIZE"] = CurrentConfig.BCRYPT_QUEUE_SIZE
+    app.config["BCRYPT_QUEUE_TIMEOUT"] = CurrentConfig.BCRYPT_QUEUE_TIMEOUT
+    app.config["RATE_LIMIT_ENABLED"] = CurrentConfig.RATE_LIMIT_ENABLED
+    app.config["RATE_LIMIT_BACKEND"] = CurrentConfig.RATE_LIMIT_BACKEND
+    app.config["RATE_LIMIT_STORAGE"] = CurrentConfig.RATE_LIMIT_STORAGE
+    app.config["RATE_LIMIT_PROXY_COUNT"] = CurrentConfig.RATE_LIMIT_PROXY_COUNT
+    app.config["RATE_LIMITS"] = CurrentConfig.RATE_LIMITS
+    app.config["OTP_TTL"] = CurrentConfig.OTP_TTL
+    app.config["OTP_MAX_ATTEMPTS"] = CurrentConfig.OTP_MAX_ATTEMPTS
+    app.config["OTP_CLEANUP_EVERY"] = CurrentConfig.OTP_CLEANUP_EVERY
     app.config["SECRET_KEY"] = CurrentConfig.SECRET_KEY
     app.config["JWT_SECRET_KEY"] = CurrentConfig.JWT_SECRET_KEY
+    app.config["JWT_ACCESS_TOKEN_EXPIRES"] = CurrentConfig.JWT_ACCESS_TOKEN_EXPIRES
+    app.config["JWT_REFRESH_TOKEN_EXPIRES"] = CurrentConfig.JWT_REFRESH_TOKEN_EXPIRES
+    app.config["JWT_ACCESS_COOKIE_NAME"] = CurrentConfig.JWT_ACCESS_COOKIE_NAME
+    app.config["REFRESH_TOKEN_CLEANUP_EVERY"] = CurrentConfig.REFRESH_TOKEN_CLEANUP_EVERY
+    app.config["REFRESH_TOKEN_GRACE"] = CurrentConfig.REFRESH_TOKEN_GRACE
+    app.config["RESET_TOKEN_MAX_AGE"] = CurrentConfig.RESET_TOKEN_MAX_AGE
     app.config["MAIL_SERVER"] = CurrentConfig.MAIL_SERVER
     app.config["MAIL_PORT"] = CurrentConfig.MAIL_PORT
     app.config["MAIL_USE_TLS"] = CurrentConfig.MAIL_USE_TLS
     app.config["MAIL_USERNAME"] = CurrentConfig.MAIL_USERNAME
     app.config["MAIL_PASSWORD"] = CurrentConfig.MAIL_PASSWORD
+    app.config["MAIL_QUEUE_ENABLED"] = CurrentConfig.MAIL_QUEUE_ENABLED
+    app.config["MAIL_QUEUE_WORKERS"] = CurrentConfig.MAIL_QUEUE_WORKERS
+    app.config["MAIL_QUEUE_BATCH_SIZE"] = CurrentConfig.MAIL_QUEUE_BATCH_SIZE
+    app.config["MAIL_QUEUE_POLL_INTERVAL"] = CurrentConfig.MAIL_QUEUE_POLL_INTERVAL
+    app.config["MAIL_QUEUE_LEASE"] = CurrentConfig.MAIL_QUEUE_LEASE
+    app.config["MAIL_MAX_ATTEMPTS"] = CurrentConfig.MAIL_MAX_ATTEMPTS
+    app.config["MAIL_RETRY_BACKOFF"] = CurrentConfig.MAIL_RETRY_BACKOFF
+    app.config["MAIL_POOL_SIZE"] = CurrentConfig.MAIL_POOL_SIZE
+    app.config["MAIL_KEEPALIVE_INTERVAL"] = CurrentConfig.MAIL_KEEPALIVE_INTERVAL
+    app.config["EXPORT_BATCH_SIZE"] = CurrentConfig.EXPORT_BATCH_SIZE
+    app.config["BULK_MAX_ROWS"] = CurrentConfig.BULK_MAX_ROWS
+    app.config["ANALYTICS_CACHE_SIZE"] = CurrentConfig.ANALYTICS_CACHE_SIZE
+    app.config["ANALYTICS_CACHE_TTL"] = CurrentConfig.ANALYTICS_CACHE_TTL
+    app.config["ANALYTICS_BUCKET_GRACE"] = CurrentConfig.ANALYTICS_BUCKET_GRACE
+    app.config["HTTP_CACHE_SIZE"] = CurrentConfig.HTTP_CACHE_SIZE
+    app.config["HTTP_CACHE_TTL"] = CurrentConfig.HTTP_CACHE_TTL
+    app.config["HTTP_CACHE_BACKEND"] = CurrentConfig.HTTP_CACHE_BACKEND
+    app.config["EVENTS_BROKER"] = CurrentConfig.EVENTS_BROKER
+    app.config["EVENTS_QUEUE_SIZE"] = CurrentConfig.EVENTS_QUEUE_SIZE
+    app.config["EVENTS_KEEPALIVE"] = CurrentConfig.EVENTS_KEEPALIVE
+    app.config["GUNICORN_WORKERS"] = CurrentConfig.GUNICORN_WORKERS
     app.config["DEBUG"] = CurrentConfig.DEBUG
+    app.config["CURRENT_USER_CACHE_TTL"] = CurrentConfig.CURRENT_USER_CACHE_TTL
+    app.config["CURRENT_USER_CACHE_SIZE"] = CurrentConfig.CURRENT_USER_CACHE_SIZE
 
+    pool_metrics.init_app(app)
     db.init_app(app)
+    replica_router.init_app(app)
     jwt.init_app(app)
     mail.init_app(app)
+    smtp_pool.init_app(app)
+    mail_queue.init_app(app)
     migrate.init_app(app, db)
+    user_cache.init_app(app)
+    token_version_cache.init_app(app)
+    task_counters.init_app(app)
+    bucket_cache.init_app(app)
+    response_cache.init_app(app)
+    event_bus.init_app(app)
+    password_hasher.init_app(app)
+    rate_limiter.init_app(app)
+    otp_store.init_app(app)
+    refresh_tokens.init_app(app)
+    jwt.token_in_blocklist_loader(is_token_revoked)
     CORS(app, resources={r"/*": {"origins": front_end_url,
-            "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"], "supports_credentials": True}})
+            "methods": ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"], "supports_credentials": True}})
 
     @app.before_request
     def handle_preflight():
@@ -40,7 +116,7 @@ def create_app():
             origin = request.headers.get("Origin")
             response = make_response()
             response.headers["Access-Control-Allow-Origin"] = origin
-            response.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS"
+            response.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, PATCH, DELETE, OPTIONS"
             response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization"
             response.headers["Access-Control-Allow-Credentials"] = "true"
             return response
@@ -51,6 +127,7 @@ def create_app():
     from routes.project_routes import project_bp
     from routes.home_route import home_bp
     from routes.analytics_routes import analytics_bp
+    from routes.event_routes import event_bp
 
     app.register_blueprint(home_bp, url_prefix="/")
     app.register_blueprint(auth_bp, url_prefix="/auth")
@@ -58,6 +135,7 @@ def create_app():
     app.register_blueprint(task_bp, url_prefix="/tasks")
     app.register_blueprint(project_bp, url_prefix="/projects")
     app.register_blueprint(analytics_bp, url_prefix="/analytics")
+    app.register_blueprint(event_bp, url_prefix="/events")
 
     return app
 
@@ -1,5 +1,7 @@
 import os
+from datetime import timedelta
 from dotenv import load_dotenv
+from sqlalchemy.pool import NullPool
 
 load_dotenv()
 
@@ -10,6 +12,12 @@ class Config:
     """
     SECRET_KEY = os.getenv("SECRET_KEY")
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
+    JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=int(os.getenv("JWT_ACCESS_TOKEN_MINUTES", 15)))
+    JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=int(os.getenv("JWT_REFRESH_TOKEN_DAYS", 7)))
+    JWT_ACCESS_COOKIE_NAME = "access_token"
+    REFRESH_TOKEN_CLEANUP_EVERY = int(os.getenv("REFRESH_TOKEN_CLEANUP_EVERY", 100))
+    REFRESH_TOKEN_GRACE = int(os.getenv("REFRESH_TOKEN_GRACE", 30))
+    RESET_TOKEN_MAX_AGE = int(os.getenv("RESET_TOKEN_MAX_AGE", 3600))
     
     MAIL_SERVER = os.getenv("MAIL_SERVER")
     MAIL_PORT = int(os.getenv("MAIL_PORT", 587))
@@ -17,6 +25,92 @@ class Config:
     MAIL_USERNAME = os.getenv("MAIL_USERNAME")
     MAIL_PASSWORD = os.getenv("MAIL_PASSWORD")
 
+    MAIL_QUEUE_ENABLED = os.getenv("MAIL_QUEUE_ENABLED", "True") == "True"
+    MAIL_QUEUE_WORKERS = int(os.getenv("MAIL_QUEUE_WORKERS", 2))
+    MAIL_QUEUE_BATCH_SIZE = int(os.getenv("MAIL_QUEUE_BATCH_SIZE", 50))
+    MAIL_QUEUE_POLL_INTERVAL = float(os.getenv("MAIL_QUEUE_POLL_INTERVAL", 10))
+    MAIL_QUEUE_LEASE = int(os.getenv("MAIL_QUEUE_LEASE", 60))
+    MAIL_MAX_ATTEMPTS = int(os.getenv("MAIL_MAX_ATTEMPTS", 5))
+    MAIL_RETRY_BACKOFF = int(os.getenv("MAIL_RETRY_BACKOFF", 30))
+    MAIL_POOL_SIZE = int(os.getenv("MAIL_POOL_SIZE", 2))
+    MAIL_KEEPALIVE_INTERVAL = int(os.getenv("MAIL_KEEPALIVE_INTERVAL", 60))
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 1000))
+    BULK_MAX_ROWS = int(os.getenv("BULK_MAX_ROWS", 10000))
+    ANALYTICS_CACHE_SIZE = int(os.getenv("ANALYTICS_CACHE_SIZE", 4096))
+    ANALYTICS_CACHE_TTL = float(os.getenv("ANALYTICS_CACHE_TTL", 86400))
+    ANALYTICS_BUCKET_GRACE = int(os.getenv("ANALYTICS_BUCKET_GRACE", 300))
+    HTTP_CACHE_SIZE = int(os.getenv("HTTP_CACHE_SIZE", 512))
+    HTTP_CACHE_TTL = float(os.getenv("HTTP_CACHE_TTL", 300))
+    HTTP_CACHE_BACKEND = os.getenv("HTTP_CACHE_BACKEND", "utils.identity.TTLCache")
+    EVENTS_BROKER = os.getenv("EVENTS_BROKER")
+    EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", 100))
+    EVENTS_KEEPALIVE = int(os.getenv("EVENTS_KEEPALIVE", 15))
+    GUNICORN_BIND = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+    GUNICORN_WORKER_CLASS = os.getenv("GUNICORN_WORKER_CLASS", "gevent")
+    GUNICORN_WORKERS = int(os.getenv("GUNICORN_WORKERS", 4))
+    GUNICORN_WORKER_CONNECTIONS = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", 1000))
+    GUNICORN_TIMEOUT = int(os.getenv("GUNICORN_TIMEOUT", 30))
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 5))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 10))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    DB_STATEMENT_TIMEOUT = int(os.getenv("DB_STATEMENT_TIMEOUT", 30000))
+    DB_PGBOUNCER = os.getenv("DB_PGBOUNCER") == "True"
+    REPLICA_MAX_LAG = float(os.getenv("REPLICA_MAX_LAG", 5))
+    REPLICA_LAG_CHECK_INTERVAL = float(os.getenv("REPLICA_LAG_CHECK_INTERVAL", 1))
+    REPLICA_STICKY_SECONDS = float(os.getenv("REPLICA_STICKY_SECONDS", 5))
+    BCRYPT_LOG_ROUNDS = int(os.getenv("BCRYPT_LOG_ROUNDS", 12))
+    BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", max(1, (os.cpu_count() or 1) // GUNICORN_WORKERS)))
+    BCRYPT_QUEUE_SIZE = int(os.getenv("BCRYPT_QUEUE_SIZE", 16))
+    BCRYPT_QUEUE_TIMEOUT = float(os.getenv("BCRYPT_QUEUE_TIMEOUT", 2))
+    RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "True") == "True"
+    RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "utils.rate_limit.MemoryBackend")
+    RATE_LIMIT_STORAGE = os.getenv("RATE_LIMIT_STORAGE", "rate_limit.db")
+    RATE_LIMIT_PROXY_COUNT = int(os.getenv("RATE_LIMIT_PROXY_COUNT", 0))
+    RATE_LIMITS = {
+        "login": os.getenv("RATE_LIMIT_LOGIN", "ip=30/minute, email=5/minute"),
+        "send_otp": os.getenv("RATE_LIMIT_SEND_OTP", "ip=10/minute, email=3/minute"),
+        "forgot_password": os.getenv("RATE_LIMIT_FORGOT_PASSWORD", "ip=10/minute, email=3/hour"),
+        "subscribe": os.getenv("RATE_LIMIT_SUBSCRIBE", "ip=10/minute, email=3/hour"),
+    }
+    OTP_TTL = int(os.getenv("OTP_TTL", 600))
+    OTP_MAX_ATTEMPTS = int(os.getenv("OTP_MAX_ATTEMPTS", 5))
+    OTP_CLEANUP_EVERY = int(os.getenv("OTP_CLEANUP_EVERY", 100))
+
+    CURRENT_USER_CACHE_TTL = float(os.getenv("CURRENT_USER_CACHE_TTL", 5))
+    CURRENT_USER_CACHE_SIZE = int(os.getenv("CURRENT_USER_CACHE_SIZE", 1024))
+
+def engine_options(database_uri, pool_size, max_overflow):
+    """Build ``SQLALCHEMY_ENGINE_OPTIONS`` for ``database_uri``.
+
+    ``pool_size`` and ``max_overflow`` are per worker process, so a server may
+    open up to ``GUNICORN_WORKERS * (pool_size + max_overflow)`` connections.
+    With ``DB_PGBOUNCER`` the app connects through PgBouncer in transaction
+    mode: PgBouncer does the pooling, so the app keeps no connections of its
+    own and sends no startup options; set the statement timeout on the
+    database role instead. psycopg2 never uses server-side prepared statements,
+    so nothing else has to be turned off.
+    """
+    if not database_uri or database_uri.startswith("sqlite"):
+        return {"pool_pre_ping": True}
+    if Config.DB_PGBOUNCER:
+        return {"poolclass": NullPool}
+
+    options = {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": Config.DB_POOL_TIMEOUT,
+        "pool_recycle": Config.DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
+    if Config.DB_STATEMENT_TIMEOUT:
+        options["connect_args"] = {"options": f"-c statement_timeout={Config.DB_STATEMENT_TIMEOUT}"}
+    return options
+
+def replica_binds(replica_uri):
+    """Build ``SQLALCHEMY_BINDS`` with a ``replica`` bind when a replica URI is set."""
+    return {"replica": replica_uri} if replica_uri else {}
+
 class DevelopmentConfig(Config):
     """Configuration for the development environment.
 
@@ -24,7 +118,9 @@ class DevelopmentConfig(Config):
     """
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = os.getenv("DEV_DATABASE_URL")
+    SQLALCHEMY_BINDS = replica_binds(os.getenv("DEV_REPLICA_DATABASE_URL"))
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI, Config.DB_POOL_SIZE, Config.DB_MAX_OVERFLOW)
 
 class ProductionConfig(Config):
     """Configuration for the production environment.
@@ -33,7 +129,9 @@ class ProductionConfig(Config):
     """
     DEBUG = False
     SQLALCHEMY_DATABASE_URI = os.getenv("PROD_DATABASE_URL")
-    SQLALCHEMY_TRACK_MODIFICATIONS = False 
+    SQLALCHEMY_BINDS = replica_binds(os.getenv("PROD_REPLICA_DATABASE_URL"))
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI, Config.DB_POOL_SIZE, Config.DB_MAX_OVERFLOW)
 
 env = os.getenv("FLASK_ENV", "development")
 CurrentConfig = ProductionConfig if env == "production" else DevelopmentConfig
@@ -1,37 +1,62 @@
-from flask import jsonify
+from flask import jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from models.task import Task
+from sqlalchemy import and_, case, func, or_
+from models import db
+from models.counter import TaskCounter
+from models.task import Task, TaskHistory
 from models.user import User
+from utils.http_cache import response_cache
+from utils.security import current_role
+from utils.timeseries import (
+    INTERVALS, as_date, bucket_expression, bucket_start, cached_buckets, parse_range, seconds_between,
+)
+
+COMPLETED_TRANSITION = and_(
+    TaskHistory.new_status == "Completed",
+    func.coalesce(TaskHistory.old_status, "") != "Completed",
+)
 
 @jwt_required()
+@response_cache.cached("user", "task", "task_counter")
 def analytics():
     """
     Retrieve analytics for team leaders/admin or users.
     This function retrieves the analytics data for team leaders, including the total tasks,
     completed tasks, due tasks, and productivity percentage for each user in the system.
     It ensures that only users with the role of "team_leader" can access this data.
+    Counts are read from the per-user rows of the task_counter table, which are kept
+    up to date by every task write, so the cost depends on the number of users only.
     Returns:
         Response: A JSON response containing the analytics data for each user if the
                     requesting user is a team leader. Otherwise, returns an error message
                     with a 403 status code.
     """
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    role = current_role()
+
+    rows = (
+        db.session.query(
+            User.id,
+            User.username,
+            func.coalesce(TaskCounter.total, 0),
+            func.coalesce(TaskCounter.completed, 0),
+            func.coalesce(TaskCounter.pending, 0),
+        )
+        .outerjoin(TaskCounter, and_(TaskCounter.scope == "user", TaskCounter.scope_id == User.id))
+        .order_by(User.id)
+        .all()
+    )
+
+    pending_tasks = next((pending for uid, _, _, _, pending in rows if uid == user_id), 0)
 
     user_stats = []
-    users = User.query.all()
-    
-    for u in users:
-        total_tasks = Task.query.filter_by(assigned_to=u.id).count()
-        completed_tasks = Task.query.filter_by(assigned_to=u.id, status="Completed").count()
-        due_tasks = Task.query.filter(Task.assigned_to == u.id, Task.status == "Pending").count()
+    for uid, username, total_tasks, completed_tasks, due_tasks in rows:
         productivity = (completed_tasks / total_tasks * 100) if total_tasks else 0
-        pending_tasks = Task.query.filter_by(assigned_to=user_id, status="Pending").count()
-        
-        if user.role in ["admin", "team_leader"]:
+
+        if role in ["admin", "team_leader"]:
             user_stats.append({"analytics": {
-                "user_id": u.id,
-                "username": u.username,
+                "user_id": uid,
+                "username": username,
                 "total_tasks": total_tasks,
                 "completed_tasks": completed_tasks,
                 "due_tasks": due_tasks,
@@ -46,3 +71,212 @@ def analytics():
             }})
 
     return jsonify({"analytics": user_stats}), 200
+
+
+def _series_user():
+    """
+    Return the user a time series is restricted to, and an error response if any.
+
+    Admins and team leaders may pass any ``user_id`` or none for the whole team;
+    other users only ever see their own series.
+    """
+    user_id = request.args.get("user_id", type=int)
+    if current_role() in ["admin", "team_leader"]:
+        return user_id, None
+    if user_id is not None and user_id != get_jwt_identity():
+        return None, (jsonify({"error": "Unauthorized"}), 403)
+    return get_jwt_identity(), None
+
+
+@jwt_required()
+def throughput():
+    """
+    Number of tasks moved to "Completed" per day or week.
+
+    Query parameters: ``interval`` (day|week), ``start`` and ``end`` (YYYY-MM-DD)
+    and, for admins and team leaders, ``user_id``.
+
+    Returns:
+        Response: A JSON response with one ``{"bucket", "completed"}`` entry per bucket.
+    """
+    interval, buckets = parse_range()
+    user_id, error = _series_user()
+    if error:
+        return error
+
+    dialect = db.session.get_bind().dialect.name
+    end = bucket_start(buckets[-1]) + INTERVALS[interval]
+
+    def compute(first):
+        bucket = bucket_expression(TaskHistory.timestamp, interval, dialect)
+        query = db.session.query(bucket, func.count()).filter(
+            COMPLETED_TRANSITION,
+            TaskHistory.timestamp >= bucket_start(first),
+            TaskHistory.timestamp < end,
+        )
+        if user_id is not None:
+            query = query.filter(TaskHistory.new_assignee == user_id)
+        counts = {as_date(b): n for b, n in query.group_by(bucket)}
+        return {b: counts.get(b, 0) for b in buckets if b >= first}
+
+    values = cached_buckets(("throughput", user_id), interval, buckets, compute)
+    return jsonify({
+        "interval": interval,
+        "user_id": user_id,
+        "throughput": [{"bucket": b.isoformat(), "completed": values[b]} for b in buckets],
+    }), 200
+
+
+@jwt_required()
+def cycle_time():
+    """
+    Time from "Pending" to "Completed" for the tasks completed in each bucket.
+
+    The start of a cycle is the latest transition to "Pending" before the
+    completion, found with a running MAX over the task's history; tasks that
+    never went through such a transition fall back to their creation time.
+
+    Returns:
+        Response: A JSON response with ``completed``, ``avg_hours`` and ``max_hours`` per bucket.
+    """
+    interval, buckets = parse_range()
+    user_id, error = _series_user()
+    if error:
+        return error
+
+    dialect = db.session.get_bind().dialect.name
+    end = bucket_start(buckets[-1]) + INTERVALS[interval]
+
+    def compute(first):
+        start = bucket_start(first)
+        completed_tasks = db.session.query(TaskHistory.task_id).filter(
+            COMPLETED_TRANSITION, TaskHistory.timestamp >= start, TaskHistory.timestamp < end
+        )
+        if user_id is not None:
+            completed_tasks = completed_tasks.filter(TaskHistory.new_assignee == user_id)
+
+        pending_since = func.max(
+            case((TaskHistory.new_status == "Pending", TaskHistory.timestamp))
+        ).over(partition_by=TaskHistory.task_id, order_by=(TaskHistory.timestamp, TaskHistory.id), rows=(None, 0))
+        events = (
+            db.session.query(
+                TaskHistory.task_id, TaskHistory.timestamp, TaskHistory.old_status,
+                TaskHistory.new_status, TaskHistory.new_assignee, pending_since.label("pending_since"),
+            )
+            .filter(TaskHistory.task_id.in_(completed_tasks), TaskHistory.timestamp < end)
+            .subquery()
+        )
+
+        started = func.coalesce(events.c.pending_since, Task.created_at)
+        duration = seconds_between(started, events.c.timestamp, dialect)
+        bucket = bucket_expression(events.c.timestamp, interval, dialect)
+        query = (
+            db.session.query(bucket, func.count(), func.sum(duration), func.max(duration))
+            .outerjoin(Task, Task.id == events.c.task_id)
+            .filter(
+                events.c.new_status == "Completed",
+                func.coalesce(events.c.old_status, "") != "Completed",
+                events.c.timestamp >= start,
+                started.isnot(None),
+            )
+        )
+        if user_id is not None:
+            query = query.filter(events.c.new_assignee == user_id)
+
+        rows = {
+            as_date(b): (n, float(total or 0), float(longest or 0))
+            for b, n, total, longest in query.group_by(bucket)
+        }
+        return {b: rows.get(b, (0, 0.0, 0.0)) for b in buckets if b >= first}
+
+    values = cached_buckets(("cycle_time", user_id), interval, buckets, compute)
+    series = []
+    for b in buckets:
+        completed, total_seconds, longest_seconds = values[b]
+        series.append({
+            "bucket": b.isoformat(),
+            "completed": completed,
+            "avg_hours": round(total_seconds / completed / 3600, 2) if completed else None,
+            "max_hours": round(longest_seconds / 3600, 2) if completed else None,
+        })
+    return jsonify({"interval": interval, "user_id": user_id, "cycle_time": series}), 200
+
+
+@jwt_required()
+def burndown():
+    """
+    Open tasks left at the end of each bucket, and tasks completed in it, for one assignee.
+
+    Every bucket is the assignee's baseline plus the net effect of the history
+    rows before its end that moved tasks to or from the assignee or in and out
+    of "Completed". The baseline is the current open count (task_counter) minus
+    the net effect of all of the assignee's history, i.e. the open tasks the
+    history does not explain. Task creation, archiving and restoring are not
+    recorded in the history, so they show up as if they happened before the
+    range and only ever change the baseline. The baseline is part of the cache
+    key, so buckets cached before such a change are never served after it.
+
+    Returns:
+        Response: A JSON response with ``remaining`` and ``completed`` per bucket.
+    """
+    interval, buckets = parse_range()
+    user_id, error = _series_user()
+    if error:
+        return error
+    if user_id is None:
+        user_id = get_jwt_identity()
+
+    dialect = db.session.get_bind().dialect.name
+    end = bucket_start(buckets[-1]) + INTERVALS[interval]
+
+    was_completed = func.coalesce(TaskHistory.old_status, "Pending") == "Completed"
+    is_completed = func.coalesce(TaskHistory.new_status, "Pending") == "Completed"
+    gained = and_(TaskHistory.new_assignee == user_id, or_(TaskHistory.old_assignee.is_(None), TaskHistory.old_assignee != user_id))
+    lost = and_(TaskHistory.old_assignee == user_id, or_(TaskHistory.new_assignee.is_(None), TaskHistory.new_assignee != user_id))
+    net_open = case(
+        (gained, case((is_completed, 0), else_=1)),
+        (lost, case((was_completed, 0), else_=-1)),
+        (and_(~was_completed, is_completed), -1),
+        (and_(was_completed, ~is_completed), 1),
+        else_=0,
+    )
+    involved = or_(TaskHistory.new_assignee == user_id, TaskHistory.old_assignee == user_id)
+
+    open_now = db.session.query(TaskCounter.total - TaskCounter.completed).filter_by(
+        scope="user", scope_id=user_id
+    ).scalar() or 0
+    baseline = open_now - (db.session.query(func.sum(net_open)).filter(involved).scalar() or 0)
+
+    def compute(first):
+        completed = case((and_(COMPLETED_TRANSITION, TaskHistory.new_assignee == user_id), 1), else_=0)
+        bucket = bucket_expression(TaskHistory.timestamp, interval, dialect)
+        rows = (
+            db.session.query(bucket, func.sum(net_open), func.sum(completed))
+            .filter(involved, TaskHistory.timestamp >= bucket_start(first), TaskHistory.timestamp < end)
+            .group_by(bucket)
+            .all()
+        )
+        net_by_bucket = {as_date(b): net or 0 for b, net, _ in rows}
+        completed_by_bucket = {as_date(b): done or 0 for b, _, done in rows}
+
+        remaining = baseline + (
+            db.session.query(func.sum(net_open))
+            .filter(involved, TaskHistory.timestamp < bucket_start(first))
+            .scalar() or 0
+        )
+        values = {}
+        for b in buckets:
+            if b < first:
+                continue
+            remaining += net_by_bucket.get(b, 0)
+            values[b] = (remaining, completed_by_bucket.get(b, 0))
+        return values
+
+    values = cached_buckets(("burndown", user_id, baseline), interval, buckets, compute)
+    return jsonify({
+        "interval": interval,
+        "user_id": user_id,
+        "burndown": [
+            {"bucket": b.isoformat(), "remaining": values[b][0], "completed": values[b][1]} for b in buckets
+        ],
+    }), 200
@@ -1,29 +1,30 @@
 from datetime import datetime, timedelta
 import os
-from flask import request, jsonify
-from flask_jwt_extended import create_access_token, get_jwt_identity, jwt_required
+from flask import current_app, request, jsonify
+from flask_jwt_extended import decode_token, get_jwt, jwt_required
 from models.user import db, User
 from utils.mailer import new_registration_email, send_otp_email, send_reset_email
-from utils.security import decoded_token, hash_password, verify_password, generate_token
-import random
-import string
+from utils.identity import invalidate_user, load_current_user, revoke_user_tokens
+from utils.otp import otp_store
+from utils.rate_limit import rate_limiter
+from utils.refresh_tokens import refresh_tokens
+from utils.serializers import PROFILE
+from utils.security import generate_reset_token, hash_password, load_reset_token, password_needs_rehash, verify_password, generate_token
 from flask import make_response
 from sqlalchemy.exc import IntegrityError
+from werkzeug.exceptions import HTTPException
 import re
 
 
-def generate_otp():
-    return ''.join(random.choices(string.digits, k=6))
-
-
 def get_cookie_secure_flag():
     return os.environ.get("FLASK_ENV") == "production"
 
 from datetime import datetime, timedelta, timezone
 
-def _token_handler(user_id, message, **kwargs):
-    access_token = generate_token(user_id)
-    refresh_token = generate_token(user_id)
+def _token_handler(account, message, refresh_token=None, **kwargs):
+    access_token = generate_token(account)
+    refresh_token = refresh_token or refresh_tokens.issue(account)
+    db.session.commit()
 
     if not access_token or not refresh_token:
         return jsonify({"error": "Token generation failed"}), 500
@@ -35,6 +36,7 @@ def _token_handler(user_id, message, **kwargs):
         **kwargs
     }), 200)
 
+    access_expires = current_app.config["JWT_ACCESS_TOKEN_EXPIRES"]
     response.set_cookie(
         'access_token',
         access_token,
@@ -42,10 +44,11 @@ def _token_handler(user_id, message, **kwargs):
         httponly=True,
         secure=get_cookie_secure_flag(),
         samesite='Lax',
-        max_age=3600,
-        expires=datetime.now(timezone.utc) + timedelta(hours=1),
+        max_age=access_expires,
+        expires=datetime.now(timezone.utc) + access_expires,
     )
 
+    refresh_expires = current_app.config["JWT_REFRESH_TOKEN_EXPIRES"]
     response.set_cookie(
         'refresh_token',
         refresh_token,
@@ -53,28 +56,23 @@ def _token_handler(user_id, message, **kwargs):
         httponly=True,
         secure=get_cookie_secure_flag(),
         samesite='Lax',
-        max_age=86400,
-        expires=datetime.now(timezone.utc) + timedelta(days=7),
+        max_age=refresh_expires,
+        expires=datetime.now(timezone.utc) + refresh_expires,
     )
 
     return response
 
 
-@jwt_required(refresh=True)
+@jwt_required(refresh=True, locations=["json", "headers"])
 def refresh_access_token():
-    try:
-        identity = get_jwt_identity()
-        user = User.query.get(identity)
-
-        if not user:
-            return jsonify({"error": "User not found"}), 404
-
-        new_access_token = create_access_token(identity=user.id, expires_delta=timedelta(hours=1))
-
-        return jsonify({"access_token": new_access_token}), 200
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
+    """Exchange a refresh token, sent as ``refresh_token`` in the JSON body or as a bearer token, for new tokens."""
+    user = load_current_user()
+    if not user:
+        return jsonify({"error": "User not found"}), 404
+    refresh_token = refresh_tokens.rotate(get_jwt(), user)
+    if not refresh_token:
+        return jsonify({"error": "Refresh token has already been used"}), 401
+    return _token_handler(user, "Token refreshed", refresh_token=refresh_token)
 
 
 def register_user():
@@ -124,69 +122,58 @@ def _register_user(user):
 
 
 def _register_user_mail_and_otp(user):
-    otp = generate_otp()
     try:
-        user.otp = otp
-        db.session.commit()
+        otp = otp_store.issue(user.id)
         send_otp_email(user.email, otp)
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": "Failed to save OTP"}), 500
 
     new_registration_email(user.email)
-    profile = {
-        "username": user.username,
-        "email": user.email,
-        "role": user.role,
-        "phone": user.phone,
-        "location": user.location,
-        "gender": user.gender,
-        "primary_email": user.primary_email,
-        "verified": user.verified,
-    }
-    return _token_handler(user.id, "User registered successfully", user=profile)
+    return _token_handler(user, "User registered successfully", user=PROFILE.dump_object(user))
 
 
 
+@rate_limiter.limit("login")
 def login_user():
     data = request.json
     user = User.query.filter_by(email=data["email"]).first()
     if user and verify_password(user.password, data["password"]):
+        if password_needs_rehash(user.password):
+            user.password = hash_password(data["password"])
         return _login_user_otp(user)
     else:
         return jsonify({"error": "Invalid credentials"}), 400
 
 
 def _login_user_otp(user):
-    otp = generate_otp()
     try:
-        user.otp = otp
-        db.session.commit()
+        otp = otp_store.issue(user.id)
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": "Failed to save OTP"}), 500
     send_otp_email(user.email, otp)
-    profile = {
-                "username": user.username,
-                "email": user.email,
-                "role": user.role,
-                "phone": user.phone,
-                "location": user.location,
-                "gender": user.gender,
-                "primary_email": user.primary_email,
-                "verified": user.verified,
-            }
-    return _token_handler(user.id, "OTP sent", user=profile)
+    return _token_handler(user, "OTP sent", user=PROFILE.dump_object(user))
 
 
 
 def logout_user():
+    refresh_token = request.cookies.get("refresh_token")
+    if refresh_token:
+        try:
+            refresh_tokens.revoke(decode_token(refresh_token)["jti"])
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
     response = make_response(jsonify({"message": "Successfully logged out"}), 200)
     response.set_cookie('access_token', '', expires=0, httponly=True,
                         secure=get_cookie_secure_flag(), samesite='Lax')
+    response.set_cookie('refresh_token', '', expires=0, httponly=True,
+                        secure=get_cookie_secure_flag(), samesite='Lax')
     return response
 
 
+@rate_limiter.limit("send_otp")
 def send_otp():
     data = request.json
     email = data.get("email")
@@ -195,10 +182,9 @@ def send_otp():
     user = User.query.filter_by(email=email).first()
 
     if user:
-        otp = generate_otp()
-        user.otp = otp
-        db.session.commit()
+        otp = otp_store.issue(user.id)
         send_otp_email(user.email, otp)
+        db.session.commit()
         return jsonify({"message": "OTP sent successfully"}), 200
     else:
         return jsonify({"error": "User not found"}), 404
@@ -207,17 +193,19 @@ def send_otp():
 def verify_otp():
     data = request.json
     user = User.query.filter_by(email=data["email"]).first()
-    if user and user.otp == data["otp"]:
-        return _token_handler(user.id, "Verification success", role=user.role)
+    if user and otp_store.verify(user.id, data.get("otp")):
+        return _token_handler(user, "Verification success", role=user.role)
     return jsonify({"error": "Invalid OTP"}), 400
 
 
+@rate_limiter.limit("forgot_password")
 def forgot_password():
     data = request.json
     user = User.query.filter_by(email=data["email"]).first()
     if user:
-        token = generate_token(user.id)
+        token = generate_reset_token(user)
         send_reset_email(user.email, token)
+        db.session.commit()
         return jsonify({"message": "Password reset email sent"}), 200
     return jsonify({"error": "User not found"}), 404
 
@@ -232,17 +220,23 @@ def reset_password():
 
     try:
         return _reset_password_(token, new_password)
+    except HTTPException:
+        raise
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
 
 def _reset_password_(token, new_password):
-    user_id = decoded_token(token)
+    user_id, version = load_reset_token(token)
 
     user = User.query.get(user_id)
     if not user:
         return jsonify({"error": "User not found"}), 404
+    if (user.token_version or 0) != version:
+        return jsonify({"error": "Reset link has already been used"}), 400
     hashed_password = hash_password(new_password)
     user.password = hashed_password
+    revoke_user_tokens(user)
     db.session.commit()
+    invalidate_user(user.id)
     return jsonify({"message": "Password has been updated successfully"}), 200
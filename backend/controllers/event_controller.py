@@ -0,0 +1,32 @@
+from flask import Response, request
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
+from utils.events import event_bus
+from utils.security import current_role
+
+
+@jwt_required(locations=["headers", "cookies"])
+def stream_events():
+    """
+    Stream task and project change events as Server-Sent Events.
+
+    Browsers' ``EventSource`` cannot send headers, so the access token is also
+    read from the ``access_token`` cookie (open it with ``withCredentials``);
+    tokens are not accepted in the URL, where they would end up in access logs.
+    The stream ends once the token expires or is revoked. Admins and team leaders receive every event,
+    other users only the ones about their own tasks and projects. One or more
+    ``project_id`` parameters narrow the stream to those projects.
+
+    The response holds no database connection while it is open; events are
+    pushed by the write controllers through ``event_bus``.
+
+    Returns:
+        Response: A ``text/event-stream`` response that stays open until the client disconnects.
+    """
+    project_ids = set(request.args.getlist("project_id", type=int)) or None
+    subscription = event_bus.subscribe(get_jwt_identity(), current_role(), project_ids, claims=get_jwt())
+
+    return Response(
+        event_bus.stream(subscription),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,8 +1,15 @@
 from flask import jsonify
+from utils.db_pool import pool_metrics
+from utils.security import require_role
 
 
 def home_api():
   return jsonify({
     "status": 200,
     "message": "Welcome to taskHorizon Backend api",
-  }), 200
\ No newline at end of file
+  }), 200
+
+
+@require_role("admin")
+def db_pool_status():
+  return jsonify(pool_metrics.snapshot()), 200
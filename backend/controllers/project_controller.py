@@ -2,15 +2,16 @@ from flask import request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from models.project import ProjectHistory, db, Project
 from models.user import User
+from utils.events import event_bus
+from utils.http_cache import response_cache
+from utils.pagination import KeysetPagination, paginate, pagination_meta
+from utils.search import full_text_search
+from utils.security import current_role, require_role
 
 
 @jwt_required()
 def create_project():
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-
-    if not user:
-        return jsonify({"error": "User not found"}), 404
 
     data = request.get_json()
     if not data or "name" not in data or "description" not in data:
@@ -29,20 +30,36 @@ def create_project():
 
 
 @jwt_required()
+@response_cache.cached("project")
 def get_projects():
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 10, type=int)
 
-    projects = Project.query.paginate(page=page, per_page=per_page, error_out=False)
+    projects = paginate(Project.query, (Project.id,), page, per_page)
 
     if not projects:
         return jsonify({"error": "Projects not found"}), 404
 
     return jsonify({
         "projects": [{"id": p.id, "name": p.name, "status": p.status, "priority": p.priority, "description": p.description} for p in projects.items],
-        "total": projects.total,
-        "pages": projects.pages,
-        "current_page": projects.page
+        **pagination_meta(projects, links=False)
+    }), 200
+
+
+@jwt_required()
+@response_cache.cached("project")
+def search_projects():
+    term = request.args.get("q", "").strip()
+    if not term:
+        return jsonify({"error": "Missing search query"}), 400
+    per_page = request.args.get("per_page", 10, type=int)
+
+    query, score = full_text_search(Project.query, Project, term)
+    results = KeysetPagination(query, (score, Project.id), per_page)
+
+    return jsonify({
+        "projects": [{"id": p.id, "name": p.name, "status": p.status, "priority": p.priority, "description": p.description} for p, _ in results.items],
+        **pagination_meta(results)
     }), 200
 
 
@@ -53,15 +70,13 @@ def get_user_projects():
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 10, type=int)
 
-    projects = Project.query.filter_by(owner_id=user_id).paginate(page=page, per_page=per_page, error_out=False)
+    projects = paginate(Project.query.filter_by(owner_id=user_id), (Project.id,), page, per_page)
 
     if not projects:
         return jsonify({"error": "Projects not found"}), 404
     data = {
         "my_projects": [{"id": p.id, "name": p.name, "status": p.status, "priority": p.priority, "description": p.description} for p in projects.items],
-        "total": projects.total,
-        "pages": projects.pages,
-        "current_page": projects.page
+        **pagination_meta(projects, links=False)
     }
     return jsonify(data), 200
 
@@ -69,22 +84,23 @@ def get_user_projects():
 @jwt_required()
 def update_project(project_id):
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
     project = Project.query.get(project_id)
 
-    if not user:
-        return jsonify({"error": "User not found"}), 404
-
     if not project:
         return jsonify({"error": "Project not found"}), 404
 
-    if project.owner_id == user_id or user.role in ["admin", "team_leader"]:
+    if project.owner_id == user_id or current_role() in ["admin", "team_leader"]:
         data = request.json
         project.name = data.get("name", project.name)
         project.description = data.get("description", project.description)
         project.status = data.get("status", project.status)
         project.priority = data.get("priority", project.priority)
+        event = event_bus.event(
+            "project.updated", project.id, [project.owner_id],
+            name=project.name, status=project.status, priority=project.priority,
+        )
         db.session.commit()
+        event_bus.publish_many([event])
         return jsonify({"message": "Project updated successfully"}), 200
 
     return jsonify({"error": "Unauthorized"}), 403
@@ -93,16 +109,12 @@ def update_project(project_id):
 @jwt_required()
 def delete_project(project_id):
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
     project = Project.query.get(project_id)
 
-    if not user:
-        return jsonify({"error": "User not found"}), 404
-
     if not project:
         return jsonify({"error": "Project not found"}), 404
 
-    if project.owner_id == user_id or user.role in ["admin", "team_leader"]:
+    if project.owner_id == user_id or current_role() in ["admin", "team_leader"]:
         db.session.delete(project)
         db.session.commit()
         return jsonify({"message": "Project deleted successfully"}), 200
@@ -110,18 +122,13 @@ def delete_project(project_id):
     return jsonify({"error": "Unauthorized"}), 403
 
 
-@jwt_required()
+@require_role("admin", "team_leader")
 def assign_project(project_id):
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
     project = Project.query.get(project_id)
 
     if not project:
         return jsonify({"error": "Project not found"}), 404
 
-    if user.role not in ["admin", "team_leader"]:
-        return jsonify({"error": "Unauthorized"}), 403
-
     data = request.json
     new_owner_id = data.get("assigned_to")
 
@@ -135,13 +142,15 @@ def assign_project(project_id):
 
     history = ProjectHistory(
         project_id=project.id,
-        updated_by=user.id,
+        updated_by=get_jwt_identity(),
         old_owner=project.owner_id,
         new_owner=new_owner_id
     )
     db.session.add(history)
 
     project.owner_id = new_owner_id
+    event = event_bus.event("project.assigned", project.id, [history.old_owner, new_owner_id], owner_id=new_owner_id)
     db.session.commit()
+    event_bus.publish_many([event])
 
     return jsonify({"message": "Project assigned successfully"}), 200
@@ -1,20 +1,31 @@
+import json
 import traceback
-from flask import request, jsonify
+from datetime import date, datetime
+from flask import abort, current_app, make_response, request, jsonify
+from sqlalchemy import delete, insert, or_, select
+from sqlalchemy.exc import SQLAlchemyError
+from werkzeug.exceptions import HTTPException
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from models.project import Project
 from models.task import db, Task, TaskHistory
 from models.archive import ArchivedTask
 from models.user import User
+from utils.events import event_bus
+from utils.export import stream_export
+from utils.http_cache import response_cache
+from utils.pagination import KeysetPagination, paginate, pagination_meta
+from utils.search import full_text_search
+from utils.security import current_role, require_role
+from utils.serializers import ARCHIVED_TASK, TASK
+from utils.task_counters import add_task, apply_deltas, move_task
+from utils.task_filters import task_list_params
+
+BULK_CHUNK_SIZE = 1000
+BULK_MAX_LINE_BYTES = 64 * 1024
 
 
 @jwt_required()
 def create_task():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-
-    if not user:
-        return jsonify({"error": "Unauthorized"}), 401
-
     data = request.get_json()
     required_fields = ["title", "description", "project_id"]
 
@@ -32,8 +43,8 @@ def create_task():
     assigned_to_username = data.get("assigned_to")
     assigned_to_id = None
 
-    if user.role == "user":
-        assigned_to_id = user.id
+    if current_role() == "user":
+        assigned_to_id = get_jwt_identity()
     elif assigned_to_username:
         assigned_user = User.query.filter_by(username=assigned_to_username).first()
         if not assigned_user:
@@ -50,65 +61,260 @@ def create_task():
 
     db.session.add(task)
     db.session.commit()
+    event_bus.publish(
+        "task.created", task.project_id, [assigned_to_id],
+        task_id=task.id, title=task.title, status=task.status, assigned_to=assigned_to_id,
+    )
 
     return jsonify({"message": "Task created successfully", "task_id": task.id}), 201
 
 
+def _chunked(items, size):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _too_many_rows(max_rows):
+    abort(make_response(jsonify({"error": f"A bulk request may contain at most {max_rows} rows"}), 413))
+
+
+def _read_bulk_rows():
+    """
+    Read a bulk payload sent either as a JSON array or as NDJSON (one object per line).
+
+    NDJSON is parsed line by line as it is read, and the request is rejected
+    with 413 as soon as it has more than ``BULK_MAX_ROWS`` rows or a line
+    longer than ``BULK_MAX_LINE_BYTES``.
+    """
+    max_rows = current_app.config.get("BULK_MAX_ROWS", 10000)
+    if request.mimetype in ("application/x-ndjson", "application/ndjson"):
+        rows = []
+        while True:
+            line = request.stream.readline(BULK_MAX_LINE_BYTES + 1)
+            if not line:
+                return rows
+            if len(line) > BULK_MAX_LINE_BYTES:
+                abort(make_response(jsonify({"error": f"NDJSON lines may be at most {BULK_MAX_LINE_BYTES} bytes"}), 413))
+            line = line.strip()
+            if not line:
+                continue
+            if len(rows) == max_rows:
+                _too_many_rows(max_rows)
+            try:
+                rows.append(json.loads(line))
+            except ValueError:
+                rows.append(None)
+
+    data = request.get_json(silent=True)
+    if not isinstance(data, list):
+        return None
+    if len(data) > max_rows:
+        _too_many_rows(max_rows)
+    return data
+
+
+def _string_field_error(data, fields, nullable=()):
+    """Return why one of ``fields`` present in ``data`` is not a string, or None when they all are."""
+    for field in fields:
+        if field in data and not isinstance(data[field], str) and not (field in nullable and data[field] is None):
+            return f"{field} must be a string"
+    return None
+
+
+def _bulk_row_error(data):
+    """Return why a bulk row cannot be used as task fields, or None when it can."""
+    if not isinstance(data, dict) or any(field not in data for field in ("title", "description", "project_id")):
+        return "Missing required fields"
+    if not isinstance(data["project_id"], int) or isinstance(data["project_id"], bool):
+        return "project_id must be an integer"
+    optional = ("assigned_to", "status", "priority", "due_date")
+    return _string_field_error(data, ("title", "description") + optional, nullable=optional)
+
+
+@jwt_required()
+def bulk_create_tasks():
+    """
+    Create many tasks in one request.
+
+    The body is a JSON array or an NDJSON stream of at most ``BULK_MAX_ROWS``
+    objects with the same fields as ``create_task``, plus optional ``status``,
+    ``priority`` and ``due_date``. Rows with missing or mistyped fields get a
+    per-row error.
+    Projects, assignees and existing titles are looked up with set-based
+    queries up front, and valid rows are inserted with executemany in chunks
+    of ``BULK_CHUNK_SIZE``, one transaction per chunk.
+
+    Returns:
+        Response: A JSON response with one result per input row, in input order.
+    """
+    rows = _read_bulk_rows()
+    if rows is None:
+        return jsonify({"error": "Expected a JSON array or NDJSON body"}), 400
+
+    self_assign = current_role() == "user"
+    user_id = get_jwt_identity()
+
+    results = [None] * len(rows)
+    candidates = []
+    for index, data in enumerate(rows):
+        error = _bulk_row_error(data)
+        if error:
+            results[index] = {"index": index, "status": "error", "error": error}
+            continue
+        candidates.append((index, data))
+
+    project_ids = {data["project_id"] for _, data in candidates}
+    usernames = {data["assigned_to"] for _, data in candidates if data.get("assigned_to") and not self_assign}
+    titles = {data["title"] for _, data in candidates}
+
+    existing_projects = set()
+    for chunk in _chunked(project_ids, BULK_CHUNK_SIZE):
+        existing_projects.update(pid for (pid,) in db.session.query(Project.id).filter(Project.id.in_(chunk)))
+
+    assignee_ids = {}
+    for chunk in _chunked(usernames, BULK_CHUNK_SIZE):
+        assignee_ids.update(db.session.query(User.username, User.id).filter(User.username.in_(chunk)))
+
+    taken_titles = set()
+    for chunk in _chunked(titles, BULK_CHUNK_SIZE):
+        taken_titles.update(
+            db.session.query(Task.project_id, Task.title)
+            .filter(Task.project_id.in_(existing_projects), Task.title.in_(chunk))
+            .all()
+        )
+
+    valid = []
+    for index, data in candidates:
+        error = None
+        if data["project_id"] not in existing_projects:
+            error = "Project not found"
+        elif (data["project_id"], data["title"]) in taken_titles:
+            error = "A task with this title already exists in this project"
+        elif data.get("assigned_to") and not self_assign and data["assigned_to"] not in assignee_ids:
+            error = "Assigned user does not exist"
+
+        due_date = data.get("due_date")
+        if not error and due_date:
+            try:
+                due_date = date.fromisoformat(due_date)
+            except (TypeError, ValueError):
+                error = "Invalid due_date, expected YYYY-MM-DD"
+
+        if error:
+            results[index] = {"index": index, "status": "error", "error": error}
+            continue
+
+        taken_titles.add((data["project_id"], data["title"]))
+        valid.append((index, {
+            "title": data["title"],
+            "description": data["description"],
+            "assigned_to": user_id if self_assign else assignee_ids.get(data.get("assigned_to")),
+            "project_id": data["project_id"],
+            "status": data.get("status", "pending"),
+            "priority": data.get("priority", "Medium"),
+            "due_date": due_date or None,
+        }))
+
+    for chunk in _chunked(valid, BULK_CHUNK_SIZE):
+        try:
+            inserted = db.session.execute(
+                insert(Task).returning(Task.id, sort_by_parameter_order=True),
+                [values for _, values in chunk],
+            ).scalars().all()
+            deltas = {}
+            for _, values in chunk:
+                add_task(deltas, values["assigned_to"], values["project_id"], values["status"])
+            apply_deltas(deltas)
+            db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            for index, _ in chunk:
+                results[index] = {"index": index, "status": "error", "error": str(e.orig or e)}
+            continue
+        for (index, _), task_id in zip(chunk, inserted):
+            results[index] = {"index": index, "status": "created", "task_id": task_id}
+        event_bus.publish_many([
+            event_bus.event(
+                "task.created", values["project_id"], [values["assigned_to"]],
+                task_id=task_id, title=values["title"], status=values["status"], assigned_to=values["assigned_to"],
+            )
+            for (_, values), task_id in zip(chunk, inserted)
+        ])
+
+    created = sum(1 for result in results if result["status"] == "created")
+    return jsonify({"results": results, "created": created, "failed": len(results) - created}), 200
+
+
+def _led_project_ids():
+    """Subquery of the ids of the projects the current team leader owns."""
+    return select(Project.id).where(Project.owner_id == get_jwt_identity()).scalar_subquery()
+
+
+def _visible_tasks_filter():
+    """Filter criteria limiting ``Task`` rows to the ones the current user may see."""
+    role = current_role()
+    if role == "admin":
+        return []
+    if role == "team_leader":
+        return [Task.project_id.in_(_led_project_ids())]
+    return [Task.assigned_to == get_jwt_identity()]
+
+
+def _visible_archived_tasks_filter():
+    """Filter criteria limiting ``ArchivedTask`` rows to the ones the current user may see."""
+    role = current_role()
+    if role == "admin":
+        return []
+    if role == "team_leader":
+        return [ArchivedTask.project_id.in_(_led_project_ids())]
+    return [ArchivedTask.assigned_to == get_jwt_identity()]
+
+
 @jwt_required()
+@response_cache.cached("task", "user", "project")
 def get_tasks():
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 10, type=int)
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
 
-    if not user:
-        return jsonify({"error": "Unauthorized"}), 401
+    criteria, key_columns, descending = task_list_params()
+    query = TASK.select(Task.query.filter(*_visible_tasks_filter(), *criteria), *key_columns)
+    tasks = paginate(query, key_columns, page, per_page, descending)
 
-    if user.role == "admin":
-        tasks_query = Task.query
-    elif user.role == "team_leader":
-        tasks_query = Task.query.filter_by(project_id=user.project_id)
-    else:
-        tasks_query = Task.query.filter_by(assigned_to=user.id)
+    return jsonify(
+        {
+            "tasks": TASK.dump_all(tasks.items),
+            **pagination_meta(tasks),
+        }
+    ), 200
 
-    tasks = tasks_query.paginate(page=page, per_page=per_page, error_out=False)
+
+@jwt_required()
+@response_cache.cached("task", "user", "project")
+def search_tasks():
+    term = request.args.get("q", "").strip()
+    if not term:
+        return jsonify({"error": "Missing search query"}), 400
+    per_page = request.args.get("per_page", 10, type=int)
+
+    query, score = full_text_search(TASK.select(Task.query.filter(*_visible_tasks_filter())), Task, term)
+    results = KeysetPagination(query, (score, Task.id), per_page)
 
     return jsonify(
         {
-            "tasks": [
-                {
-                    "id": t.id,
-                    "title": t.title,
-                    "status": t.status,
-                    "priority": t.priority,
-                    "assigned_to": User.query.get(t.assigned_to).username if t.assigned_to else None,
-                    "description": t.description,
-                    "due_date": t.due_date,
-                    "project_id": t.project_id,
-                }
-                for t in tasks.items
-            ],
-            "total": tasks.total,
-            "pages": tasks.pages,
-            "current_page": tasks.page,
-            "prev_page": tasks.prev_num if tasks.has_prev else None,
-            "next_page": tasks.next_num if tasks.has_next else None,
+            "tasks": TASK.dump_all(results.items),
+            **pagination_meta(results),
         }
     ), 200
 
 
-@jwt_required()
+@require_role("admin", "team_leader")
 def assign_task(task_id):
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
     task = Task.query.get(task_id)
 
     if not task:
         return jsonify({"error": "Task not found"}), 404
 
-    if user.role not in ["admin", "team_leader"]:
-        return jsonify({"error": "Unauthorized"}), 403
-
     data = request.json
     new_assignee_username = data.get("assigned_to")
     new_assignee = User.query.filter_by(username=new_assignee_username).first()
@@ -118,7 +324,7 @@ def assign_task(task_id):
 
     history = TaskHistory(
         task_id=task.id,
-        updated_by=user.id,
+        updated_by=get_jwt_identity(),
         old_assignee=task.assigned_to,
         new_assignee=new_assignee.id,
     )
@@ -126,23 +332,24 @@ def assign_task(task_id):
 
     task.assigned_to = new_assignee.id
     task.status = "Pending"
+    event = event_bus.event(
+        "task.assigned", task.project_id, [history.old_assignee, new_assignee.id],
+        task_id=task.id, status=task.status, assigned_to=task.assigned_to,
+    )
     db.session.commit()
+    event_bus.publish_many([event])
     return jsonify({"message": "Task assigned successfully"}), 200
 
 
 @jwt_required()
 def update_task(task_id):
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
     task = Task.query.get(task_id)
 
-    if not user:
-        return jsonify({"error": "Unauthorized"}), 403
-
     if not task:
         return jsonify({"error": "Task not found"}), 404
 
-    if task.assigned_to != user.id and user.role not in ["admin", "team_leader"]:
+    if task.assigned_to != user_id and current_role() not in ["admin", "team_leader"]:
         return jsonify({"error": "Unauthorized: You are not allowed to update this task"}), 403
 
     data = request.get_json()
@@ -160,7 +367,7 @@ def update_task(task_id):
 
     history = TaskHistory(
         task_id=task.id,
-        updated_by=user.id,
+        updated_by=user_id,
         old_status=task.status,
         new_status=data.get("status", task.status),
         old_priority=task.priority,
@@ -175,27 +382,24 @@ def update_task(task_id):
     task.status = data.get("status", task.status)
     task.priority = data.get("priority", task.priority)
     task.assigned_to = new_assignee.id if new_assignee else task.assigned_to
+    event = event_bus.event(
+        "task.updated", task.project_id, [history.old_assignee, task.assigned_to],
+        task_id=task.id, status=task.status, priority=task.priority, assigned_to=task.assigned_to,
+    )
 
     db.session.commit()
+    event_bus.publish_many([event])
 
     return jsonify({"message": "Task updated successfully"}), 200
 
 
-@jwt_required()
+@require_role("admin", "team_leader")
 def archive_task(task_id):
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
     task = Task.query.get(task_id)
 
-    if not user:
-        return jsonify({"error": "Unauthorized"}), 403
-
     if not task:
         return jsonify({"error": "Task not found"}), 404
 
-    if user.role not in ["admin", "team_leader"]:
-        return jsonify({"error": "Unauthorized: Only an admin or team leader can archive tasks"}), 403
-
     archived_task = ArchivedTask(
         task_id=task.id,
         title=task.title,
@@ -203,159 +407,242 @@ def archive_task(task_id):
         status=task.status,
         assigned_to=task.assigned_to,
         project_id=task.project_id,
-        deleted_by=user.id
+        deleted_by=get_jwt_identity()
     )
     db.session.add(archived_task)
 
     db.session.delete(task)
+    event = event_bus.event("task.archived", task.project_id, [task.assigned_to], task_id=task.id)
     db.session.commit()
+    event_bus.publish_many([event])
 
     return jsonify({"message": "Task archived successfully"}), 200
 
 
+def _read_task_ids(data):
+    """Return the de-duplicated ``task_ids`` of a bulk request, or None when they are malformed."""
+    task_ids = data.get("task_ids") if isinstance(data, dict) else None
+    if not isinstance(task_ids, list) or not task_ids or len(task_ids) > BULK_CHUNK_SIZE:
+        return None
+    if not all(isinstance(task_id, int) and not isinstance(task_id, bool) for task_id in task_ids):
+        return None
+    return list(dict.fromkeys(task_ids))
+
+
+def _bulk_apply(task_ids, values, user_id, event_type, own_tasks_only=False):
+    """
+    Apply one patch to many tasks in a single transaction.
+
+    The current state is read with one SELECT, the tasks are changed with one
+    UPDATE ... WHERE id IN and the history is written with one executemany
+    INSERT, whatever the number of tasks.
+
+    Returns:
+        Response: An error response, or None when the patch was applied.
+    """
+    current = (
+        db.session.query(Task.id, Task.status, Task.priority, Task.assigned_to, Task.project_id)
+        .filter(Task.id.in_(task_ids))
+        .with_for_update()
+        .all()
+    )
+
+    missing = set(task_ids) - {row.id for row in current}
+    if missing:
+        db.session.rollback()
+        return jsonify({"error": "Task not found", "task_ids": sorted(missing)}), 404
+
+    if own_tasks_only and any(row.assigned_to != user_id for row in current):
+        db.session.rollback()
+        return jsonify({"error": "Unauthorized: You are not allowed to update this task"}), 403
+
+    db.session.query(Task).filter(Task.id.in_(task_ids)).update(values, synchronize_session=False)
+    db.session.execute(insert(TaskHistory).execution_options(render_nulls=True), [
+        {
+            "task_id": row.id,
+            "updated_by": user_id,
+            "old_status": row.status,
+            "new_status": values.get("status", row.status),
+            "old_priority": row.priority,
+            "new_priority": values.get("priority", row.priority),
+            "old_assignee": row.assigned_to,
+            "new_assignee": values.get("assigned_to", row.assigned_to),
+        }
+        for row in current
+    ])
+
+    deltas = {}
+    for row in current:
+        move_task(
+            deltas,
+            (row.assigned_to, row.project_id, row.status),
+            (values.get("assigned_to", row.assigned_to), row.project_id, values.get("status", row.status)),
+        )
+    apply_deltas(deltas)
+    db.session.commit()
+    event_bus.publish_many([
+        event_bus.event(
+            event_type, row.project_id, [row.assigned_to, values.get("assigned_to")],
+            task_id=row.id, status=values.get("status", row.status), assigned_to=values.get("assigned_to", row.assigned_to),
+        )
+        for row in current
+    ])
+    return None
+
+
+@require_role("admin", "team_leader")
+def bulk_assign_tasks():
+    data = request.get_json(silent=True)
+    task_ids = _read_task_ids(data)
+    if task_ids is None:
+        return jsonify({"error": f"task_ids must be a list of 1 to {BULK_CHUNK_SIZE} task IDs"}), 400
+
+    new_assignee = User.query.filter_by(username=data.get("assigned_to")).first()
+    if not new_assignee:
+        return jsonify({"error": "Assigned user does not exist"}), 400
+
+    error = _bulk_apply(task_ids, {"assigned_to": new_assignee.id, "status": "Pending"}, get_jwt_identity(), "task.assigned")
+    if error:
+        return error
+    return jsonify({"message": "Tasks assigned successfully", "updated": len(task_ids)}), 200
+
+
+@jwt_required()
+def bulk_update_tasks():
+    data = request.get_json(silent=True)
+    task_ids = _read_task_ids(data)
+    if task_ids is None:
+        return jsonify({"error": f"task_ids must be a list of 1 to {BULK_CHUNK_SIZE} task IDs"}), 400
+
+    patch = data.get("patch")
+    if not isinstance(patch, dict) or not patch:
+        return jsonify({"error": "No update data provided"}), 400
+    error = _string_field_error(
+        patch, ("title", "description", "status", "priority", "assigned_to"), nullable=("description", "assigned_to")
+    )
+    if error:
+        return jsonify({"error": error}), 400
+
+    values = {key: patch[key] for key in ("title", "description", "status", "priority") if key in patch}
+    if patch.get("assigned_to"):
+        new_assignee = User.query.filter_by(username=patch["assigned_to"]).first()
+        if not new_assignee:
+            return jsonify({"error": "Assigned user does not exist"}), 400
+        values["assigned_to"] = new_assignee.id
+
+    if not values:
+        return jsonify({"error": "No update data provided"}), 400
+
+    own_tasks_only = current_role() not in ["admin", "team_leader"]
+    error = _bulk_apply(task_ids, values, get_jwt_identity(), "task.updated", own_tasks_only=own_tasks_only)
+    if error:
+        return error
+    return jsonify({"message": "Tasks updated successfully", "updated": len(task_ids)}), 200
+
+
+@require_role("admin", "team_leader")
+def bulk_archive_tasks():
+    data = request.get_json(silent=True)
+    task_ids = _read_task_ids(data)
+    if task_ids is None:
+        return jsonify({"error": f"task_ids must be a list of 1 to {BULK_CHUNK_SIZE} task IDs"}), 400
+
+    archived = db.session.execute(
+        insert(ArchivedTask).from_select(
+            ["task_id", "title", "description", "status", "priority", "assigned_to", "project_id", "due_date", "deleted_by", "deleted_at"],
+            db.select(
+                Task.id, Task.title, Task.description, Task.status, Task.priority, Task.assigned_to,
+                Task.project_id, Task.due_date, db.literal(get_jwt_identity()), db.literal(datetime.utcnow()),
+            ).where(Task.id.in_(task_ids)),
+        )
+    ).rowcount
+    removed = db.session.execute(
+        delete(Task).where(Task.id.in_(task_ids)).returning(Task.id, Task.assigned_to, Task.project_id, Task.status)
+    ).all()
+    missing = set(task_ids) - {row.id for row in removed}
+    if missing:
+        db.session.rollback()
+        return jsonify({"error": "Task not found", "task_ids": sorted(missing)}), 404
+    deltas = {}
+    for row in removed:
+        add_task(deltas, row.assigned_to, row.project_id, row.status, sign=-1)
+    apply_deltas(deltas)
+    db.session.commit()
+    event_bus.publish_many([
+        event_bus.event("task.archived", row.project_id, [row.assigned_to], task_id=row.id) for row in removed
+    ])
+
+    return jsonify({"message": "Tasks archived successfully", "archived": archived}), 200
+
+
 @jwt_required()
 def get_user_tasks():
     try:
         page = request.args.get("page", 1, type=int)
         per_page = request.args.get("per_page", 10, type=int)
         user_id = get_jwt_identity()
-        print(f"User ID from JWT: {user_id}")
 
-        user = User.query.get(user_id)
-        if not user:
-            return jsonify({"error": "Unauthorized"}), 401
-
-        tasks_query = Task.query.filter_by(assigned_to=user.id)
+        tasks_query = TASK.select(Task.query.filter_by(assigned_to=user_id))
 
         if not tasks_query:
             return jsonify({"error": "Not found"}), 404
 
-        tasks = tasks_query.paginate(page=page, per_page=per_page, error_out=False)
+        tasks = paginate(tasks_query, (Task.id,), page, per_page)
 
         return jsonify(
             {
-                "my_tasks": [
-                    {
-                        "id": t.id,
-                        "title": t.title,
-                        "status": t.status,
-                        "priority": t.priority,
-                        "assigned_to": User.query.get(t.assigned_to).username if t.assigned_to else None,
-                        "description": t.description,
-                        "due_date": t.due_date,
-                        "project_id": t.project_id,
-                    }
-                    for t in tasks.items
-                ],
-                "total": tasks.total,
-                "pages": tasks.pages,
-                "current_page": tasks.page,
-                "prev_page": tasks.prev_num if tasks.has_prev else None,
-                "next_page": tasks.next_num if tasks.has_next else None,
+                "my_tasks": TASK.dump_all(tasks.items),
+                **pagination_meta(tasks),
             }
         ), 200
 
+    except HTTPException:
+        raise
     except Exception as e:
         return jsonify({"error": "Internal Server Error", "details": str(e)}), 500
 
 
-@jwt_required()
+@require_role("admin", "team_leader")
 def get_team_tasks():
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 10, type=int)
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-
-    if user.role not in ["admin", "team_leader"]:
-        return jsonify({"error": "Unauthorized"}), 403
 
-    if user:
-        tasks = Task.query.paginate(page=page, per_page=per_page, error_out=False)
-        return jsonify(
-            {
-                "team_tasks": [
-                    {
-                        "id": t.id,
-                        "title": t.title,
-                        "status": t.status,
-                        "priority": t.priority,
-                        "assigned_to": User.query.get(t.assigned_to).username if t.assigned_to else None,
-                        "description": t.description,
-                        "due_date": t.due_date,
-                        "project_id": t.project_id,
-                    }
-                    for t in tasks.items
-                ],
-                "total": tasks.total,
-                "pages": tasks.pages,
-                "current_page": tasks.page,
-                "prev_page": tasks.prev_num if tasks.has_prev else None,
-                "next_page": tasks.next_num if tasks.has_next else None,
-            }
-        ), 200
-    return jsonify({"error": "Unauthorized"}), 403
+    criteria, key_columns, descending = task_list_params()
+    query = TASK.select(Task.query.filter(*criteria), *key_columns)
+    tasks = paginate(query, key_columns, page, per_page, descending)
+    return jsonify(
+        {
+            "team_tasks": TASK.dump_all(tasks.items),
+            **pagination_meta(tasks),
+        }
+    ), 200
 
 
 @jwt_required()
 def get_archived_tasks():
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 10, type=int)
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
 
-    if not user:
-        return jsonify({"error": "Unauthorized"}), 403
-
-    if user.role == "admin":
-        archived_tasks = ArchivedTask.query.paginate(page=page, per_page=per_page, error_out=False)
-    elif user.role == "team_leader":
-        archived_tasks = ArchivedTask.query.filter(ArchivedTask.project_id == user.project_id).paginate(
-            page=page, per_page=per_page, error_out=False
-        )
-    else:
-        archived_tasks = ArchivedTask.query.filter(ArchivedTask.assigned_to == user_id).paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+    archived_query = ARCHIVED_TASK.select(
+        ArchivedTask.query.filter(*_visible_archived_tasks_filter()), ArchivedTask.id
+    )
+    archived_tasks = paginate(archived_query, (ArchivedTask.id,), page, per_page)
 
     return jsonify(
         {
-            "archived_tasks": [
-                {
-                    "id": t.task_id,
-                    "title": t.title,
-                    "status": t.status,
-                    "priority": t.priority,
-                    "assigned_to": User.query.get(t.assigned_to).username if t.assigned_to else None,
-                    "deleted_by": t.deleted_by,
-                    "description": t.description,
-                    "due_date": t.due_date,
-                    "project_id": t.project_id
-                }
-                for t in archived_tasks.items
-            ],
-            "total": archived_tasks.total,
-            "pages": archived_tasks.pages,
-            "current_page": archived_tasks.page,
+            "archived_tasks": ARCHIVED_TASK.dump_all(archived_tasks.items),
+            **pagination_meta(archived_tasks, links=False),
         }
     ), 200
 
 
-@jwt_required()
+@require_role("admin", "team_leader")
 def restore_task(task_id):
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-
-    if not user:
-        return jsonify({"error": "Unauthorized"}), 403
-
     archived_task = ArchivedTask.query.get(task_id)
 
     if not archived_task:
         return jsonify({"error": "Archived task not found"}), 404
 
-    if user.role not in ["admin", "team_leader"]:
-        return jsonify({"error": "Unauthorized"}), 403
-
     restored_task = Task(
         id=archived_task.task_id,
         title=archived_task.title,
@@ -367,6 +654,65 @@ def restore_task(task_id):
 
     db.session.add(restored_task)
     db.session.delete(archived_task)
+    event = event_bus.event(
+        "task.restored", restored_task.project_id, [restored_task.assigned_to],
+        task_id=restored_task.id, status=restored_task.status, assigned_to=restored_task.assigned_to,
+    )
     db.session.commit()
+    event_bus.publish_many([event])
 
     return jsonify({"message": "Task restored successfully"}), 200
+
+
+@jwt_required()
+def export_tasks():
+    assignee = db.aliased(User)
+    statement = (
+        db.select(
+            Task.id, Task.title, Task.description, Task.status, Task.priority,
+            assignee.username.label("assigned_to"), Task.project_id,
+            Task.created_at, Task.updated_at, Task.due_date,
+        )
+        .outerjoin(assignee, assignee.id == Task.assigned_to)
+        .where(*_visible_tasks_filter())
+        .order_by(Task.id)
+    )
+    return stream_export(statement, "tasks")
+
+
+@jwt_required()
+def export_archived_tasks():
+    assignee = db.aliased(User)
+    statement = (
+        db.select(
+            ArchivedTask.id, ArchivedTask.task_id, ArchivedTask.title, ArchivedTask.description,
+            ArchivedTask.status, ArchivedTask.priority, assignee.username.label("assigned_to"),
+            ArchivedTask.project_id, ArchivedTask.due_date, ArchivedTask.deleted_by, ArchivedTask.deleted_at,
+        )
+        .outerjoin(assignee, assignee.id == ArchivedTask.assigned_to)
+        .where(*_visible_archived_tasks_filter())
+        .order_by(ArchivedTask.id)
+    )
+    return stream_export(statement, "archived_tasks")
+
+
+@require_role("admin", "team_leader")
+def export_task_history():
+    statement = db.select(
+        TaskHistory.id, TaskHistory.task_id, TaskHistory.updated_by,
+        TaskHistory.old_status, TaskHistory.new_status,
+        TaskHistory.old_priority, TaskHistory.new_priority,
+        TaskHistory.old_assignee, TaskHistory.new_assignee, TaskHistory.timestamp,
+    )
+    if current_role() != "admin":
+        statement = statement.where(or_(
+            TaskHistory.task_id.in_(select(Task.id).where(*_visible_tasks_filter())),
+            TaskHistory.task_id.in_(select(ArchivedTask.task_id).where(*_visible_archived_tasks_filter())),
+        ))
+    task_id = request.args.get("task_id", type=int)
+    if task_id is not None:
+        statement = statement.where(TaskHistory.task_id == task_id).order_by(TaskHistory.timestamp)
+    else:
+        statement = statement.order_by(TaskHistory.id)
+    return stream_export(statement, "task_history")
+
@@ -4,18 +4,24 @@ from flask import request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from models.task import Task, TaskHistory
 from models.project import Project
-from utils.security import hash_password
+from models.counter import TaskCounter
+from utils.security import current_role, hash_password, require_role
+from utils.pagination import paginate, pagination_meta
+from utils.http_cache import response_cache
+from utils.rate_limit import rate_limiter
+from utils.serializers import PROFILE, USER
 from models.subscribe import Subscriber
 from utils.mailer import change_teammate_password, create_teammate, new_subscriber_mail
 from models.user import db, User
+from utils.identity import invalidate_user, load_current_user, revoke_user_tokens
 import random
 import string
 
+ROLES = ["admin", "team_leader", "user"]
 
 @jwt_required()
 def update_profile():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = load_current_user()
     if user:
         data = request.json
         user.phone = data.get("phone", user.phone)
@@ -23,23 +29,33 @@ def update_profile():
         user.gender = data.get("gender", user.gender)
         user.primary_email = data.get("primary_email", user.primary_email)
         db.session.commit()
+        invalidate_user(user.id)
         return jsonify({"message": "Profile updated successfully"}), 200
     return jsonify({"error": "Unauthorized"}), 403
 
 @jwt_required()
 def updates_profile(users_id):
-    current_user_id = get_jwt_identity()
-    current_user = User.query.get(current_user_id)
+    role = current_role()
     user_to_update = User.query.get(users_id)
 
-    if not current_user or not user_to_update:
+    if not user_to_update:
         return jsonify({"error": "User not found"}), 404
 
-    if current_user.id == user_to_update.id or current_user.role in ["admin", "team_leader"]:
+    if get_jwt_identity() == user_to_update.id or role in ["admin", "team_leader"]:
         data = request.json
+        new_role = data.get("role")
+        if new_role and new_role != user_to_update.role:
+            if role != "admin":
+                return jsonify({"error": "Unauthorized: Only an admin can change roles"}), 403
+            if new_role not in ROLES:
+                return jsonify({"role": "Invalid role"}), 400
+            user_to_update.role = new_role
+            revoke_user_tokens(user_to_update)
+
         user_to_update.username = data.get("username", user_to_update.username)
         user_to_update.email = data.get("email", user_to_update.email)
         db.session.commit()
+        invalidate_user(user_to_update.id)
         return jsonify({"message": "Profile updated successfully"}), 200
 
     return jsonify({"error": "Unauthorized"}), 403
@@ -49,78 +65,35 @@ def updates_profile(users_id):
 
 @jwt_required()
 def get_profile():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = load_current_user()
     if user:
-        profile = {
-            "username": user.username,
-            "email": user.email,
-            "role": user.role,
-            "phone": user.phone,
-            "location": user.location,
-            "gender": user.gender,
-            "primary_email": user.primary_email,
-            "verified": user.verified,
-        }
-
-        return jsonify({"user": profile}), 200
+        return jsonify({"user": PROFILE.dump_object(user)}), 200
 
     return jsonify({"error": "Unauthorized"}), 403
 
 @jwt_required()
 def get_assigned_to(user_id):
-    user = User.query.get(user_id)
-    if user:
-        profile = {
-            "username": user.username,
-            "email": user.email,
-            "role": user.role,
-            "phone": user.phone,
-            "location": user.location,
-            "gender": user.gender,
-            "primary_email": user.primary_email,
-            "verified": user.verified,
-        }
-
-        return jsonify({"user": profile}), 200
+    profile = PROFILE.select(User.query.filter_by(id=user_id)).first()
+    if profile:
+        return jsonify({"user": PROFILE.dump(profile)}), 200
 
     return jsonify({"error": "Unauthorized"}), 403
 
 
-@jwt_required()
+@require_role("admin", "team_leader")
+@response_cache.cached("user")
 def get_profiles():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 10, type=int)
 
-    if not user:
-        return jsonify({"error": "User not found or unauthorized"}), 403
-    
-    if user.role not in ["admin", "team_leader"]:
-        return jsonify({"error": "Unauthorized"}), 403
-
-    users = User.query.paginate(page=page, per_page=per_page, error_out=False)
+    users = paginate(USER.select(User.query), (User.id,), page, per_page)
 
     if not users:
         return jsonify({"message": "No users found", "users": []}), 200
 
     profiles = {
-        "users": [{
-            "id": u.id,
-            "username": u.username,
-            "email": u.email,
-            "role": u.role,
-            "phone": u.phone,
-            "location": u.location,
-            "gender": u.gender,
-            "primary_email": u.primary_email,
-            "verified": u.verified,
-        } for u in users],
-        "total": users.total,
-        "pages": users.pages,
-        "current_page": users.page
+        "users": USER.dump_all(users),
+        **pagination_meta(users, links=False)
     }
 
     return jsonify(profiles), 200
@@ -132,6 +105,7 @@ def is_valid_email(email):
     return re.match(email_regex, email)
 
 
+@rate_limiter.limit("subscribe")
 def subscribe_user():
     data = request.json
     email = data.get("email")
@@ -147,8 +121,8 @@ def subscribe_user():
     try:
         new_user = Subscriber(email=email)
         db.session.add(new_user)
-        db.session.commit()
         new_subscriber_mail(email)
+        db.session.commit()
         return jsonify({"message": "Congratulations! You have successfully subscribed."}), 200
 
     except Exception as e:
@@ -160,14 +134,8 @@ def generate_random_password(length=10):
     characters = string.ascii_letters + string.digits + "!@#$%^&*"
     return ''.join(random.choice(characters) for _ in range(length))
 
-@jwt_required()
+@require_role("admin", "team_leader")
 def create_team_member():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-
-    if user.role not in ["admin", "team_leader"]:
-        return jsonify({"error": "Unauthorized"}), 403
-
     data = request.json
     username = data.get("username")
     email = data.get("email")
@@ -185,19 +153,14 @@ def create_team_member():
 
     new_user = User(username=username, email=email, password=hashed_password, role="user")
     db.session.add(new_user)
-    db.session.commit()
     create_teammate(new_user.email, new_user.username, generated_password)
+    db.session.commit()
 
     return jsonify({"message": "Team member created successfully. An email has been sent."}), 201
 
-@jwt_required()
+@require_role("admin", "team_leader")
 def change_team_member_password(users_id):
-    user_id = get_jwt_identity()
     user = User.query.get(users_id)
-    role_user = User.query.get(user_id)
-
-    if role_user.role not in ["admin", "team_leader"]:
-        return jsonify({"error": "Unauthorized"}), 403
 
     if not User.query.filter_by(email=user.email).first():
         return jsonify({"error": "User already exists"}), 400
@@ -206,8 +169,10 @@ def change_team_member_password(users_id):
     hashed_password = hash_password(generated_password)
 
     user.password = hashed_password
-    db.session.commit()
+    revoke_user_tokens(user)
     change_teammate_password(user.email, user.username, generated_password)
+    db.session.commit()
+    invalidate_user(user.id)
 
     return jsonify({"message": "Team member created successfully. An email has been sent."}), 201
 
@@ -215,19 +180,20 @@ def change_team_member_password(users_id):
 @jwt_required()
 def delete_user(user_id):
     current_user_id = get_jwt_identity()
-    current_user = User.query.get(current_user_id)
     user_to_delete = User.query.get(user_id)
 
-    if not current_user or not user_to_delete:
+    if not user_to_delete:
         return jsonify({"error": "User not found"}), 404
 
-    if current_user.id == user_to_delete.id or current_user.role in ["admin", "team_leader"]:
+    if current_user_id == user_to_delete.id or current_role() in ["admin", "team_leader"]:
         db.session.query(Task).filter(Task.assigned_to == user_to_delete.id).update({"assigned_to": None})
-        db.session.query(Project).filter(Project.owner_id == user_to_delete.id).update({"owner_id": current_user.id})
-        db.session.query(TaskHistory).filter(TaskHistory.updated_by == user_to_delete.id).update({"updated_by": current_user.id})
+        db.session.query(Project).filter(Project.owner_id == user_to_delete.id).update({"owner_id": current_user_id})
+        db.session.query(TaskHistory).filter(TaskHistory.updated_by == user_to_delete.id).update({"updated_by": current_user_id})
+        db.session.query(TaskCounter).filter_by(scope="user", scope_id=user_to_delete.id).delete()
 
         db.session.delete(user_to_delete)
         db.session.commit()
+        invalidate_user(user_id)
         
         return jsonify({"message": "User deleted successfully"}), 200
 
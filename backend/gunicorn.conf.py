@@ -0,0 +1,34 @@
+"""
+Gunicorn settings for serving the app.
+
+Run with ``gunicorn -c gunicorn.conf.py "app:create_app()"``. Values come from
+``config.py`` so they can be changed through the environment:
+
+    GUNICORN_BIND: Address to listen on, ``0.0.0.0:5000`` by default.
+    GUNICORN_WORKER_CLASS: ``gevent`` (default) or ``sync``.
+    GUNICORN_WORKERS: Number of worker processes.
+    GUNICORN_WORKER_CONNECTIONS: Concurrent requests per gevent worker.
+    GUNICORN_TIMEOUT: Seconds a sync worker may spend on one request.
+
+With gevent every worker serves many requests at once, each in its own
+greenlet, and switches to another one whenever a request waits on the
+network. The standard library is monkey patched by the worker before the app
+is imported, so SMTP, the mail queue threads and ``/events`` streams become
+cooperative too; psycopg2 is made cooperative in ``post_fork`` below. An open
+``/events`` stream then costs a greenlet instead of a whole worker.
+"""
+from config import CurrentConfig
+
+bind = CurrentConfig.GUNICORN_BIND
+worker_class = CurrentConfig.GUNICORN_WORKER_CLASS
+workers = CurrentConfig.GUNICORN_WORKERS
+worker_connections = CurrentConfig.GUNICORN_WORKER_CONNECTIONS
+timeout = CurrentConfig.GUNICORN_TIMEOUT
+
+
+def post_fork(server, worker):
+    """Let psycopg2 yield to other greenlets while it waits on PostgreSQL."""
+    database_uri = CurrentConfig.SQLALCHEMY_DATABASE_URI or ""
+    if worker_class == "gevent" and database_uri.startswith("postgres"):
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
@@ -0,0 +1,42 @@
+"""moved otp to one time password table
+
+Revision ID: 1b7e4c9a2d60
+Revises: 6f2a8d4c1b93
+Create Date: 2026-10-18 17:04:51.318207
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1b7e4c9a2d60'
+down_revision = '6f2a8d4c1b93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('one_time_password',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('code_hash', sa.String(length=64), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    with op.batch_alter_table('one_time_password', schema=None) as batch_op:
+        batch_op.create_index('ix_one_time_password_expires_at', ['expires_at'], unique=False)
+
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_column('otp')
+
+
+def downgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('otp', sa.VARCHAR(length=6), nullable=True))
+
+    with op.batch_alter_table('one_time_password', schema=None) as batch_op:
+        batch_op.drop_index('ix_one_time_password_expires_at')
+
+    op.drop_table('one_time_password')
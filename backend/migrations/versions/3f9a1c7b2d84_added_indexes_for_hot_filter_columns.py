@@ -0,0 +1,54 @@
+"""added indexes for hot filter columns
+
+Revision ID: 3f9a1c7b2d84
+Revises: efaba5d454a6
+Create Date: 2026-10-18 09:12:37.418210
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9a1c7b2d84'
+down_revision = 'efaba5d454a6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.create_index('ix_task_assigned_to_status', ['assigned_to', 'status'], unique=False)
+        batch_op.create_index('ix_task_project_id_title', ['project_id', 'title'], unique=False)
+
+    with op.batch_alter_table('task_history', schema=None) as batch_op:
+        batch_op.create_index('ix_task_history_task_id_timestamp', ['task_id', 'timestamp'], unique=False)
+
+    with op.batch_alter_table('archived_task', schema=None) as batch_op:
+        batch_op.create_index('ix_archived_task_project_id', ['project_id'], unique=False)
+        batch_op.create_index('ix_archived_task_assigned_to', ['assigned_to'], unique=False)
+
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.create_index('ix_project_owner_id', ['owner_id'], unique=False)
+
+    with op.batch_alter_table('project_history', schema=None) as batch_op:
+        batch_op.create_index('ix_project_history_project_id_timestamp', ['project_id', 'timestamp'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('project_history', schema=None) as batch_op:
+        batch_op.drop_index('ix_project_history_project_id_timestamp')
+
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.drop_index('ix_project_owner_id')
+
+    with op.batch_alter_table('archived_task', schema=None) as batch_op:
+        batch_op.drop_index('ix_archived_task_assigned_to')
+        batch_op.drop_index('ix_archived_task_project_id')
+
+    with op.batch_alter_table('task_history', schema=None) as batch_op:
+        batch_op.drop_index('ix_task_history_task_id_timestamp')
+
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.drop_index('ix_task_project_id_title')
+        batch_op.drop_index('ix_task_assigned_to_status')
@@ -0,0 +1,40 @@
+"""added task counter table
+
+Revision ID: 5d0b8e2c9f31
+Revises: c71d5e93a0b6
+Create Date: 2026-10-18 13:41:12.305118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d0b8e2c9f31'
+down_revision = 'c71d5e93a0b6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('task_counter',
+    sa.Column('scope', sa.String(length=20), nullable=False),
+    sa.Column('scope_id', sa.Integer(), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('completed', sa.Integer(), nullable=False),
+    sa.Column('pending', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('scope', 'scope_id')
+    )
+
+    for scope, column in (('user', 'assigned_to'), ('project', 'project_id')):
+        op.execute(
+            "INSERT INTO task_counter (scope, scope_id, total, completed, pending) "
+            f"SELECT '{scope}', {column}, COUNT(*), "
+            "SUM(CASE WHEN status = 'Completed' THEN 1 ELSE 0 END), "
+            "SUM(CASE WHEN status = 'Pending' THEN 1 ELSE 0 END) "
+            f"FROM task WHERE {column} IS NOT NULL GROUP BY {column}"
+        )
+
+
+def downgrade():
+    op.drop_table('task_counter')
@@ -0,0 +1,32 @@
+"""added task list filter indexes
+
+Revision ID: 6f2a8d4c1b93
+Revises: 9c3d5f1a7e42
+Create Date: 2026-10-18 15:47:09.632815
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6f2a8d4c1b93'
+down_revision = '9c3d5f1a7e42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.create_index('ix_task_assigned_to_due_date', ['assigned_to', 'due_date'], unique=False)
+        batch_op.create_index('ix_task_project_id_due_date', ['project_id', 'due_date'], unique=False)
+        batch_op.create_index('ix_task_status_due_date', ['status', 'due_date'], unique=False)
+        batch_op.create_index('ix_task_due_date', ['due_date'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.drop_index('ix_task_due_date')
+        batch_op.drop_index('ix_task_status_due_date')
+        batch_op.drop_index('ix_task_project_id_due_date')
+        batch_op.drop_index('ix_task_assigned_to_due_date')
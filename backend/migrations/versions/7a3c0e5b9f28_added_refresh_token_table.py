@@ -0,0 +1,39 @@
+"""added refresh token table
+
+Revision ID: 7a3c0e5b9f28
+Revises: 1b7e4c9a2d60
+Create Date: 2026-10-18 18:12:37.540926
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a3c0e5b9f28'
+down_revision = '1b7e4c9a2d60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('refresh_token',
+    sa.Column('jti', sa.String(length=36), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.Column('replaced_by', sa.String(length=36), nullable=True),
+    sa.Column('rotated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('jti')
+    )
+    with op.batch_alter_table('refresh_token', schema=None) as batch_op:
+        batch_op.create_index('ix_refresh_token_expires_at', ['expires_at'], unique=False)
+        batch_op.create_index('ix_refresh_token_user_id', ['user_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('refresh_token', schema=None) as batch_op:
+        batch_op.drop_index('ix_refresh_token_user_id')
+        batch_op.drop_index('ix_refresh_token_expires_at')
+
+    op.drop_table('refresh_token')
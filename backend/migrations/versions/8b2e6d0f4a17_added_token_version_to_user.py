@@ -0,0 +1,26 @@
+"""added token version to user
+
+Revision ID: 8b2e6d0f4a17
+Revises: 3f9a1c7b2d84
+Create Date: 2026-10-18 10:03:51.226904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b2e6d0f4a17'
+down_revision = '3f9a1c7b2d84'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_column('token_version')
@@ -0,0 +1,70 @@
+"""added full text search indexes
+
+Revision ID: 9c3d5f1a7e42
+Revises: e2b94d6a7c18
+Create Date: 2026-10-18 15:12:44.507318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c3d5f1a7e42'
+down_revision = 'e2b94d6a7c18'
+branch_labels = None
+depends_on = None
+
+# table -> (weight A column, weight B column)
+SEARCHABLE = {
+    'task': ('title', 'description'),
+    'project': ('name', 'description'),
+}
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    for table, (title, body) in SEARCHABLE.items():
+        if dialect == 'postgresql':
+            op.execute(
+                f"ALTER TABLE {table} ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+                f"setweight(to_tsvector('english', coalesce({title}, '')), 'A') || "
+                f"setweight(to_tsvector('english', coalesce({body}, '')), 'B')) STORED"
+            )
+            op.create_index(f'ix_{table}_search_vector', table, ['search_vector'], unique=False, postgresql_using='gin')
+        elif dialect == 'sqlite':
+            # external content FTS5 index; batch_alter_table recreates the
+            # table without these triggers, so later migrations on it must
+            # create them again
+            op.execute(
+                f"CREATE VIRTUAL TABLE {table}_fts USING fts5({title}, {body}, "
+                f"content='{table}', content_rowid='id', tokenize='porter unicode61')"
+            )
+            op.execute(
+                f"CREATE TRIGGER {table}_fts_insert AFTER INSERT ON {table} BEGIN "
+                f"INSERT INTO {table}_fts(rowid, {title}, {body}) VALUES (new.id, new.{title}, new.{body}); END"
+            )
+            op.execute(
+                f"CREATE TRIGGER {table}_fts_delete AFTER DELETE ON {table} BEGIN "
+                f"INSERT INTO {table}_fts({table}_fts, rowid, {title}, {body}) "
+                f"VALUES ('delete', old.id, old.{title}, old.{body}); END"
+            )
+            op.execute(
+                f"CREATE TRIGGER {table}_fts_update AFTER UPDATE OF {title}, {body} ON {table} BEGIN "
+                f"INSERT INTO {table}_fts({table}_fts, rowid, {title}, {body}) "
+                f"VALUES ('delete', old.id, old.{title}, old.{body}); "
+                f"INSERT INTO {table}_fts(rowid, {title}, {body}) VALUES (new.id, new.{title}, new.{body}); END"
+            )
+            op.execute(f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    for table in SEARCHABLE:
+        if dialect == 'postgresql':
+            op.drop_index(f'ix_{table}_search_vector', table_name=table)
+            op.drop_column(table, 'search_vector')
+        elif dialect == 'sqlite':
+            for trigger in ('insert', 'delete', 'update'):
+                op.execute(f"DROP TRIGGER IF EXISTS {table}_fts_{trigger}")
+            op.execute(f"DROP TABLE IF EXISTS {table}_fts")
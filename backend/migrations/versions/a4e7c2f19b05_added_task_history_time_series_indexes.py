@@ -0,0 +1,30 @@
+"""added task history time series indexes
+
+Revision ID: a4e7c2f19b05
+Revises: 5d0b8e2c9f31
+Create Date: 2026-10-18 14:06:51.772940
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4e7c2f19b05'
+down_revision = '5d0b8e2c9f31'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('task_history', schema=None) as batch_op:
+        batch_op.create_index('ix_task_history_new_status_timestamp', ['new_status', 'timestamp'], unique=False)
+        batch_op.create_index('ix_task_history_new_assignee_timestamp', ['new_assignee', 'timestamp'], unique=False)
+        batch_op.create_index('ix_task_history_old_assignee_timestamp', ['old_assignee', 'timestamp'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('task_history', schema=None) as batch_op:
+        batch_op.drop_index('ix_task_history_old_assignee_timestamp')
+        batch_op.drop_index('ix_task_history_new_assignee_timestamp')
+        batch_op.drop_index('ix_task_history_new_status_timestamp')
@@ -0,0 +1,32 @@
+"""added table version table
+
+Revision ID: e2b94d6a7c18
+Revises: a4e7c2f19b05
+Create Date: 2026-10-18 14:38:20.190644
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b94d6a7c18'
+down_revision = 'a4e7c2f19b05'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    table_version = op.create_table('table_version',
+    sa.Column('table_name', sa.String(length=64), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('table_name')
+    )
+    op.bulk_insert(table_version, [
+        {'table_name': name, 'version': 0}
+        for name in ('user', 'project', 'project_history', 'task', 'task_history', 'archived_task')
+    ])
+
+
+def downgrade():
+    op.drop_table('table_version')
@@ -18,6 +18,11 @@ class ArchivedTask(db.Model):
         deleted_by (int): The ID of the user who deleted the task.
         deleted_at (datetime): The timestamp when the task was deleted.
     """
+    __table_args__ = (
+        db.Index("ix_archived_task_project_id", "project_id"),
+        db.Index("ix_archived_task_assigned_to", "assigned_to"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     task_id = db.Column(db.Integer, nullable=False)
     title = db.Column(db.String(100))
@@ -0,0 +1,23 @@
+from . import db
+
+
+class TaskCounter(db.Model):
+    """
+    TaskCounter Model
+
+    This model keeps running task counts per assignee and per project, so the
+    analytics endpoints do not have to aggregate the task table on every request.
+    Rows are updated in the same transaction as the task writes that change them.
+
+    Attributes:
+        scope (str): What the counts belong to, either "user" or "project".
+        scope_id (int): The ID of the user or project.
+        total (int): Number of tasks in the scope.
+        completed (int): Number of tasks with status "Completed".
+        pending (int): Number of tasks with status "Pending".
+    """
+    scope = db.Column(db.String(20), primary_key=True)
+    scope_id = db.Column(db.Integer, primary_key=True)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    completed = db.Column(db.Integer, nullable=False, default=0)
+    pending = db.Column(db.Integer, nullable=False, default=0)
@@ -0,0 +1,25 @@
+from . import db
+
+
+class OneTimePassword(db.Model):
+    """
+    OneTimePassword Model
+
+    This model keeps the pending one-time password of a user outside the user
+    table, so sending and checking a code never writes the user row. Only an
+    HMAC of the code is stored.
+
+    Attributes:
+        user_id (int): The user the code was sent to, one pending code per user.
+        code_hash (str): Hex HMAC-SHA256 of the user ID and the code.
+        attempts (int): Number of verification attempts made against the code.
+        expires_at (datetime): The time after which the code is no longer accepted.
+    """
+    __table_args__ = (
+        db.Index("ix_one_time_password_expires_at", "expires_at"),
+    )
+
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id", ondelete="CASCADE"), primary_key=True)
+    code_hash = db.Column(db.String(64), nullable=False)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    expires_at = db.Column(db.DateTime, nullable=False)
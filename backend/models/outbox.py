@@ -0,0 +1,65 @@
+from . import db
+from datetime import datetime
+
+
+class OutboundMail(db.Model):
+    """
+    OutboundMail Model
+
+    This model represents an email waiting to be delivered by the mail queue workers.
+
+    Attributes:
+        id (int): The primary key for the queued email.
+        subject (str): The subject line of the email.
+        sender (str): The sender address.
+        recipients (str): Comma separated recipient addresses.
+        template (str): Name of the template in ``utils.mail_templates`` the email is rendered from.
+        context (str): JSON object with the template arguments.
+        attempts (int): Number of delivery attempts made so far.
+        next_attempt_at (datetime): Earliest time at which a worker may (re)try delivery.
+        last_error (str, optional): The error raised by the last failed attempt.
+        created_at (datetime): The timestamp when the email was queued.
+    """
+    __table_args__ = (
+        db.Index("ix_outbound_mail_next_attempt_at", "next_attempt_at"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    subject = db.Column(db.String(255), nullable=False)
+    sender = db.Column(db.String(120), nullable=True)
+    recipients = db.Column(db.Text, nullable=False)
+    template = db.Column(db.String(64), nullable=False)
+    context = db.Column(db.Text, nullable=False, default="{}")
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class DeadLetterMail(db.Model):
+    """
+    DeadLetterMail Model
+
+    This model keeps emails that could not be delivered after the maximum number of attempts.
+    The template arguments are dropped, so no one-time codes or passwords are kept.
+
+    Attributes:
+        id (int): The primary key for the failed email.
+        subject (str): The subject line of the email.
+        sender (str): The sender address.
+        recipients (str): Comma separated recipient addresses.
+        template (str): Name of the template the email was rendered from.
+        attempts (int): Number of delivery attempts made.
+        last_error (str, optional): The error raised by the last attempt.
+        created_at (datetime): The timestamp when the email was originally queued.
+        failed_at (datetime): The timestamp when the email was given up on.
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    subject = db.Column(db.String(255), nullable=False)
+    sender = db.Column(db.String(120), nullable=True)
+    recipients = db.Column(db.Text, nullable=False)
+    template = db.Column(db.String(64), nullable=False)
+    attempts = db.Column(db.Integer, nullable=False)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime)
+    failed_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -3,6 +3,10 @@ from . import db
 
 
 class Project(db.Model):
+    __table_args__ = (
+        db.Index("ix_project_owner_id", "owner_id"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text, nullable=True)
@@ -14,6 +18,10 @@ class Project(db.Model):
 
 
 class ProjectHistory(db.Model):
+    __table_args__ = (
+        db.Index("ix_project_history_project_id_timestamp", "project_id", "timestamp"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     project_id = db.Column(db.Integer, db.ForeignKey("project.id"), nullable=False)
     updated_by = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
@@ -0,0 +1,29 @@
+from . import db
+
+
+class RefreshToken(db.Model):
+    """
+    RefreshToken Model
+
+    This model lists the refresh tokens that may still be exchanged for new
+    tokens. When a token is used its row records the ``jti`` of the token it
+    was exchanged for, so a second use within the grace window gets that same
+    token back. Expired and replaced rows are purged in bulk.
+
+    Attributes:
+        jti (str): The unique ``jti`` claim of the refresh token.
+        user_id (int): The user the token was issued to.
+        expires_at (datetime): The expiry of the token, after which the row can be purged.
+        replaced_by (str, optional): The ``jti`` of the token this one was exchanged for.
+        rotated_at (datetime, optional): When the token was exchanged.
+    """
+    __table_args__ = (
+        db.Index("ix_refresh_token_user_id", "user_id"),
+        db.Index("ix_refresh_token_expires_at", "expires_at"),
+    )
+
+    jti = db.Column(db.String(36), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
+    replaced_by = db.Column(db.String(36), nullable=True)
+    rotated_at = db.Column(db.DateTime, nullable=True)
@@ -0,0 +1,30 @@
+from contextlib import contextmanager
+from flask import current_app
+from flask_sqlalchemy.session import Session
+
+
+class RoutingSession(Session):
+    """
+    Session that lets the ``replica_router`` extension send reads to a replica.
+
+    Queries go to the engine of the ``replica`` bind only when the router says
+    so; everything else, including every write, uses the default engine.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            router = current_app.extensions.get("replica_router")
+            if router is not None and router.use_replica(self, clause):
+                return router.engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@contextmanager
+def primary(session):
+    """Run the queries ``session`` makes inside the block on the primary, e.g. security checks."""
+    previous = session.info.get("primary")
+    session.info["primary"] = True
+    try:
+        yield
+    finally:
+        session.info["primary"] = previous
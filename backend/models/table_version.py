@@ -0,0 +1,18 @@
+from . import db
+
+
+class TableVersion(db.Model):
+    """
+    TableVersion Model
+
+    This model keeps a version number per table that is bumped after every
+    committed transaction that wrote to the table. The HTTP cache builds ETags from
+    these numbers, so it can tell whether a response changed with a primary-key
+    lookup instead of re-running the query behind it.
+
+    Attributes:
+        table_name (str): The name of the tracked table.
+        version (int): Incremented after every committed transaction that wrote to the table.
+    """
+    table_name = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
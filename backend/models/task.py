@@ -2,6 +2,15 @@ from . import db
 from datetime import datetime
 
 class Task(db.Model):
+    __table_args__ = (
+        db.Index("ix_task_assigned_to_status", "assigned_to", "status"),
+        db.Index("ix_task_project_id_title", "project_id", "title"),
+        db.Index("ix_task_assigned_to_due_date", "assigned_to", "due_date"),
+        db.Index("ix_task_project_id_due_date", "project_id", "due_date"),
+        db.Index("ix_task_status_due_date", "status", "due_date"),
+        db.Index("ix_task_due_date", "due_date"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text, nullable=True)
@@ -14,6 +23,13 @@ class Task(db.Model):
     due_date = db.Column(db.Date, nullable=True)
 
 class TaskHistory(db.Model):
+    __table_args__ = (
+        db.Index("ix_task_history_task_id_timestamp", "task_id", "timestamp"),
+        db.Index("ix_task_history_new_status_timestamp", "new_status", "timestamp"),
+        db.Index("ix_task_history_new_assignee_timestamp", "new_assignee", "timestamp"),
+        db.Index("ix_task_history_old_assignee_timestamp", "old_assignee", "timestamp"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     task_id = db.Column(db.Integer, db.ForeignKey("task.id"))
     updated_by = db.Column(db.Integer, db.ForeignKey("user.id"))
@@ -4,6 +4,9 @@ This module defines the routes for analytics-related endpoints in the Flask appl
 Routes:
   /user (GET): Endpoint to get user analytics.
   /team-leader (GET): Endpoint to get team leader analytics.
+  /throughput (GET): Tasks completed per day or week.
+  /cycle-time (GET): Pending to Completed time of the tasks completed per day or week.
+  /burndown (GET): Open and completed tasks per day or week for one assignee.
 
 Blueprints:
   analytics_bp: Blueprint for the analytics routes.
@@ -13,9 +16,12 @@ Imported Functions:
   team_leader_analytics: Controller function to handle team leader analytics.
 """
 from flask import Blueprint
-from controllers.analytics_controller import analytics
+from controllers.analytics_controller import analytics, burndown, cycle_time, throughput
 
 analytics_bp = Blueprint("analytics", __name__)
 
 
 analytics_bp.route("/stats", methods=["GET"])(analytics)
+analytics_bp.route("/throughput", methods=["GET"])(throughput)
+analytics_bp.route("/cycle-time", methods=["GET"])(cycle_time)
+analytics_bp.route("/burndown", methods=["GET"])(burndown)
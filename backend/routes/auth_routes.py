@@ -9,9 +9,10 @@ Routes:
   /verify-otp (POST): Verifies the OTP sent to the user.
   /forgot-password (POST): Initiates the forgot password process.
   /reset-password (POST): Resets the user's password.
+  /refresh (POST): Exchanges a refresh token for a new access and refresh token.
 """
 from flask import Blueprint
-from controllers.auth_controller import logout_user, register_user, login_user, reset_password, send_otp, verify_otp, forgot_password
+from controllers.auth_controller import logout_user, refresh_access_token, register_user, login_user, reset_password, send_otp, verify_otp, forgot_password
 
 auth_bp = Blueprint("auth", __name__)
 
@@ -22,4 +23,4 @@ auth_bp.route("/send-otp", methods=["POST"])(send_otp)
 auth_bp.route("/verify-otp", methods=["POST"])(verify_otp)
 auth_bp.route("/forgot-password", methods=["POST"])(forgot_password)
 auth_bp.route("/reset-password", methods=["POST"])(reset_password)
-auth_bp.route("/refresh", methods=["POST"])
\ No newline at end of file
+auth_bp.route("/refresh", methods=["POST"])(refresh_access_token)
@@ -0,0 +1,17 @@
+"""
+This module defines the route for the server-push change feed.
+
+Routes:
+  GET /events:
+    - Description: Server-Sent Events stream of task and project changes.
+    - Controller: stream_events
+
+Blueprint:
+  event_bp: Blueprint for the event stream.
+"""
+from flask import Blueprint
+from controllers.event_controller import stream_events
+
+event_bp = Blueprint("events", __name__)
+
+event_bp.route("", methods=["GET"])(stream_events)
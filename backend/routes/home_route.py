@@ -1,7 +1,8 @@
 from flask import Blueprint
 
-from controllers.home_controller import home_api
+from controllers.home_controller import db_pool_status, home_api
 
 home_bp = Blueprint("/", __name__)
 
-home_bp.route("", methods=["GET"])(home_api)
\ No newline at end of file
+home_bp.route("", methods=["GET"])(home_api)
+home_bp.route("db-pool", methods=["GET"])(db_pool_status)
@@ -6,10 +6,30 @@ Routes:
     - Description: Create a new task.
     - Controller: create_task
 
+  POST /bulk:
+    - Description: Create many tasks from a JSON array or NDJSON stream.
+    - Controller: bulk_create_tasks
+
+  PATCH /bulk:
+    - Description: Apply one patch to a list of tasks.
+    - Controller: bulk_update_tasks
+
+  PUT /bulk/assign:
+    - Description: Assign a list of tasks to a user.
+    - Controller: bulk_assign_tasks
+
+  DELETE /bulk/archive:
+    - Description: Archive a list of tasks.
+    - Controller: bulk_archive_tasks
+
   GET /:
     - Description: Retrieve all tasks.
     - Controller: get_tasks
 
+  GET /search:
+    - Description: Ranked full-text search over task titles and descriptions (?q=), cursor paginated.
+    - Controller: search_tasks
+
   PUT /<int:task_id>:
     - Description: Update an existing task by its ID.
     - Controller: update_task
@@ -22,6 +42,10 @@ Routes:
     - Description: Archive a task by its ID.
     - Controller: archive_task
 
+  GET /export, GET /archived/export, GET /history/export:
+    - Description: Stream tasks, archived tasks or task history as NDJSON or CSV (?format=).
+    - Controller: export_tasks, export_archived_tasks, export_task_history
+
   GET /user-tasks:
     - Description: Retrieve tasks assigned to the current user.
     - Controller: get_user_tasks
@@ -31,13 +55,21 @@ Routes:
     - Controller: get_team_tasks
 """
 from flask import Blueprint
-from controllers.task_controller import create_task, get_archived_tasks, get_tasks, restore_task, update_task, assign_task, archive_task, get_user_tasks, get_team_tasks
+from controllers.task_controller import bulk_archive_tasks, bulk_assign_tasks, bulk_create_tasks, bulk_update_tasks, export_archived_tasks, export_task_history, export_tasks, create_task, get_archived_tasks, get_tasks, restore_task, search_tasks, update_task, assign_task, archive_task, get_user_tasks, get_team_tasks
 
 task_bp = Blueprint("task", __name__)
 
 task_bp.route("/", methods=["POST", "OPTIONS"])(create_task)
 task_bp.route("/", methods=["GET", "OPTIONS"])(get_tasks)
+task_bp.route("/bulk", methods=["POST", "OPTIONS"])(bulk_create_tasks)
+task_bp.route("/bulk", methods=["PATCH", "OPTIONS"])(bulk_update_tasks)
+task_bp.route("/bulk/assign", methods=["PUT", "OPTIONS"])(bulk_assign_tasks)
+task_bp.route("/bulk/archive", methods=["DELETE", "OPTIONS"])(bulk_archive_tasks)
+task_bp.route("/search", methods=["GET", "OPTIONS"])(search_tasks)
 task_bp.route("/archived", methods=["GET", "OPTIONS"])(get_archived_tasks)
+task_bp.route("/export", methods=["GET", "OPTIONS"])(export_tasks)
+task_bp.route("/archived/export", methods=["GET", "OPTIONS"])(export_archived_tasks)
+task_bp.route("/history/export", methods=["GET", "OPTIONS"])(export_task_history)
 task_bp.route("/restore/<int:task_id>", methods=["POST", "OPTIONS"])(restore_task)
 task_bp.route("/user-tasks", methods=["GET", "OPTIONS"])(get_user_tasks)
 task_bp.route("/team-tasks", methods=["GET", "OPTIONS"])(get_team_tasks)
@@ -0,0 +1,257 @@
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+
+_DB_DIR = tempfile.mkdtemp(prefix="taskhorizon-tests-")
+os.environ["FLASK_ENV"] = "development"
+os.environ["DEV_DATABASE_URL"] = f"sqlite:///{os.path.join(_DB_DIR, 'test.db')}"
+os.environ.pop("DEV_REPLICA_DATABASE_URL", None)
+os.environ.setdefault("FRONTEND_URL", "http://localhost:5173")
+os.environ["SECRET_KEY"] = "test-secret-key-" + "s" * 32
+os.environ["JWT_SECRET_KEY"] = "test-jwt-secret-" + "j" * 32
+os.environ["MAIL_SERVER"] = "127.0.0.1"
+os.environ["MAIL_PORT"] = "8025"
+os.environ["MAIL_QUEUE_ENABLED"] = "False"
+os.environ["BCRYPT_LOG_ROUNDS"] = "4"
+os.environ["RATE_LIMIT_ENABLED"] = "False"
+os.environ["HTTP_CACHE_TTL"] = "0"
+os.environ["CURRENT_USER_CACHE_TTL"] = "0"
+os.environ["ANALYTICS_CACHE_TTL"] = "0"
+
+import pytest
+from flask_migrate import upgrade
+from sqlalchemy import event, text
+from app import create_app
+from models import db
+from models.user import User
+from utils.security import generate_token
+from utils.smtp_pool import smtp_pool
+
+BENCHMARK_SCALE = float(os.environ.get("BENCHMARK_SCALE", 1))
+_benchmark_results = []
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MIGRATIONS = os.path.join(BACKEND, "migrations")
+
+
+@pytest.fixture(scope="session")
+def app():
+    app = create_app()
+    app.config["TESTING"] = True
+    with app.app_context():
+        upgrade(directory=MIGRATIONS)
+    return app
+
+
+@pytest.fixture(autouse=True)
+def clean_db(app):
+    """Give every test empty tables and an application context."""
+    with app.app_context():
+        yield
+        db.session.remove()
+        with db.engine.begin() as connection:
+            for table in reversed(db.metadata.sorted_tables):
+                connection.execute(table.delete())
+            connection.execute(text("UPDATE table_version SET version = 0"))
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def make_user():
+    def make_user(username, role="user", password="not-a-real-hash"):
+        user = User(username=username, email=f"{username}@example.com", password=password, role=role)
+        db.session.add(user)
+        db.session.commit()
+        return user
+    return make_user
+
+
+@pytest.fixture
+def auth_header():
+    def auth_header(user):
+        return {"Authorization": f"Bearer {generate_token(user)}"}
+    return auth_header
+
+
+@contextmanager
+def _count_statements():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def count_statements():
+    """Context manager collecting the SQL statements run inside it."""
+    return _count_statements
+
+
+@pytest.fixture
+def scaled():
+    """Scale a benchmark size by ``BENCHMARK_SCALE`` (1 runs the sizes written in the tests)."""
+    return lambda size: max(1, int(size * BENCHMARK_SCALE))
+
+
+@pytest.fixture
+def benchmark_report(request):
+    """Record a result line, shown in the "benchmarks" section of the terminal summary."""
+    return lambda line: _benchmark_results.append(f"{request.node.name}: {line}")
+
+
+def pytest_terminal_summary(terminalreporter):
+    if _benchmark_results:
+        terminalreporter.section("benchmarks")
+        for line in _benchmark_results:
+            terminalreporter.write_line(line)
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def _serve(worker_class="gevent", **env):
+    port = _free_port()
+    environ = {
+        **os.environ,
+        "GUNICORN_BIND": f"127.0.0.1:{port}",
+        "GUNICORN_WORKER_CLASS": worker_class,
+        "GUNICORN_WORKERS": "4",
+        "MAIL_QUEUE_ENABLED": "True",
+        "MAIL_QUEUE_WORKERS": "0",
+        **{name: str(value) for name, value in env.items()},
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app:create_app()"],
+        cwd=BACKEND, env=environ, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                break
+            except OSError:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError(f"gunicorn ({worker_class}) did not start")
+                time.sleep(0.1)
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+@pytest.fixture
+def serve():
+    """
+    Context manager running the app under gunicorn in a subprocess, yielding its base URL.
+
+    The server uses the test database, 4 workers of the given class and any
+    extra settings passed as keyword arguments. Queued mail is never sent.
+    """
+    pytest.importorskip("gunicorn")
+    return _serve
+
+
+def _load(make_request, clients, duration, timeout=5):
+    """
+    Send requests from ``clients`` threads for ``duration`` seconds.
+
+    Returns:
+        dict: ``requests`` per second, ``errors`` and the ``p50`` and ``p99`` latencies in ms.
+    """
+    latencies, errors = [], []
+    stop_at = time.monotonic() + duration
+
+    def client():
+        while time.monotonic() < stop_at:
+            started = time.monotonic()
+            try:
+                with urllib.request.urlopen(make_request(), timeout=timeout) as response:
+                    response.read()
+            except OSError as error:
+                errors.append(error)
+                continue
+            latencies.append(time.monotonic() - started)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else float("nan")
+
+    return {
+        "requests": len(latencies) / duration,
+        "errors": len(errors),
+        "p50": percentile(0.5),
+        "p99": percentile(0.99),
+    }
+
+
+@pytest.fixture
+def load():
+    """Drive a server with concurrent clients and return its throughput and latencies."""
+    return _load
+
+
+class SMTPRecorder:
+    """aiosmtpd handler keeping the delivered messages and rejecting the next ``fail`` ones."""
+
+    def __init__(self):
+        self.messages = []
+        self.peers = set()
+        self.fail = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        self.peers.add(session.peer)
+        if self.fail:
+            self.fail -= 1
+            return "451 4.3.0 Try again later"
+        self.messages.append(envelope.content.decode())
+        return "250 OK"
+
+
+@pytest.fixture
+def smtp_server(app, monkeypatch):
+    """Local SMTP server the app's pooled connections deliver to."""
+    aiosmtpd = pytest.importorskip("aiosmtpd.controller")
+    port = _free_port()
+
+    recorder = SMTPRecorder()
+    controller = aiosmtpd.Controller(recorder, hostname="127.0.0.1", port=port)
+    controller.start()
+    state = app.extensions["mail"]
+    for name, value in (("server", "127.0.0.1"), ("port", port), ("use_tls", False),
+                        ("use_ssl", False), ("username", None), ("suppress", False), ("debug", 0)):
+        monkeypatch.setattr(state, name, value)
+    try:
+        yield recorder
+    finally:
+        for conn in smtp_pool._idle:
+            conn.close()
+        smtp_pool._idle = []
+        controller.stop()
@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+from models import db
+from models.project import Project
+from models.task import Task, TaskHistory
+from utils.task_counters import rebuild
+from utils.timeseries import bucket_cache
+
+
+def _seed_tasks(users, per_user):
+    db.session.execute(Task.__table__.insert(), [
+        {"title": f"t{user.id}-{i}", "description": "d", "assigned_to": user.id,
+         "status": "Completed" if i % 2 else "Pending"}
+        for user in users for i in range(per_user)
+    ])
+    db.session.commit()
+    rebuild()
+
+
+def _stats_statements(client, count_statements, header):
+    with count_statements() as statements:
+        response = client.get("/analytics/stats", headers=header)
+    assert response.status_code == 200
+    return response, len(statements)
+
+
+def test_stats_query_count_does_not_grow_with_users(client, make_user, auth_header, count_statements):
+    admin = make_user("admin", role="admin")
+    users = [make_user(f"user{i}") for i in range(3)]
+    _seed_tasks(users, 4)
+    header = auth_header(admin)
+    few_response, few = _stats_statements(client, count_statements, header)
+
+    _seed_tasks([make_user(f"more{i}") for i in range(40)], 4)
+    many_response, many = _stats_statements(client, count_statements, header)
+
+    assert few == many
+    assert many <= 3
+    assert len(many_response.get_json()["analytics"]) == 44
+    stats = {row["analytics"]["username"]: row["analytics"] for row in few_response.get_json()["analytics"]}
+    assert stats["user0"]["total_tasks"] == 4
+    assert stats["user0"]["completed_tasks"] == 2
+
+
+def test_cached_burndown_buckets_follow_archived_tasks(client, make_user, auth_header, monkeypatch):
+    monkeypatch.setattr(bucket_cache, "ttl", 60)
+    bucket_cache.clear()
+    admin, worker = make_user("admin", role="admin"), make_user("worker")
+    project = Project(name="p", owner_id=admin.id)
+    db.session.add(project)
+    db.session.flush()
+    done, left = (Task(title=title, description="d", project_id=project.id, assigned_to=worker.id, status=status)
+                  for title, status in (("done", "Completed"), ("left", "Pending")))
+    db.session.add_all([done, left])
+    db.session.flush()
+    db.session.add(TaskHistory(task_id=done.id, updated_by=worker.id, old_status="Pending", new_status="Completed",
+                               old_assignee=worker.id, new_assignee=worker.id,
+                               timestamp=datetime.utcnow() - timedelta(days=4)))
+    db.session.commit()
+    today = datetime.utcnow().date()
+    url = f"/analytics/burndown?start={today - timedelta(days=6)}&end={today - timedelta(days=2)}"
+    header = auth_header(worker)
+
+    before = [bucket["remaining"] for bucket in client.get(url, headers=header).get_json()["burndown"]]
+    assert before == [2, 2, 1, 1, 1]
+
+    assert client.delete(f"/tasks/{left.id}/archive", headers=auth_header(admin)).status_code == 200
+    cached = client.get(url, headers=header).get_json()["burndown"]
+    bucket_cache.clear()
+    fresh = client.get(url, headers=header).get_json()["burndown"]
+
+    assert cached == fresh
+    assert [bucket["remaining"] for bucket in fresh] == [1, 1, 0, 0, 0]
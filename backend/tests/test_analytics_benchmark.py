@@ -0,0 +1,63 @@
+import time
+import pytest
+from models import db
+from models.task import Task
+from models.user import User
+from utils.task_counters import rebuild
+
+pytestmark = pytest.mark.benchmark
+
+
+def _legacy_stats(user_id):
+    """The per-user loop /analytics/stats ran before the grouped aggregate, 4 x users + 2 queries."""
+    db.session.get(User, user_id)
+    stats = []
+    for user in User.query.all():
+        total = Task.query.filter_by(assigned_to=user.id).count()
+        completed = Task.query.filter_by(assigned_to=user.id, status="Completed").count()
+        due = Task.query.filter(Task.assigned_to == user.id, Task.status == "Pending").count()
+        Task.query.filter_by(assigned_to=user_id, status="Pending").count()
+        stats.append((user.id, total, completed, due))
+    return stats
+
+
+def test_stats_benchmark(client, make_user, auth_header, count_statements, scaled, benchmark_report):
+    """Seed 10k users and 1M tasks and compare the old and new /analytics/stats."""
+    users, tasks = scaled(10_000), scaled(1_000_000)
+    admin = make_user("admin", role="admin")
+    db.session.execute(User.__table__.insert(), [
+        {"username": f"user{i}", "email": f"user{i}@example.com", "password": "x", "role": "user"}
+        for i in range(users - 1)
+    ])
+    user_ids = [uid for (uid,) in db.session.query(User.id)]
+    statuses = ("Pending", "Completed", "In Progress")
+    for start in range(0, tasks, 50_000):
+        db.session.execute(Task.__table__.insert(), [
+            {"title": f"t{i}", "description": "d", "assigned_to": user_ids[i % len(user_ids)], "status": statuses[i % 3]}
+            for i in range(start, min(tasks, start + 50_000))
+        ])
+    db.session.commit()
+    rebuild()
+    header, admin_id = auth_header(admin), admin.id
+    db.session.expunge_all()
+
+    with count_statements() as legacy_statements:
+        started = time.perf_counter()
+        legacy = _legacy_stats(admin_id)
+        legacy_time = time.perf_counter() - started
+
+    with count_statements() as statements:
+        started = time.perf_counter()
+        response = client.get("/analytics/stats", headers=header)
+        elapsed = time.perf_counter() - started
+
+    assert response.status_code == 200
+    assert len(legacy_statements) == 4 * users + 2
+    assert len(statements) <= 3
+    current = [(row["analytics"]["user_id"], row["analytics"]["total_tasks"], row["analytics"]["completed_tasks"],
+                row["analytics"]["due_tasks"]) for row in response.get_json()["analytics"]]
+    assert current == legacy
+    benchmark_report(
+        f"{users} users / {tasks} tasks: per-user loop {len(legacy_statements)} statements {legacy_time:.2f}s, "
+        f"grouped {len(statements)} statements {elapsed:.3f}s"
+    )
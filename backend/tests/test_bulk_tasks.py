@@ -0,0 +1,79 @@
+import json
+import pytest
+from models import db
+from models.project import Project
+from models.task import Task
+
+
+@pytest.fixture
+def admin_and_project(make_user):
+    admin = make_user("admin", role="admin")
+    project = Project(name="p", owner_id=admin.id)
+    db.session.add(project)
+    db.session.commit()
+    return admin, project
+
+
+def test_mistyped_rows_get_a_per_row_error(client, admin_and_project, auth_header):
+    admin, project = admin_and_project
+    rows = [
+        {"title": "ok", "description": "d", "project_id": project.id},
+        {"title": "list project", "description": "d", "project_id": [project.id]},
+        {"title": {"nested": 1}, "description": "d", "project_id": project.id},
+        {"title": "bad assignee", "description": "d", "project_id": project.id, "assigned_to": ["admin"]},
+    ]
+    response = client.post("/tasks/bulk", json=rows, headers=auth_header(admin))
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert [result["status"] for result in body["results"]] == ["created", "error", "error", "error"]
+    assert (body["created"], body["failed"]) == (1, 3)
+    assert Task.query.count() == 1
+
+
+def test_ndjson_is_capped_at_bulk_max_rows(app, client, admin_and_project, auth_header, monkeypatch):
+    admin, project = admin_and_project
+    monkeypatch.setitem(app.config, "BULK_MAX_ROWS", 3)
+    lines = [json.dumps({"title": f"t{i}", "description": "d", "project_id": project.id}) for i in range(4)]
+    headers = {**auth_header(admin), "Content-Type": "application/x-ndjson"}
+
+    response = client.post("/tasks/bulk", data="\n".join(lines), headers=headers)
+    assert response.status_code == 413
+    assert Task.query.count() == 0
+
+    response = client.post("/tasks/bulk", data="\n".join(lines[:3]) + "\n\n", headers=headers)
+    assert response.get_json()["created"] == 3
+
+
+def _tasks(project, count):
+    tasks = [Task(title=f"t{i}", description="d", project_id=project.id, status="Pending") for i in range(count)]
+    db.session.add_all(tasks)
+    db.session.commit()
+    return [task.id for task in tasks]
+
+
+@pytest.mark.parametrize("patch", [
+    {"title": {"nested": 1}},
+    {"status": ["Completed"]},
+    {"priority": 3},
+    {"description": ["d"]},
+])
+def test_bulk_update_rejects_mistyped_patch_values(client, admin_and_project, auth_header, patch):
+    admin, project = admin_and_project
+    task_ids = _tasks(project, 2)
+
+    response = client.patch("/tasks/bulk", json={"task_ids": task_ids, "patch": patch}, headers=auth_header(admin))
+
+    assert response.status_code == 400
+    assert Task.query.filter_by(status="Pending").count() == 2
+
+
+def test_bulk_archive_reports_missing_tasks(client, admin_and_project, auth_header):
+    admin, project = admin_and_project
+    task_ids = _tasks(project, 2)
+
+    response = client.delete("/tasks/bulk/archive", json={"task_ids": task_ids + [9999]}, headers=auth_header(admin))
+
+    assert response.status_code == 404
+    assert response.get_json()["task_ids"] == [9999]
+    assert Task.query.count() == 2
@@ -0,0 +1,32 @@
+from models import db
+from utils.identity import invalidate_user, revoke_user_tokens
+from utils.security import generate_token
+
+
+def test_events_accept_the_cookie_and_not_the_query_string(client, make_user):
+    user = make_user("user")
+    token = generate_token(user)
+
+    assert client.get(f"/events?jwt={token}").status_code == 401
+
+    client.set_cookie("access_token", token)
+    response = client.get("/events", buffered=False)
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+    response.close()
+
+
+def test_stream_ends_once_the_token_is_revoked(app, client, make_user, monkeypatch):
+    monkeypatch.setitem(app.config, "EVENTS_KEEPALIVE", 0.05)
+    user = make_user("user")
+    client.set_cookie("access_token", generate_token(user))
+    response = client.get("/events", buffered=False)
+    chunks = iter(response.response)
+    assert next(chunks) == b"retry: 3000\n\n"
+    assert next(chunks) == b": keep-alive\n\n"
+
+    revoke_user_tokens(user)
+    db.session.commit()
+    invalidate_user(user.id)
+
+    assert list(chunks) == []
@@ -0,0 +1,47 @@
+from models import db
+from models.counter import TaskCounter
+from models.table_version import TableVersion
+from models.task import Task
+from utils.task_counters import rebuild
+
+
+def _version(name):
+    row = db.session.get(TableVersion, name)
+    return row.version if row else 0
+
+
+def test_versions_are_bumped_after_commit_outside_the_write(make_user, count_statements):
+    user = make_user("user")
+    before = _version("task")
+
+    with count_statements() as statements:
+        db.session.add(Task(title="t", description="d", assigned_to=user.id, status="Pending"))
+        db.session.flush()
+    assert not any("table_version" in statement for statement in statements)
+    assert _version("task") == before
+
+    db.session.commit()
+    assert _version("task") == before + 1
+
+    db.session.add(Task(title="t2", description="d", assigned_to=user.id, status="Pending"))
+    db.session.flush()
+    db.session.rollback()
+    assert _version("task") == before + 1
+
+
+def test_rebuilding_counters_changes_the_stats_etag(client, make_user, auth_header):
+    admin = make_user("admin", role="admin")
+    # drifted counters, written behind the session's back
+    with db.engine.begin() as connection:
+        connection.execute(TaskCounter.__table__.insert().values(
+            scope="user", scope_id=admin.id, total=7, completed=0, pending=7
+        ))
+    header = auth_header(admin)
+    etag = client.get("/analytics/stats", headers=header).headers["ETag"]
+    assert client.get("/analytics/stats", headers={**header, "If-None-Match": etag}).status_code == 304
+
+    rebuild()
+
+    response = client.get("/analytics/stats", headers={**header, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
@@ -0,0 +1,30 @@
+import pytest
+from sqlalchemy import text
+from models import db
+from models.archive import ArchivedTask
+from models.project import Project, ProjectHistory
+from models.task import Task, TaskHistory
+
+
+def _plan(query):
+    statement = query.statement.compile(db.engine, compile_kwargs={"literal_binds": True})
+    rows = db.session.execute(text(f"EXPLAIN QUERY PLAN {statement}")).all()
+    return " | ".join(row[-1] for row in rows)
+
+
+@pytest.mark.parametrize("build, indexes", [
+    (lambda: Task.query.filter(Task.assigned_to == 3, Task.status == "Pending"), {"ix_task_assigned_to_status"}),
+    (lambda: Task.query.filter(Task.assigned_to == 3), {"ix_task_assigned_to_status", "ix_task_assigned_to_due_date"}),
+    (lambda: Task.query.filter(Task.project_id == 1, Task.title == "t"), {"ix_task_project_id_title"}),
+    (lambda: TaskHistory.query.filter(TaskHistory.task_id == 1).order_by(TaskHistory.timestamp),
+     {"ix_task_history_task_id_timestamp"}),
+    (lambda: ProjectHistory.query.filter(ProjectHistory.project_id == 1).order_by(ProjectHistory.timestamp),
+     {"ix_project_history_project_id_timestamp"}),
+    (lambda: ArchivedTask.query.filter(ArchivedTask.project_id == 1), {"ix_archived_task_project_id"}),
+    (lambda: ArchivedTask.query.filter(ArchivedTask.assigned_to == 3), {"ix_archived_task_assigned_to"}),
+    (lambda: Project.query.filter(Project.owner_id == 3), {"ix_project_owner_id"}),
+])
+def test_hot_filters_use_an_index(build, indexes):
+    plan = _plan(build())
+    assert "SCAN" not in plan.replace("SCAN CONSTANT", ""), plan
+    assert any(f"INDEX {index} " in plan + " " for index in indexes), plan
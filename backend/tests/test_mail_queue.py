@@ -0,0 +1,90 @@
+import json
+from datetime import datetime, timedelta
+import pytest
+from models import db
+from models.outbox import DeadLetterMail, OutboundMail
+from utils.mail_queue import mail_queue
+
+
+@pytest.fixture
+def queue(app, smtp_server, monkeypatch):
+    for name, value in (("MAIL_QUEUE_ENABLED", True), ("MAIL_QUEUE_WORKERS", 0),
+                        ("MAIL_RETRY_BACKOFF", 30), ("MAIL_MAX_ATTEMPTS", 3)):
+        monkeypatch.setitem(app.config, name, value)
+    return mail_queue
+
+
+def _make_due():
+    OutboundMail.query.update({"next_attempt_at": datetime.utcnow() - timedelta(seconds=1)})
+    db.session.commit()
+
+
+def test_enqueue_joins_the_callers_transaction(queue, smtp_server):
+    queue.enqueue("otp", ["a@example.com"], sender="noreply@example.com", otp="123456")
+    db.session.rollback()
+    assert OutboundMail.query.count() == 0
+
+    queue.enqueue("otp", ["a@example.com"], sender="noreply@example.com", otp="123456")
+    db.session.commit()
+    row = OutboundMail.query.one()
+    assert (row.template, json.loads(row.context)) == ("otp", {"otp": "123456"})
+
+    assert queue.drain() == 1
+    assert len(smtp_server.messages) == 1
+    assert "Your OTP Code is 123456" in smtp_server.messages[0]
+    assert OutboundMail.query.count() == 0
+
+
+def test_failed_delivery_is_retried_with_backoff(queue, smtp_server):
+    smtp_server.fail = 1
+    queue.enqueue("welcome", ["a@example.com"], sender="noreply@example.com")
+    db.session.commit()
+
+    before = datetime.utcnow()
+    assert queue.drain() == 1
+    row = OutboundMail.query.one()
+    assert row.attempts == 1
+    assert "451" in row.last_error
+    assert timedelta(seconds=29) < row.next_attempt_at - before < timedelta(seconds=31)
+    assert queue.drain() == 0
+
+    _make_due()
+    assert queue.drain() == 1
+    assert len(smtp_server.messages) == 1
+    assert OutboundMail.query.count() == 0
+
+
+def test_undeliverable_mail_is_dead_lettered_without_its_arguments(queue, smtp_server):
+    smtp_server.fail = 3
+    queue.enqueue("teammate_created", ["a@example.com"], sender="noreply@example.com",
+                  username="alice", password="s3cret-pa55")
+    db.session.commit()
+
+    delays = []
+    for _ in range(2):
+        before = datetime.utcnow()
+        queue.drain()
+        delays.append(round((OutboundMail.query.one().next_attempt_at - before).total_seconds()))
+        _make_due()
+    assert delays == [30, 60]
+
+    queue.drain()
+    assert OutboundMail.query.count() == 0
+    dead = DeadLetterMail.query.one()
+    assert (dead.template, dead.attempts) == ("teammate_created", 3)
+    assert not any("s3cret-pa55" in str(value) for value in vars(dead).values())
+    assert smtp_server.messages == []
+
+
+def test_message_claimed_by_another_worker_is_not_sent(queue, smtp_server):
+    queue.enqueue("welcome", ["a@example.com"], sender="noreply@example.com")
+    db.session.commit()
+
+    row = queue._claim()[0]
+    # the lease ran out and another worker claimed the message
+    OutboundMail.query.update({"next_attempt_at": datetime.utcnow() + timedelta(minutes=5)})
+    db.session.commit()
+
+    queue._deliver(row)
+    assert smtp_server.messages == []
+    assert OutboundMail.query.count() == 1
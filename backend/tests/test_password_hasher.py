@@ -0,0 +1,56 @@
+import threading
+import time
+import bcrypt
+import pytest
+from werkzeug.exceptions import HTTPException
+from utils.password_hasher import password_hasher
+
+
+def test_slow_hash_is_answered_with_503_within_the_timeout(monkeypatch):
+    monkeypatch.setattr(password_hasher, "timeout", 0.05)
+
+    started = time.monotonic()
+    with pytest.raises(HTTPException) as raised:
+        password_hasher._run(time.sleep, 0.3)
+    assert time.monotonic() - started < 0.25
+    assert raised.value.response.status_code == 503
+    assert raised.value.response.headers["Retry-After"] == "1"
+
+    time.sleep(0.3)
+    assert password_hasher._run(sum, [1, 2]) == 3
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("rounds", [4, 8, 10, 12])
+def test_login_benchmark(app, make_user, monkeypatch, scaled, benchmark_report, rounds):
+    """16 clients log in for a few seconds with ``BCRYPT_QUEUE_TIMEOUT`` at 2 seconds; the OTP mail is only queued."""
+    monkeypatch.setitem(app.config, "MAIL_QUEUE_ENABLED", True)
+    monkeypatch.setitem(app.config, "MAIL_QUEUE_WORKERS", 0)
+    monkeypatch.setattr(password_hasher, "rounds", rounds)
+    monkeypatch.setattr(password_hasher, "timeout", 2.0)
+    password = bcrypt.hashpw(b"benchmark-password", bcrypt.gensalt(rounds)).decode()
+    emails = [make_user(f"login{i}", password=password).email for i in range(16)]
+    statuses = []
+    stop_at = time.monotonic() + scaled(5)
+
+    def client(email):
+        with app.test_client() as http:
+            while time.monotonic() < stop_at:
+                response = http.post("/auth/login", json={"email": email, "password": "benchmark-password"})
+                statuses.append(response.status_code)
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=client, args=(email,)) for email in emails]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+
+    logins = statuses.count(200)
+    benchmark_report(
+        f"cost {rounds}: {logins / elapsed:.1f} logins/s, {statuses.count(503)} busy (503) "
+        f"of {len(statuses)} attempts, {password_hasher.app.config['BCRYPT_WORKERS']} bcrypt worker(s)"
+    )
+    assert logins
+    assert set(statuses) <= {200, 503}
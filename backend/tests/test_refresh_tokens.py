@@ -0,0 +1,95 @@
+import time
+import uuid
+from datetime import datetime, timedelta
+import pytest
+from flask_jwt_extended import decode_token, verify_jwt_in_request
+from models import db
+from models.refresh_token import RefreshToken
+from utils.identity import token_version_cache
+from utils.refresh_tokens import refresh_tokens
+from utils.security import generate_token
+
+
+def _refresh(client, token):
+    return client.post("/auth/refresh", json={"refresh_token": token})
+
+
+def _jti(response):
+    return decode_token(response.get_json()["refresh_token"])["jti"]
+
+
+def test_concurrent_refreshes_get_the_same_successor(client, make_user):
+    user = make_user("user")
+    token = refresh_tokens.issue(user)
+    db.session.commit()
+
+    first, second = _refresh(client, token), _refresh(client, token)
+
+    assert (first.status_code, second.status_code) == (200, 200)
+    assert _jti(first) == _jti(second)
+    assert _refresh(client, second.get_json()["refresh_token"]).status_code == 200
+
+
+def test_replay_after_the_grace_window_revokes_the_user(app, client, make_user, monkeypatch):
+    user = make_user("user")
+    token = refresh_tokens.issue(user)
+    db.session.commit()
+    successor = _refresh(client, token).get_json()["refresh_token"]
+
+    monkeypatch.setitem(app.config, "REFRESH_TOKEN_GRACE", 0)
+    assert _refresh(client, token).status_code == 401
+    assert RefreshToken.query.filter_by(user_id=user.id).count() == 0
+    assert _refresh(client, successor).status_code == 401
+
+
+def test_purge_during_a_rotation_does_not_commit_the_claim(app, make_user, monkeypatch):
+    user = make_user("user")
+    token = refresh_tokens.issue(user)
+    db.session.commit()
+    monkeypatch.setitem(app.config, "REFRESH_TOKEN_CLEANUP_EVERY", 1)
+
+    assert refresh_tokens.rotate(decode_token(token), user) is not None
+    db.session.rollback()
+
+    assert db.session.get(RefreshToken, decode_token(token)["jti"]).replaced_by is None
+
+
+def _validate(app, header, count):
+    started = time.perf_counter()
+    for _ in range(count):
+        with app.test_request_context(headers=header):
+            verify_jwt_in_request()
+    return (time.perf_counter() - started) / count * 1e6
+
+
+@pytest.mark.benchmark
+def test_access_token_validation_benchmark(app, make_user, monkeypatch, count_statements, scaled, benchmark_report):
+    """Access tokens are checked without the refresh_token table, whatever its size."""
+    monkeypatch.setattr(token_version_cache, "ttl", 60)
+    token_version_cache.clear()
+    user = make_user("user")
+    header = {"Authorization": f"Bearer {generate_token(user)}"}
+    validations = scaled(2_000)
+    _validate(app, header, 1)
+
+    with count_statements() as statements:
+        empty = _validate(app, header, validations)
+    assert statements == []
+
+    rows = scaled(200_000)
+    expires_at = datetime.utcnow() + timedelta(days=1)
+    for start in range(0, rows, 50_000):
+        db.session.execute(RefreshToken.__table__.insert(), [
+            {"jti": str(uuid.uuid4()), "user_id": user.id, "expires_at": expires_at}
+            for _ in range(start, min(rows, start + 50_000))
+        ])
+    db.session.commit()
+
+    with count_statements() as statements:
+        full = _validate(app, header, validations)
+    assert statements == []
+
+    benchmark_report(
+        f"{validations} access token validations: {empty:.0f} us each with no refresh tokens, "
+        f"{full:.0f} us each with {rows} refresh tokens, 0 statements"
+    )
@@ -0,0 +1,36 @@
+import pytest
+from sqlalchemy import event, select
+from models import db
+from models.user import User
+from utils import replica
+from utils.replica import ReplicaRouter
+
+
+@pytest.fixture
+def router(app, monkeypatch):
+    router = ReplicaRouter()
+    router.app = app
+    monkeypatch.setattr(router, "lag", lambda: 0.0)
+    event.listen(db.session, "after_flush", replica._after_flush)
+    yield router
+    event.remove(db.session, "after_flush", replica._after_flush)
+
+
+def test_reads_after_a_write_stay_on_the_primary(app, router):
+    with app.test_request_context("/tasks/", method="GET"):
+        session = db.session()
+        assert router.use_replica(session, select(User.id))
+
+        session.add(User(username="u", email="u@example.com", password="x", role="user"))
+        assert not router.use_replica(session, select(User.id))
+
+        session.flush()
+        assert not session.new
+        assert not router.use_replica(session, select(User.id))
+        db.session.remove()
+
+
+def test_writes_are_never_sent_to_the_replica(app, router):
+    with app.test_request_context("/tasks/", method="GET"):
+        assert not router.use_replica(db.session(), User.__table__.update().values(role="admin"))
+        db.session.remove()
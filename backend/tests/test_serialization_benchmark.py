@@ -0,0 +1,70 @@
+import time
+from datetime import date
+import pytest
+from flask.json.provider import DefaultJSONProvider
+from models import db
+from models.task import Task
+from models.user import User
+from utils.serializers import TASK, OrjsonProvider
+
+pytestmark = pytest.mark.benchmark
+
+
+def _legacy_dicts(tasks):
+    """The hand-built task dicts and the IN query for assignee usernames that TASK replaced."""
+    user_ids = {t.assigned_to for t in tasks if t.assigned_to}
+    usernames = dict(db.session.query(User.id, User.username).filter(User.id.in_(user_ids)).all())
+    return [
+        {
+            "id": t.id,
+            "title": t.title,
+            "status": t.status,
+            "priority": t.priority,
+            "assigned_to": usernames.get(t.assigned_to),
+            "description": t.description,
+            "due_date": t.due_date,
+            "project_id": t.project_id,
+        }
+        for t in tasks
+    ]
+
+
+def _best(fn, repeat):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        db.session.expunge_all()
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+
+def test_serialize_tasks_benchmark(app, make_user, benchmark_report):
+    """Fetch, dict building and encoding of 1k tasks, before and after the row schemas and orjson."""
+    pytest.importorskip("orjson")
+    users = [make_user(f"user{i}") for i in range(20)]
+    db.session.execute(Task.__table__.insert(), [
+        {"title": f"task {i}", "description": "d" * 200, "status": "Pending", "priority": "Medium",
+         "assigned_to": users[i % len(users)].id, "due_date": date(2026, 1, 1 + i % 28)}
+        for i in range(1_000)
+    ])
+    db.session.commit()
+    query = Task.query.order_by(Task.id)
+    default_json, fast_json = DefaultJSONProvider(app), OrjsonProvider(app)
+
+    fetch_objects, tasks = _best(lambda: query.all(), 30)
+    fetch_rows, rows = _best(lambda: TASK.select(query).all(), 30)
+    build_legacy, legacy = _best(lambda: _legacy_dicts(tasks), 30)
+    build_rows, dumped = _best(lambda: TASK.dump_all(rows), 30)
+    encode_json, before = _best(lambda: default_json.dumps({"tasks": legacy}), 30)
+    encode_orjson, after = _best(lambda: fast_json.dumps({"tasks": dumped}), 30)
+    total_before, _ = _best(lambda: default_json.dumps({"tasks": _legacy_dicts(query.all())}), 30)
+    total_after, _ = _best(lambda: fast_json.dumps({"tasks": TASK.dump_all(TASK.select(query).all())}), 30)
+
+    assert len(tasks) == len(rows) == 1_000
+    assert default_json.loads(before) == default_json.loads(after)
+    benchmark_report(
+        f"1k tasks, best of 30 (ms): fetch ORM {fetch_objects:.2f} vs rows {fetch_rows:.2f}; "
+        f"dicts by hand incl. IN query {build_legacy:.2f} vs dump_all {build_rows:.2f}; "
+        f"json {encode_json:.2f} vs orjson {encode_orjson:.2f}; end to end {total_before:.2f} vs {total_after:.2f}"
+    )
@@ -0,0 +1,114 @@
+import json
+import threading
+import urllib.request
+import bcrypt
+import pytest
+from models import db
+from models.project import Project
+from models.task import Task
+
+pytestmark = pytest.mark.benchmark
+
+WORKER_CLASSES = ("sync", "gevent")
+LOGIN_ROUNDS = 10
+
+
+@pytest.fixture
+def seeded(make_user, auth_header):
+    """An admin with 500 tasks to list and a user who can log in."""
+    admin = make_user("admin", role="admin")
+    password = bcrypt.hashpw(b"benchmark-password", bcrypt.gensalt(LOGIN_ROUNDS)).decode()
+    make_user("login", password=password)
+    project = Project(name="load", owner_id=admin.id)
+    db.session.add(project)
+    db.session.flush()
+    db.session.execute(Task.__table__.insert(), [
+        {"title": f"task {i}", "description": "d", "project_id": project.id, "assigned_to": admin.id, "status": "Pending"}
+        for i in range(500)
+    ])
+    db.session.commit()
+    return auth_header(admin)
+
+
+def _format(stats):
+    return f"{stats['requests']:.1f} req/s, p50 {stats['p50']:.1f} ms, p99 {stats['p99']:.1f} ms, {stats['errors']} errors"
+
+
+def _run(serve, load, make_request, clients, duration, **env):
+    results = {}
+    for worker_class in WORKER_CLASSES:
+        if worker_class == "gevent":
+            pytest.importorskip("gevent")
+        with serve(worker_class, BCRYPT_LOG_ROUNDS=LOGIN_ROUNDS, **env) as url:
+            results[worker_class] = load(lambda: make_request(url), clients, duration)
+    return results
+
+
+def test_task_list_throughput(serve, load, seeded, scaled, benchmark_report):
+    results = _run(serve, load, lambda url: urllib.request.Request(f"{url}/tasks/", headers=seeded), 32, scaled(5))
+
+    benchmark_report("GET /tasks/, 32 clients: " + "; ".join(f"{name} {_format(stats)}" for name, stats in results.items()))
+    assert all(stats["requests"] for stats in results.values())
+
+
+def test_login_throughput(serve, load, seeded, scaled, benchmark_report):
+    body = json.dumps({"email": "login@example.com", "password": "benchmark-password"}).encode()
+
+    def login(url):
+        return urllib.request.Request(f"{url}/auth/login", data=body, headers={"Content-Type": "application/json"})
+
+    results = _run(serve, load, login, 16, scaled(5))
+
+    benchmark_report(
+        f"POST /auth/login (cost {LOGIN_ROUNDS}), 16 clients: "
+        + "; ".join(f"{name} {_format(stats)}" for name, stats in results.items())
+    )
+    assert all(stats["requests"] for stats in results.values())
+
+
+def test_task_list_throughput_with_open_event_streams(serve, load, seeded, scaled, benchmark_report):
+    """Eight open /events streams take every sync worker; gevent keeps serving reads next to them."""
+    results = {}
+    for worker_class in WORKER_CLASSES:
+        if worker_class == "gevent":
+            pytest.importorskip("gevent")
+        with serve(worker_class, BCRYPT_LOG_ROUNDS=LOGIN_ROUNDS) as url:
+            streams = []
+
+            def listen():
+                try:
+                    streams.append(urllib.request.urlopen(urllib.request.Request(f"{url}/events", headers=seeded), timeout=60))
+                except OSError:
+                    pass
+
+            openers = [threading.Thread(target=listen, daemon=True) for _ in range(8)]
+            for opener in openers:
+                opener.start()
+            for opener in openers:
+                opener.join(timeout=2)
+            try:
+                results[worker_class] = load(
+                    lambda: urllib.request.Request(f"{url}/tasks/", headers=seeded), 32, scaled(5)
+                )
+            finally:
+                for stream in streams:
+                    stream.close()
+
+    benchmark_report(
+        "GET /tasks/ with 8 open /events, 32 clients: "
+        + "; ".join(f"{name} {_format(stats)}" for name, stats in results.items())
+    )
+    assert results["gevent"]["requests"]
+
+
+def test_authenticated_read_latency_with_the_user_cache(serve, load, seeded, scaled, benchmark_report):
+    """GET /tasks/ under the default gevent workers, loading the current user every request vs from the cache."""
+    pytest.importorskip("gevent")
+    results = {}
+    for name, ttl in (("uncached", 0), ("cached", 5)):
+        with serve("gevent", CURRENT_USER_CACHE_TTL=ttl) as url:
+            load(lambda: urllib.request.Request(f"{url}/tasks/", headers=seeded), 1, 1)
+            results[name] = load(lambda: urllib.request.Request(f"{url}/tasks/", headers=seeded), 1, scaled(10))
+
+    benchmark_report("GET /tasks/, 1 client: " + "; ".join(f"{name} {_format(stats)}" for name, stats in results.items()))
+    assert all(stats["requests"] for stats in results.values())
@@ -0,0 +1,42 @@
+import smtplib
+import time
+from flask_mail import Message
+from utils.smtp_pool import smtp_pool
+
+
+def _messages(count):
+    return [
+        Message(f"Message {i}", sender="noreply@example.com", recipients=["a@example.com"], body="Hello")
+        for i in range(count)
+    ]
+
+
+def test_send_many_benchmark(app, smtp_server, benchmark_report):
+    """Pooled delivery uses one connection; the throughput is listed in the benchmark summary."""
+    count = 200
+    started = time.perf_counter()
+    results = smtp_pool.send_many(_messages(count))
+    pooled = time.perf_counter() - started
+
+    assert results == [None] * count
+    assert len(smtp_server.messages) == count
+    assert len(smtp_server.peers) == 1
+
+    mail = app.extensions["mail"]
+    started = time.perf_counter()
+    for msg in _messages(count):
+        mail.send(msg)
+    unpooled = time.perf_counter() - started
+
+    assert len(smtp_server.peers) == 1 + count
+    benchmark_report(f"send_many {count / pooled:.0f} msg/s, Mail.send per message {count / unpooled:.0f} msg/s")
+
+
+def test_error_reply_is_recorded_without_a_retry(app, smtp_server):
+    smtp_server.fail = 1
+    first, second = smtp_pool.send_many(_messages(2))
+
+    assert isinstance(first, smtplib.SMTPDataError)
+    assert second is None
+    assert len(smtp_server.messages) == 1
+    assert len(smtp_server.peers) == 1
@@ -0,0 +1,73 @@
+import pytest
+from models import db
+from models.archive import ArchivedTask
+from models.project import Project
+from models.task import Task
+
+
+@pytest.fixture
+def seeded(make_user):
+    admin = make_user("admin", role="admin")
+    users = [make_user(f"user{i}") for i in range(30)]
+    project = Project(name="p", owner_id=admin.id)
+    db.session.add(project)
+    db.session.commit()
+    db.session.execute(Task.__table__.insert(), [
+        {"title": f"t{i}", "description": "d", "project_id": project.id,
+         "assigned_to": users[i % len(users)].id, "status": "Pending"}
+        for i in range(120)
+    ])
+    db.session.execute(ArchivedTask.__table__.insert(), [
+        {"task_id": 1000 + i, "title": f"a{i}", "project_id": project.id,
+         "assigned_to": users[i % len(users)].id, "deleted_by": admin.id}
+        for i in range(120)
+    ])
+    db.session.commit()
+    return admin, users
+
+
+@pytest.mark.parametrize("url, key", [
+    ("/tasks/", "tasks"),
+    ("/tasks/team-tasks", "team_tasks"),
+    ("/tasks/archived", "archived_tasks"),
+])
+def test_list_query_count_does_not_grow_with_page_size(client, seeded, auth_header, count_statements, url, key):
+    admin, users = seeded
+    header = auth_header(admin)
+    counts = []
+    for per_page in (5, 100):
+        with count_statements() as statements:
+            response = client.get(f"{url}?per_page={per_page}", headers=header)
+        assert response.status_code == 200
+        items = response.get_json()[key]
+        assert len(items) == per_page
+        assert {item["assigned_to"] for item in items} <= {user.username for user in users}
+        counts.append(len(statements))
+    assert counts[0] == counts[1]
+
+
+def test_user_tasks_query_count_does_not_grow_with_page_size(client, seeded, auth_header, count_statements):
+    admin, users = seeded
+    db.session.execute(Task.__table__.update().values(assigned_to=users[0].id))
+    db.session.commit()
+    header = auth_header(users[0])
+    counts = []
+    for per_page in (5, 100):
+        with count_statements() as statements:
+            response = client.get(f"/tasks/user-tasks?per_page={per_page}", headers=header)
+        assert response.status_code == 200
+        assert [task["assigned_to"] for task in response.get_json()["my_tasks"]] == [users[0].username] * per_page
+        counts.append(len(statements))
+    assert counts[0] == counts[1]
+
+
+def test_keyset_total_is_the_same_on_every_page(client, seeded, auth_header):
+    admin, users = seeded
+    header = auth_header(admin)
+    first = client.get("/tasks/?per_page=50&cursor=&include_total=true", headers=header).get_json()
+    second = client.get(
+        f"/tasks/?per_page=50&cursor={first['next_cursor']}&include_total=true", headers=header
+    ).get_json()
+
+    assert (first["total"], second["total"]) == (120, 120)
+    assert len(second["tasks"]) == 50
@@ -0,0 +1,65 @@
+import json
+import pytest
+from models import db
+from models.archive import ArchivedTask
+from models.project import Project
+from models.task import Task, TaskHistory
+
+
+@pytest.fixture
+def leader(make_user):
+    leader = make_user("leader", role="team_leader")
+    other = make_user("other", role="team_leader")
+    led, foreign = Project(name="led", owner_id=leader.id), Project(name="foreign", owner_id=other.id)
+    db.session.add_all([led, foreign])
+    db.session.flush()
+    db.session.add_all([
+        Task(title="report led", description="d", project_id=led.id, status="Pending"),
+        Task(title="report foreign", description="d", project_id=foreign.id, status="Pending"),
+        ArchivedTask(task_id=100, title="old led", project_id=led.id, deleted_by=leader.id),
+        ArchivedTask(task_id=101, title="old foreign", project_id=foreign.id, deleted_by=other.id),
+    ])
+    db.session.commit()
+    return leader
+
+
+@pytest.mark.parametrize("url, key, title", [
+    ("/tasks/", "tasks", "report led"),
+    ("/tasks/search?q=report", "tasks", "report led"),
+    ("/tasks/archived", "archived_tasks", "old led"),
+])
+def test_team_leader_sees_the_tasks_of_projects_they_own(client, leader, auth_header, url, key, title):
+    response = client.get(url, headers=auth_header(leader))
+
+    assert response.status_code == 200
+    assert [task["title"] for task in response.get_json()[key]] == [title]
+
+
+def test_reassigning_a_project_changes_the_task_list_etag(client, leader, make_user, auth_header):
+    admin = make_user("admin", role="admin")
+    foreign = Project.query.filter_by(name="foreign").one()
+    etag = client.get("/tasks/", headers=auth_header(leader)).headers["ETag"]
+
+    response = client.put(f"/projects/{foreign.id}/assign", json={"assigned_to": leader.id}, headers=auth_header(admin))
+    assert response.status_code == 200
+
+    response = client.get("/tasks/", headers={**auth_header(leader), "If-None-Match": etag})
+    assert response.status_code == 200
+    assert sorted(task["title"] for task in response.get_json()["tasks"]) == ["report foreign", "report led"]
+
+
+def test_team_leader_exports_the_history_of_projects_they_own(client, leader, auth_header):
+    tasks = {task.title: task.id for task in Task.query.all()}
+    db.session.add_all([
+        TaskHistory(task_id=tasks["report led"], updated_by=leader.id, old_status="Pending", new_status="In Progress"),
+        TaskHistory(task_id=tasks["report foreign"], updated_by=leader.id, old_status="Pending", new_status="In Progress"),
+        TaskHistory(task_id=100, updated_by=leader.id, old_status="In Progress", new_status="Completed"),
+        TaskHistory(task_id=101, updated_by=leader.id, old_status="In Progress", new_status="Completed"),
+    ])
+    db.session.commit()
+
+    response = client.get("/tasks/history/export", headers=auth_header(leader))
+
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert sorted(row["task_id"] for row in rows) == [tasks["report led"], 100]
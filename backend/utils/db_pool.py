@@ -0,0 +1,83 @@
+import os
+import threading
+import time
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+from models import db
+
+
+class MeteredQueuePool(QueuePool):
+    """A ``QueuePool`` that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.record_timeout()
+            raise
+        finally:
+            pool_metrics.record_wait(time.perf_counter() - start)
+
+
+class PoolMetrics:
+    """
+    Usage numbers of the database connection pool of this worker process.
+
+    When ``SQLALCHEMY_ENGINE_OPTIONS`` configures a sized pool, the engine gets
+    a ``MeteredQueuePool`` so the time spent waiting for a free connection is
+    recorded along with the pool's own checked-out and overflow counts. Each
+    gunicorn worker has its own pool, so ``snapshot()`` describes only the
+    process that serves the request.
+    """
+
+    def __init__(self):
+        self.app = None
+        self._lock = threading.Lock()
+        self._checkouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._timeouts = 0
+
+    def init_app(self, app):
+        """Must run before ``db.init_app`` so the engine is created with the metered pool."""
+        self.app = app
+        app.extensions["pool_metrics"] = self
+        options = dict(app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+        if "pool_size" in options and "poolclass" not in options:
+            options["poolclass"] = MeteredQueuePool
+        app.config["SQLALCHEMY_ENGINE_OPTIONS"] = options
+
+    def record_wait(self, seconds):
+        with self._lock:
+            self._checkouts += 1
+            self._wait_total += seconds
+            self._wait_max = max(self._wait_max, seconds)
+
+    def record_timeout(self):
+        with self._lock:
+            self._timeouts += 1
+
+    def snapshot(self):
+        """Return the current pool state and the wait times recorded so far."""
+        pool = db.engine.pool
+        stats = {"pid": os.getpid(), "pool": type(pool).__name__, "status": pool.status()}
+        if isinstance(pool, QueuePool):
+            stats.update(
+                size=pool.size(),
+                checked_in=pool.checkedin(),
+                checked_out=pool.checkedout(),
+                overflow=max(pool.overflow(), 0),
+            )
+        if isinstance(pool, MeteredQueuePool):
+            with self._lock:
+                stats.update(
+                    checkouts=self._checkouts,
+                    wait_ms_avg=round(self._wait_total / self._checkouts * 1000, 3) if self._checkouts else 0.0,
+                    wait_ms_max=round(self._wait_max * 1000, 3),
+                    timeouts=self._timeouts,
+                )
+        return stats
+
+
+pool_metrics = PoolMetrics()
@@ -0,0 +1,267 @@
+import itertools
+import json
+import logging
+import os
+import queue
+import select
+import threading
+import time
+from werkzeug.utils import import_string
+from models import db
+from utils.identity import is_token_revoked
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """
+    One connected ``/events`` client.
+
+    Attributes:
+        user_id (int): The subscribed user.
+        role (str): The role of the subscribed user.
+        project_ids (set, optional): Projects to receive events for, or None for all visible ones.
+        claims (dict, optional): The decoded access token the stream was opened with.
+    """
+
+    def __init__(self, user_id, role, project_ids=None, maxsize=100, claims=None):
+        self.user_id = user_id
+        self.role = role
+        self.project_ids = project_ids
+        self.claims = claims
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+    def wants(self, event):
+        """Return True when the subscriber is allowed to, and asked to, see ``event``."""
+        if self.project_ids is not None and event.get("project_id") not in self.project_ids:
+            return False
+        if self.role in ["admin", "team_leader"]:
+            return True
+        return self.user_id in event.get("audience", ())
+
+    def deliver(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            self.overflowed = True
+
+
+class InProcessBroker:
+    """
+    Fans events out to the subscribers of the current process.
+
+    Publishing only walks the in-memory subscriber list, so one write notifies
+    any number of clients without a database query. With several worker
+    processes use ``PostgresBroker`` (or another ``EVENTS_BROKER``) instead, so
+    that events published in one process reach clients connected to the others.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def subscribe(self, subscription):
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, events):
+        self.dispatch(events)
+
+    def dispatch(self, events):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for event in events:
+            event = dict(event, id=next(self._ids))
+            for subscription in subscribers:
+                if subscription.wants(event):
+                    subscription.deliver(event)
+
+
+class PostgresBroker(InProcessBroker):
+    """
+    Broker for several worker processes sharing a PostgreSQL database.
+
+    Events are sent with ``pg_notify``, one notification per published batch,
+    and every process runs one thread that LISTENs on the channel and
+    dispatches what it receives to its own subscribers. A batch must stay
+    under PostgreSQL's 8000 byte payload limit, so large ones are split.
+    """
+
+    channel = "taskhorizon_events"
+
+    def __init__(self, app):
+        super().__init__(app)
+        self._listener_pid = None
+
+    def subscribe(self, subscription):
+        self._ensure_listening()
+        return super().subscribe(subscription)
+
+    def publish(self, events):
+        payloads = []
+        batch = []
+        for event in events:
+            if batch and len(json.dumps(batch + [event])) > 7500:
+                payloads.append(json.dumps(batch))
+                batch = []
+            batch.append(event)
+        if batch:
+            payloads.append(json.dumps(batch))
+
+        with self.app.app_context():
+            with db.engine.connect() as connection:
+                connection.execute(
+                    db.text("SELECT pg_notify(:channel, :payload)"),
+                    [{"channel": self.channel, "payload": payload} for payload in payloads],
+                )
+                connection.commit()
+
+    def _ensure_listening(self):
+        with self._lock:
+            if self._listener_pid == os.getpid():
+                return
+            self._listener_pid = os.getpid()
+        threading.Thread(target=self._listen, name="events-listener", daemon=True).start()
+
+    def _listen(self):
+        while True:
+            try:
+                with self.app.app_context():
+                    connection = db.engine.raw_connection()
+                try:
+                    connection.set_session(autocommit=True)
+                    connection.cursor().execute(f"LISTEN {self.channel}")
+                    while True:
+                        if select.select([connection], [], [], 60) == ([], [], []):
+                            continue
+                        connection.poll()
+                        while connection.notifies:
+                            notify = connection.notifies.pop(0)
+                            self.dispatch(json.loads(notify.payload))
+                finally:
+                    connection.close()
+            except Exception:
+                logger.exception("Event listener failed, reconnecting")
+                threading.Event().wait(5)
+
+
+class EventBus:
+    """
+    Publishes task and project change events to ``GET /events`` subscribers.
+
+    Write controllers call ``publish()`` after their commit with the data they
+    already have at hand; no extra query is made. Each event carries the
+    ``project_id`` and an ``audience`` of user IDs (assignees, owners) used to
+    filter what plain users receive; admins and team leaders get everything.
+
+    A stream re-checks the access token it was opened with at least every
+    ``EVENTS_KEEPALIVE`` seconds and ends once the token has expired or was
+    revoked. Changing a user's role or password revokes their tokens, so a
+    demoted user stops receiving events within one keep-alive interval.
+
+    Configuration:
+        EVENTS_BROKER: Import path of the broker class. Defaults to ``PostgresBroker``
+            when the database is PostgreSQL and ``InProcessBroker`` otherwise.
+        EVENTS_QUEUE_SIZE: Events buffered per client before it is disconnected as too slow.
+        EVENTS_KEEPALIVE: Seconds between keep-alive comments and token checks on a stream.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.broker = None
+
+    def init_app(self, app):
+        self.app = app
+        app.extensions["event_bus"] = self
+        broker = app.config.get("EVENTS_BROKER")
+        if not broker:
+            database_uri = app.config.get("SQLALCHEMY_DATABASE_URI") or ""
+            broker = "utils.events.PostgresBroker" if database_uri.startswith("postgres") else "utils.events.InProcessBroker"
+        self.broker = import_string(broker)(app)
+        if type(self.broker) is InProcessBroker and app.config.get("GUNICORN_WORKERS", 1) > 1:
+            logger.warning(
+                "EVENTS_BROKER is InProcessBroker with %s worker processes; /events clients only see "
+                "changes made by the worker they are connected to",
+                app.config["GUNICORN_WORKERS"],
+            )
+
+    @staticmethod
+    def event(event_type, project_id=None, audience=(), **data):
+        """
+        Build a change event.
+
+        Args:
+            event_type (str): For example "task.updated" or "project.assigned".
+            project_id (int, optional): The project the change belongs to.
+            audience (iterable): IDs of the plain users allowed to see the event.
+            **data: Extra JSON-serializable fields sent to clients.
+        """
+        return {
+            "type": event_type,
+            "project_id": project_id,
+            "audience": sorted({user_id for user_id in audience if user_id is not None}),
+            **data,
+        }
+
+    def publish(self, event_type, project_id=None, audience=(), **data):
+        """Publish a single change event, see ``event()`` for the arguments."""
+        self.publish_many([self.event(event_type, project_id, audience, **data)])
+
+    def publish_many(self, events):
+        """Publish a batch of events built with ``event()``, e.g. one per task of a bulk write."""
+        if not events:
+            return
+        try:
+            self.broker.publish(events)
+        except Exception:
+            logger.exception("Could not publish %s events", len(events))
+
+    def subscribe(self, user_id, role, project_ids=None, claims=None):
+        subscription = Subscription(user_id, role, project_ids, self.app.config.get("EVENTS_QUEUE_SIZE", 100), claims)
+        return self.broker.subscribe(subscription)
+
+    def _authorized(self, subscription):
+        """Return False once the token of ``subscription`` has expired or was revoked."""
+        claims = subscription.claims
+        if claims is None:
+            return True
+        if claims.get("exp") is not None and claims["exp"] <= time.time():
+            return False
+        with self.app.app_context():
+            return not is_token_revoked(None, claims)
+
+    def unsubscribe(self, subscription):
+        self.broker.unsubscribe(subscription)
+
+    def stream(self, subscription):
+        """Yield the Server-Sent Events of one subscription until the client goes away."""
+        keepalive = self.app.config.get("EVENTS_KEEPALIVE", 15)
+        try:
+            yield "retry: 3000\n\n"
+            checked_at = time.monotonic()
+            while not subscription.overflowed:
+                waited = time.monotonic() - checked_at
+                if waited >= keepalive:
+                    if not self._authorized(subscription):
+                        return
+                    checked_at, waited = time.monotonic(), 0
+                try:
+                    event = subscription.queue.get(timeout=keepalive - waited)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                data = {key: value for key, value in event.items() if key not in ("audience", "id")}
+                yield f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(data)}\n\n"
+        finally:
+            self.unsubscribe(subscription)
+
+
+event_bus = EventBus()
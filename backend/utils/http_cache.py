@@ -0,0 +1,180 @@
+import functools
+import hashlib
+import logging
+import threading
+from collections import defaultdict
+from flask import current_app, make_response, request
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import event, insert, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from werkzeug.utils import import_string
+from models import db
+from models.table_version import TableVersion
+from utils.security import current_role
+
+logger = logging.getLogger(__name__)
+
+VERSIONS = TableVersion.__table__
+
+
+class ResponseCache:
+    """
+    ETag based caching for read endpoints.
+
+    Once a transaction that wrote to a table commits, that table's row in
+    ``table_version`` is bumped. The bump is a short transaction of its own
+    per table, so writers never hold a ``table_version`` row lock while they
+    do their own work, and transactions writing several tables cannot
+    deadlock on it. ``cached(*tables)`` builds the ETag of a response from
+    the versions of the tables it reads plus the URL and the caller's
+    identity, so a matching ``If-None-Match`` is answered with 304 after a
+    single primary-key lookup and the view itself never runs.
+
+    When ``HTTP_CACHE_SIZE`` is set, response bodies are also kept in an LRU
+    (``HTTP_CACHE_BACKEND``, by default the in-process ``TTLCache``) so a
+    client without the current ETag is served without running the view either.
+    Entries are dropped as soon as a transaction touching one of their tables
+    commits.
+
+    List every table a view reads in ``cached()``, including derived ones
+    such as ``task_counter``.
+
+    Configuration:
+        HTTP_CACHE_SIZE: Number of response bodies kept per process, 0 to only use ETags.
+        HTTP_CACHE_TTL: Seconds a response body is kept.
+        HTTP_CACHE_BACKEND: Import path of a class taking ``maxsize`` and ``ttl`` with get/set/pop.
+    """
+
+    def __init__(self):
+        self.tables = set()
+        self.payloads = None
+        self._tags_by_table = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        app.extensions["response_cache"] = self
+        size = app.config.get("HTTP_CACHE_SIZE", 0)
+        if size:
+            backend = import_string(app.config.get("HTTP_CACHE_BACKEND", "utils.identity.TTLCache"))
+            self.payloads = backend(maxsize=size, ttl=app.config.get("HTTP_CACHE_TTL", 300))
+
+        for name, listener in (
+            ("after_flush", _after_flush),
+            ("do_orm_execute", _after_bulk_write),
+            ("after_commit", _after_commit),
+            ("after_rollback", _after_rollback),
+        ):
+            if not event.contains(db.session, name, listener):
+                event.listen(db.session, name, listener)
+
+    def cached(self, *tables):
+        """
+        Decorate a JSON read endpoint whose response only depends on ``tables``.
+
+        Apply it below ``jwt_required``/``require_role`` so the identity is known.
+        """
+        self.tables.update(tables)
+
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapper(*args, **kwargs):
+                rows = db.session.query(TableVersion.table_name, TableVersion.version).filter(
+                    TableVersion.table_name.in_(tables)
+                )
+                versions = dict(rows.all())
+                key = (request.full_path, get_jwt_identity(), current_role(), [versions.get(t, 0) for t in tables])
+                tag = hashlib.sha1(repr(key).encode()).hexdigest()
+
+                if request.if_none_match.contains(tag):
+                    response = current_app.response_class(status=304)
+                else:
+                    cached = self.payloads.get(tag) if self.payloads is not None else None
+                    if cached is not None:
+                        body, mimetype = cached
+                        response = current_app.response_class(body, mimetype=mimetype)
+                    else:
+                        response = make_response(view(*args, **kwargs))
+                        if response.status_code == 200 and self.payloads is not None:
+                            self._store(tag, tables, response)
+
+                if response.status_code in (200, 304):
+                    response.set_etag(tag)
+                    response.headers["Cache-Control"] = "private, no-cache"
+                return response
+
+            return wrapper
+
+        return decorator
+
+    def _store(self, tag, tables, response):
+        self.payloads.set(tag, (response.get_data(), response.mimetype))
+        with self._lock:
+            for table in tables:
+                self._tags_by_table[table].add(tag)
+
+    def invalidate(self, tables):
+        """Drop every cached body that was built from one of ``tables``."""
+        if self.payloads is None:
+            return
+        with self._lock:
+            tags = set()
+            for table in tables:
+                tags |= self._tags_by_table.pop(table, set())
+        for tag in tags:
+            self.payloads.pop(tag)
+
+
+response_cache = ResponseCache()
+
+
+def _bump(name):
+    for attempt in (1, 2):
+        try:
+            with db.engine.begin() as connection:
+                result = connection.execute(
+                    update(VERSIONS).where(VERSIONS.c.table_name == name).values(version=VERSIONS.c.version + 1)
+                )
+                if result.rowcount == 0:
+                    connection.execute(insert(VERSIONS).values(table_name=name, version=1))
+            return
+        except IntegrityError:
+            # another process inserted the row first; bump it instead
+            if attempt == 2:
+                raise
+
+
+def bump_versions(tables):
+    """Bump the ``table_version`` rows of ``tables``, each in its own short transaction."""
+    for name in sorted(tables):
+        try:
+            _bump(name)
+        except SQLAlchemyError:
+            logger.exception("Could not bump the version of table %s", name)
+
+
+def _record(session, tables):
+    tables = set(tables) & response_cache.tables
+    if tables:
+        session.info.setdefault("written_tables", set()).update(tables)
+
+
+def _after_flush(session, flush_context):
+    written = [obj for obj in session.new | session.deleted]
+    written += [obj for obj in session.dirty if session.is_modified(obj)]
+    _record(session, {type(obj).__table__.name for obj in written})
+
+
+def _after_bulk_write(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _record(orm_execute_state.session, {orm_execute_state.statement.table.name})
+
+
+def _after_commit(session):
+    tables = session.info.pop("written_tables", set())
+    if tables:
+        bump_versions(tables)
+        response_cache.invalidate(tables)
+
+
+def _after_rollback(session):
+    session.info.pop("written_tables", None)
@@ -0,0 +1,131 @@
+import threading
+import time
+from collections import OrderedDict
+from flask import g
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy.orm import make_transient_to_detached
+from models import db
+from models.session import primary
+from models.user import User
+
+
+class TTLCache:
+    """
+    Small thread-safe LRU cache whose entries expire after a fixed number of seconds.
+
+    Attributes:
+        maxsize (int): Maximum number of entries kept before the least recently used is evicted.
+        ttl (float): Lifetime of an entry in seconds. A ttl of 0 disables the cache.
+    """
+
+    def __init__(self, maxsize=1024, ttl=0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if not self.ttl:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class UserCache(TTLCache):
+    """Per-process cache keyed by user id, sized and timed by the ``CURRENT_USER_CACHE_*`` settings."""
+
+    def init_app(self, app):
+        self.maxsize = app.config.get("CURRENT_USER_CACHE_SIZE", self.maxsize)
+        self.ttl = app.config.get("CURRENT_USER_CACHE_TTL", self.ttl)
+
+
+user_cache = UserCache()
+token_version_cache = UserCache()
+
+
+def _snapshot(user):
+    snapshot = User(**{column.key: getattr(user, column.key) for column in User.__table__.columns})
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+
+def load_current_user():
+    """
+    Return the ``User`` behind the JWT of the current request.
+
+    The row is loaded at most once per request and, when ``CURRENT_USER_CACHE_TTL``
+    is set, served from a short-lived per-process cache without touching the
+    database. Cached snapshots are merged into the session without a SELECT, so
+    the returned instance can be read and updated like a freshly loaded one.
+
+    Returns:
+        User: The authenticated user, or None if the account no longer exists.
+    """
+    if "current_user" in g:
+        return g.current_user
+
+    user_id = get_jwt_identity()
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        user = db.session.merge(cached, load=False)
+    else:
+        user = db.session.get(User, user_id)
+        if user:
+            user_cache.set(user_id, _snapshot(user))
+
+    g.current_user = user
+    return user
+
+
+def invalidate_user(user_id):
+    """Drop a user from the identity caches after their profile, role or credentials change."""
+    user_cache.pop(user_id)
+    token_version_cache.pop(user_id)
+
+
+def revoke_user_tokens(user):
+    """Bump the user's token version so every JWT issued before the next commit is rejected."""
+    user.token_version = (user.token_version or 0) + 1
+
+
+def is_token_revoked(jwt_header, jwt_payload):
+    """
+    JWT blocklist check: a token is revoked when its ``ver`` claim no longer
+    matches the user's current token version, or when the user was deleted.
+
+    Only the ``token_version`` column is read, always from the primary so a
+    lagging replica cannot revive a revoked token, and the result is kept in a
+    short-lived per-process cache so most requests need no query at all.
+    """
+    user_id = jwt_payload.get("sub")
+    version = token_version_cache.get(user_id)
+    if version is None:
+        with primary(db.session):
+            version = db.session.query(User.token_version).filter_by(id=user_id).scalar()
+        if version is None:
+            return True
+        token_version_cache.set(user_id, version)
+    return jwt_payload.get("ver") != version
@@ -0,0 +1,206 @@
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import delete, event, insert, update
+from models import db
+from models.outbox import DeadLetterMail, OutboundMail
+from utils.mail_templates import TEMPLATES, render, subject_of
+from utils.smtp_pool import smtp_pool
+
+logger = logging.getLogger(__name__)
+
+
+class MailQueue:
+    """
+    Database-backed outbox for outgoing email.
+
+    Request handlers call ``enqueue()``, which adds a template name and its
+    arguments to the ``outbound_mail`` table in the caller's transaction, so
+    the message is only sent if the caller commits. The body is rendered
+    right before sending and never stored. A small pool of daemon threads per
+    process drains the table, retrying failed deliveries with exponential
+    backoff and moving messages that keep failing to ``dead_letter_mail``
+    without their arguments.
+
+    Rows are claimed with a conditional UPDATE on ``next_attempt_at``. Before
+    each message is sent its lease is renewed with the same conditional
+    UPDATE, so a message whose lease ran out while earlier ones in the batch
+    were being sent, and that another worker has claimed since, is skipped
+    instead of being sent twice. The batch shares one pooled SMTP connection.
+
+    Configuration:
+        MAIL_QUEUE_ENABLED: When False, messages are sent synchronously.
+        MAIL_QUEUE_WORKERS: Number of worker threads per process.
+        MAIL_QUEUE_BATCH_SIZE: Maximum number of messages claimed per poll.
+        MAIL_QUEUE_POLL_INTERVAL: Seconds between polls when idle.
+        MAIL_QUEUE_LEASE: Seconds a claimed message is hidden from other workers,
+            renewed right before it is sent.
+        MAIL_MAX_ATTEMPTS: Delivery attempts before a message is dead-lettered.
+        MAIL_RETRY_BACKOFF: Base delay in seconds, doubled after each failed attempt.
+    """
+
+    def __init__(self):
+        self.app = None
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def init_app(self, app):
+        self.app = app
+        app.extensions["mail_queue"] = self
+        app.before_request(self.ensure_started)
+        for name, listener in (("after_commit", self._after_commit), ("after_rollback", self._after_rollback)):
+            if not event.contains(db.session, name, listener):
+                event.listen(db.session, name, listener)
+
+    @property
+    def enabled(self):
+        return self.app.config.get("MAIL_QUEUE_ENABLED", True)
+
+    def enqueue(self, template, recipients, sender=None, **context):
+        """
+        Queue the ``utils.mail_templates`` template ``template`` for background delivery.
+
+        The row joins the current transaction and the caller commits it; the
+        workers are woken once it does.
+        """
+        if template not in TEMPLATES:
+            raise KeyError(f"Unknown mail template: {template}")
+        if not self.enabled:
+            error = smtp_pool.send_many([render(template, recipients, sender, context)])[0]
+            if error is not None:
+                raise error
+            return
+
+        db.session.add(OutboundMail(
+            subject=subject_of(template, context),
+            sender=sender,
+            recipients=",".join(recipients),
+            template=template,
+            context=json.dumps(context),
+        ))
+        db.session.info["mail_queued"] = True
+
+    def _after_commit(self, session):
+        if session.info.pop("mail_queued", False):
+            self.ensure_started()
+            self._wake.set()
+
+    def _after_rollback(self, session):
+        session.info.pop("mail_queued", None)
+
+    def ensure_started(self):
+        """Start the worker threads once per process, including after a fork."""
+        if not self.enabled or self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._wake = threading.Event()
+            for i in range(self.app.config.get("MAIL_QUEUE_WORKERS", 2)):
+                threading.Thread(target=self._run, name=f"mail-queue-{i}", daemon=True).start()
+
+    def _run(self):
+        poll_interval = self.app.config.get("MAIL_QUEUE_POLL_INTERVAL", 10)
+        while True:
+            try:
+                with self.app.app_context():
+                    processed = self.drain()
+            except Exception:
+                logger.exception("Mail queue worker failed")
+                processed = 0
+            if not processed:
+                self._wake.wait(poll_interval)
+                self._wake.clear()
+
+    def drain(self):
+        """Deliver the messages that are due. Returns the number of messages processed."""
+        batch = self._claim()
+        for row in batch:
+            self._deliver(row)
+        return len(batch)
+
+    def _lease(self):
+        return timedelta(seconds=self.app.config.get("MAIL_QUEUE_LEASE", 60))
+
+    def _claim(self):
+        now = datetime.utcnow()
+        lease = self._lease()
+        candidates = (
+            db.session.query(OutboundMail.id, OutboundMail.next_attempt_at)
+            .filter(OutboundMail.next_attempt_at <= now)
+            .order_by(OutboundMail.next_attempt_at)
+            .limit(self.app.config.get("MAIL_QUEUE_BATCH_SIZE", 50))
+            .all()
+        )
+
+        claimed = []
+        for mail_id, next_attempt_at in candidates:
+            if self._take(mail_id, next_attempt_at, now + lease):
+                claimed.append(mail_id)
+        db.session.commit()
+
+        if not claimed:
+            return []
+        return (
+            db.session.query(OutboundMail.__table__)
+            .filter(OutboundMail.id.in_(claimed))
+            .order_by(OutboundMail.next_attempt_at)
+            .all()
+        )
+
+    def _take(self, mail_id, held, until):
+        """Move the lease of a message from ``held`` to ``until`` if nobody else took it."""
+        result = db.session.execute(
+            update(OutboundMail)
+            .where(OutboundMail.id == mail_id, OutboundMail.next_attempt_at == held)
+            .values(next_attempt_at=until)
+        )
+        return result.rowcount == 1
+
+    def _deliver(self, row):
+        until = datetime.utcnow() + self._lease()
+        owned = self._take(row.id, row.next_attempt_at, until)
+        db.session.commit()
+        if not owned:
+            return
+
+        message = render(row.template, row.recipients.split(","), row.sender, json.loads(row.context))
+        error = smtp_pool.send_many([message])[0]
+        mine = (OutboundMail.id == row.id, OutboundMail.next_attempt_at == until)
+        if error is None:
+            db.session.execute(delete(OutboundMail).where(*mine))
+        else:
+            self._failed(row, mine, error)
+        db.session.commit()
+
+    def _failed(self, row, mine, error):
+        attempts = row.attempts + 1
+        logger.warning("Mail %s to %s failed (attempt %s): %s", row.id, row.recipients, attempts, error)
+
+        if attempts >= self.app.config.get("MAIL_MAX_ATTEMPTS", 5):
+            if db.session.execute(delete(OutboundMail).where(*mine)).rowcount:
+                db.session.execute(insert(DeadLetterMail).values(
+                    subject=row.subject,
+                    sender=row.sender,
+                    recipients=row.recipients,
+                    template=row.template,
+                    attempts=attempts,
+                    last_error=str(error),
+                    created_at=row.created_at,
+                    failed_at=datetime.utcnow(),
+                ))
+            return
+
+        backoff = self.app.config.get("MAIL_RETRY_BACKOFF", 30) * 2 ** (attempts - 1)
+        db.session.execute(update(OutboundMail).where(*mine).values(
+            attempts=attempts,
+            last_error=str(error),
+            next_attempt_at=datetime.utcnow() + timedelta(seconds=backoff),
+        ))
+
+
+mail_queue = MailQueue()
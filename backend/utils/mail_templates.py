@@ -0,0 +1,48 @@
+import os
+from flask_mail import Message
+
+front_end_url = os.getenv("FRONTEND_URL")
+
+# template name -> (subject, body), formatted with the arguments stored next to
+# the queued message so the outbox never holds a rendered body
+TEMPLATES = {
+    "otp": ("Your OTP Code", "Your OTP Code is {otp}"),
+    "password_reset": (
+        "Password Reset Link",
+        "Click the link to reset your password: {front_end_url}/reset-password/{token}",
+    ),
+    "welcome": ("Welcome to our platform", "Welcome to our platform. We are glad to have you here."),
+    "subscribed": (
+        "Thank You for Subscribing!",
+        "Hello,\n\nThank you for subscribing to our newsletter! Stay tuned for updates.\n\nBest Regards,\nThe Team",
+    ),
+    "teammate_created": (
+        "Welcome to the Team!",
+        "Hello {username},\n\n"
+        "Your account has been created.\n\n"
+        "Username: {username}\n"
+        "Password: {password}\n\n"
+        "Please log in and change your password as soon as possible.",
+    ),
+    "teammate_password": (
+        "Reset Password requested",
+        "Hello {username},\n\n"
+        "Your rested password has been changed as below.\n\n"
+        "Username: {username}\n"
+        "Password: {password}\n\n"
+        "Please log in and change your password as soon as possible.\n\n"
+        "Regards.\n"
+        "The Team.\n",
+    ),
+}
+
+
+def subject_of(template, context):
+    return TEMPLATES[template][0].format(**context)
+
+
+def render(template, recipients, sender, context):
+    """Build the ``flask_mail.Message`` for a template and its arguments."""
+    subject, body = TEMPLATES[template]
+    context = {"front_end_url": front_end_url, **context}
+    return Message(subject.format(**context), sender=sender, recipients=list(recipients), body=body.format(**context))
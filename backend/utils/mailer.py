@@ -1,10 +1,8 @@
 import os
 from flask import jsonify
-from flask_mail import Message
-from app import mail
+from utils.mail_queue import mail_queue
 
 my_email = os.getenv("MAIL_USERNAME")
-front_end_url = os.getenv("FRONTEND_URL")
 
 
 def send_otp_email(email, otp):
@@ -18,9 +16,7 @@ def send_otp_email(email, otp):
     Returns:
         None
     """
-    msg = Message("Your OTP Code", sender=my_email, recipients=[email])
-    msg.body = f"Your OTP Code is {otp}"
-    mail.send(msg)
+    mail_queue.enqueue("otp", [email], sender=my_email, otp=otp)
 
 
 def send_reset_email(email, token):
@@ -34,9 +30,7 @@ def send_reset_email(email, token):
     Returns:
         None
     """
-    msg = Message("Password Reset Link", sender=my_email, recipients=[email])
-    msg.body = f"Click the link to reset your password: {front_end_url}/reset-password/{token}"
-    mail.send(msg)
+    mail_queue.enqueue("password_reset", [email], sender=my_email, token=token)
 
 
 def new_registration_email(email):
@@ -49,9 +43,7 @@ def new_registration_email(email):
     Returns:
         None
     """
-    msg = Message("Welcome to our platform", sender=my_email, recipients=[email])
-    msg.body = "Welcome to our platform. We are glad to have you here."
-    mail.send(msg)
+    mail_queue.enqueue("welcome", [email], sender=my_email)
 
 
 def new_subscriber_mail(email):
@@ -64,48 +56,22 @@ def new_subscriber_mail(email):
     Returns:
         None
     """
-    msg = Message("Thank You for Subscribing!", sender=my_email, recipients=[email])
-    msg.body = "Hello,\n\nThank you for subscribing to our newsletter! Stay tuned for updates.\n\nBest Regards,\nThe Team"
-    mail.send(msg)
+    mail_queue.enqueue("subscribed", [email], sender=my_email)
 
 
 def create_teammate(email, username, generated_password):
     """Sends an email to the newly created team member with login details."""
     try:
-        msg = Message(
-            "Welcome to the Team!",
-            sender=my_email,
-            recipients=[email]
-        )
-        msg.body = (
-            f"Hello {username},\n\n"
-            f"Your account has been created.\n\n"
-            f"Username: {username}\n"
-            f"Password: {generated_password}\n\n"
-            "Please log in and change your password as soon as possible."
-        )
-        mail.send(msg)
+        mail_queue.enqueue("teammate_created", [email], sender=my_email,
+                           username=username, password=generated_password)
         return True
     except Exception as e:
         return jsonify({"error": "Failed to send email", "details": str(e)}), 500
 
 def change_teammate_password(email, username, generated_password):
     try:
-        msg = Message(
-            "Reset Password requested",
-            sender=my_email,
-            recipients=[email]
-        )
-        msg.body = (
-            f"Hello {username},\n\n"
-            f"Your rested password has been changed as below.\n\n"
-            f"Username: {username}\n"
-            f"Password: {generated_password}\n\n"
-            "Please log in and change your password as soon as possible.\n\n"
-            "Regards.\n"
-            "The Team.\n"
-        )
-        mail.send(msg)
+        mail_queue.enqueue("teammate_password", [email], sender=my_email,
+                           username=username, password=generated_password)
         return True
     except Exception as e:
         return jsonify({"error": "Failed to send email", "details": str(e)}), 500
\ No newline at end of file
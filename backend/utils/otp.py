@@ -0,0 +1,112 @@
+import hashlib
+import hmac
+import secrets
+import threading
+from datetime import datetime, timedelta
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import delete, update
+from models import db
+from models.otp import OneTimePassword
+
+
+def generate_otp():
+    return "".join(secrets.choice("0123456789") for _ in range(6))
+
+
+@click.command("purge-otps")
+@with_appcontext
+def purge_otps_command():
+    """Delete expired one-time passwords."""
+    click.echo(f"Deleted {otp_store.purge_expired()} expired one-time passwords.")
+
+
+class OTPStore:
+    """
+    Pending one-time passwords, kept in the ``one_time_password`` table.
+
+    ``issue()`` replaces the user's code with a new one, valid for ``OTP_TTL``
+    seconds, and commits without touching the user row. ``verify()`` counts
+    the attempt with one conditional UPDATE before it compares HMACs in
+    constant time, so concurrent guesses cannot get past ``OTP_MAX_ATTEMPTS``.
+    A matching code is deleted and cannot be used twice.
+
+    Expired codes are deleted in one statement every ``OTP_CLEANUP_EVERY``
+    issued codes per process, and by ``flask purge-otps``.
+
+    Configuration:
+        OTP_TTL: Seconds a code stays valid.
+        OTP_MAX_ATTEMPTS: Verification attempts allowed per code.
+        OTP_CLEANUP_EVERY: Issued codes between two purges of expired ones.
+    """
+
+    def __init__(self):
+        self.app = None
+        self._issued = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.app = app
+        app.extensions["otp_store"] = self
+        app.cli.add_command(purge_otps_command)
+
+    def _digest(self, user_id, code):
+        key = (self.app.config.get("SECRET_KEY") or self.app.config["JWT_SECRET_KEY"]).encode("utf-8")
+        return hmac.new(key, f"{user_id}:{code}".encode("utf-8"), hashlib.sha256).hexdigest()
+
+    def issue(self, user_id):
+        """Store a new code for ``user_id``, replacing any pending one, and return it."""
+        code = generate_otp()
+        db.session.merge(OneTimePassword(
+            user_id=user_id,
+            code_hash=self._digest(user_id, code),
+            attempts=0,
+            expires_at=datetime.utcnow() + timedelta(seconds=self.app.config.get("OTP_TTL", 600)),
+        ))
+        db.session.commit()
+
+        with self._lock:
+            self._issued += 1
+            purge = self._issued % self.app.config.get("OTP_CLEANUP_EVERY", 100) == 0
+        if purge:
+            self.purge_expired()
+        return code
+
+    def verify(self, user_id, code):
+        """Return True when ``code`` is the pending code of ``user_id``, consuming it."""
+        if not isinstance(code, str):
+            return False
+        now = datetime.utcnow()
+        counted = db.session.execute(
+            update(OneTimePassword)
+            .where(
+                OneTimePassword.user_id == user_id,
+                OneTimePassword.expires_at > now,
+                OneTimePassword.attempts < self.app.config.get("OTP_MAX_ATTEMPTS", 5),
+            )
+            .values(attempts=OneTimePassword.attempts + 1)
+        ).rowcount
+        if not counted:
+            db.session.commit()
+            return False
+
+        stored = db.session.query(OneTimePassword.code_hash).filter(OneTimePassword.user_id == user_id).scalar()
+        matched = stored is not None and hmac.compare_digest(stored, self._digest(user_id, code))
+        if matched:
+            matched = db.session.execute(
+                delete(OneTimePassword)
+                .where(OneTimePassword.user_id == user_id, OneTimePassword.code_hash == stored)
+            ).rowcount == 1
+        db.session.commit()
+        return matched
+
+    def purge_expired(self):
+        """Delete every expired code and return how many were deleted."""
+        deleted = db.session.execute(
+            delete(OneTimePassword).where(OneTimePassword.expires_at <= datetime.utcnow())
+        ).rowcount
+        db.session.commit()
+        return deleted
+
+
+otp_store = OTPStore()
@@ -0,0 +1,129 @@
+import base64
+import json
+from datetime import date, datetime
+from flask import abort, jsonify, make_response, request
+from sqlalchemy import Date, DateTime, Row, and_, false, or_, tuple_
+
+
+def _encode_cursor(values):
+    payload = [v.isoformat() if isinstance(v, date) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def _key_value(row, column):
+    if isinstance(row, Row) and column.key not in row._fields:
+        return getattr(row[0], column.key)
+    return getattr(row, column.key)
+
+
+def _decode_cursor(cursor, key_columns):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(key_columns):
+            raise ValueError("cursor does not match the sort key")
+        return [
+            datetime.fromisoformat(v) if v is not None and isinstance(column.type, DateTime)
+            else date.fromisoformat(v) if v is not None and isinstance(column.type, Date)
+            else v
+            for column, v in zip(key_columns, values)
+        ]
+    except (ValueError, TypeError):
+        abort(make_response(jsonify({"error": "Invalid cursor"}), 400))
+
+
+def _nullable(column):
+    return getattr(column, "nullable", False)
+
+
+def _order_by(key_columns, descending):
+    """ORDER BY for the key, with NULLs sorting as the largest value like PostgreSQL's default."""
+    if not descending:
+        return [column.nulls_last() if _nullable(column) else column for column in key_columns]
+    return [column.desc().nulls_first() if _nullable(column) else column.desc() for column in key_columns]
+
+
+def _seek(key_columns, values, descending):
+    """Criteria selecting the rows that come after ``values`` in ``_order_by`` order."""
+    if not descending and not any(_nullable(column) for column in key_columns):
+        return tuple_(*key_columns) > tuple_(*values)
+
+    column, value = key_columns[0], values[0]
+    if value is None:
+        after = column.isnot(None) if descending else false()
+        same = column.is_(None)
+    else:
+        after = column < value if descending else column > value
+        if _nullable(column) and not descending:
+            after = or_(after, column.is_(None))
+        same = column == value
+    if len(key_columns) == 1:
+        return after
+    return or_(after, and_(same, _seek(key_columns[1:], values[1:], descending)))
+
+
+class KeysetPagination:
+    """
+    Seek-based page of a query, used when the client passes ``?cursor=``.
+
+    Rows are ordered by ``key_columns`` (e.g. ``(Task.id,)`` or
+    ``(Task.created_at, Task.id)``, or a labeled column added to the query such
+    as a search score) and the next page starts strictly after the last key of
+    this one, so every page costs the same as the first. The total row count
+    is only computed when the client asks for it with ``?include_total=true``.
+    With ``descending`` the key is walked from the largest value down; NULLs in
+    nullable key columns sort as larger than any value either way.
+
+    Attributes:
+        items (list): The rows of the current page.
+        next_cursor (str, optional): Opaque cursor for the next page, None on the last page.
+        total (int, optional): Total number of rows of the whole listing, not just the
+            ones after the cursor, only set when requested.
+    """
+
+    def __init__(self, query, key_columns, per_page, descending=False):
+        self.total = None
+        if request.args.get("include_total", "false").lower() in ("1", "true", "yes"):
+            self.total = query.order_by(None).count()
+
+        cursor = request.args.get("cursor")
+        if cursor:
+            after = _decode_cursor(cursor, key_columns)
+            query = query.filter(_seek(key_columns, after, descending))
+
+        rows = query.order_by(*_order_by(key_columns, descending)).limit(per_page + 1).all()
+        self.items = rows[:per_page]
+        self.next_cursor = None
+        if len(rows) > per_page:
+            last = self.items[-1]
+            self.next_cursor = _encode_cursor([_key_value(last, column) for column in key_columns])
+
+    def __iter__(self):
+        return iter(self.items)
+
+
+def paginate(query, key_columns, page, per_page, descending=False):
+    """Paginate with keyset seeking when ``?cursor=`` is present, otherwise with the usual OFFSET paginate()."""
+    if "cursor" in request.args:
+        return KeysetPagination(query, key_columns, per_page, descending)
+    query = query.order_by(*_order_by(key_columns, descending))
+    return query.paginate(page=page, per_page=per_page, error_out=False)
+
+
+def pagination_meta(pagination, links=True):
+    """Build the paging keys of a list response for either pagination mode."""
+    if isinstance(pagination, KeysetPagination):
+        meta = {"next_cursor": pagination.next_cursor}
+        if pagination.total is not None:
+            meta["total"] = pagination.total
+        return meta
+
+    meta = {
+        "total": pagination.total,
+        "pages": pagination.pages,
+        "current_page": pagination.page,
+    }
+    if links:
+        meta["prev_page"] = pagination.prev_num if pagination.has_prev else None
+        meta["next_page"] = pagination.next_num if pagination.has_next else None
+    return meta
@@ -0,0 +1,107 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import bcrypt
+from flask import abort, jsonify, make_response
+
+
+def _executor(workers):
+    """A pool of real OS threads, also under gevent, whose own threads are greenlets."""
+    try:
+        from gevent import monkey
+        if monkey.is_module_patched("threading"):
+            from gevent.threadpool import ThreadPoolExecutor as GeventThreadPoolExecutor
+            return GeventThreadPoolExecutor(max_workers=workers)
+    except ImportError:
+        pass
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a small, bounded pool of threads instead of the request thread.
+
+    bcrypt releases the GIL while it hashes, so the pool uses the CPU cores
+    without blocking the threads or greenlets serving other requests. At most
+    ``BCRYPT_WORKERS`` hashes run at once per process and ``BCRYPT_QUEUE_SIZE``
+    more may wait. A request whose hash is not done within
+    ``BCRYPT_QUEUE_TIMEOUT`` seconds, waiting for a slot included, is
+    answered with 503 and ``Retry-After`` instead of piling up behind a login
+    burst. Its slot is only freed once the abandoned hash has finished.
+
+    New hashes use ``BCRYPT_LOG_ROUNDS``. ``needs_rehash()`` tells whether a
+    stored hash was made with another cost, so it can be replaced after the
+    next successful login.
+
+    Configuration:
+        BCRYPT_LOG_ROUNDS: bcrypt work factor of new hashes.
+        BCRYPT_WORKERS: Hashes computed in parallel per worker process.
+        BCRYPT_QUEUE_SIZE: Hashes allowed to wait for a free thread.
+        BCRYPT_QUEUE_TIMEOUT: Seconds a request waits for its hash before the 503.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.rounds = 12
+        self.timeout = 2.0
+        self._executor = None
+        self._slots = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.app = app
+        app.extensions["password_hasher"] = self
+        self.rounds = app.config.get("BCRYPT_LOG_ROUNDS", 12)
+        self.timeout = app.config.get("BCRYPT_QUEUE_TIMEOUT", 2.0)
+
+    def _pool(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                workers = self.app.config.get("BCRYPT_WORKERS", 1)
+                self._executor = _executor(workers)
+                self._slots = threading.BoundedSemaphore(workers + self.app.config.get("BCRYPT_QUEUE_SIZE", 16))
+                self._pid = os.getpid()
+            return self._executor, self._slots
+
+    def _busy(self):
+        response = make_response(jsonify({"error": "Server is busy, please try again shortly"}), 503)
+        response.headers["Retry-After"] = str(max(1, round(self.timeout)))
+        abort(response)
+
+    def _run(self, fn, *args):
+        executor, slots = self._pool()
+        deadline = time.monotonic() + self.timeout
+        if not slots.acquire(timeout=self.timeout):
+            self._busy()
+        try:
+            future = executor.submit(fn, *args)
+        except BaseException:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: slots.release())
+        try:
+            return future.result(timeout=max(0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            future.cancel()
+            self._busy()
+
+    def hash(self, password):
+        salt = bcrypt.gensalt(self.rounds)
+        return self._run(bcrypt.hashpw, password.encode("utf-8"), salt).decode("utf-8")
+
+    def verify(self, hashed_password, password):
+        try:
+            return self._run(bcrypt.checkpw, password.encode("utf-8"), hashed_password.encode("utf-8"))
+        except ValueError:
+            return False
+
+    def needs_rehash(self, hashed_password):
+        try:
+            return int(hashed_password.split("$")[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,197 @@
+import functools
+import math
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app, jsonify, make_response, request
+from werkzeug.utils import import_string
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+RATE_PATTERN = re.compile(r"^\s*(\w+)\s*=\s*(\d+)\s*/\s*(second|minute|hour|day)\s*$")
+
+
+def parse_limits(spec):
+    """
+    Parse a limit such as ``"ip=20/minute, email=5/minute"``.
+
+    Each part gives a token bucket per client IP (``ip``) or per value of a
+    JSON body field (any other name, e.g. ``email``) that holds ``N`` tokens
+    and refills at ``N`` per period.
+
+    Returns:
+        list: ``(key, capacity, tokens per second)`` tuples.
+    """
+    limits = []
+    for part in filter(None, (part.strip() for part in spec.split(","))):
+        match = RATE_PATTERN.match(part)
+        if not match:
+            raise ValueError(f"Invalid rate limit {part!r}, expected e.g. 'ip=20/minute'")
+        key, count, period = match.groups()
+        limits.append((key, int(count), int(count) / PERIODS[period]))
+    return limits
+
+
+def _refill(tokens, updated, now, capacity, rate):
+    if tokens is None:
+        return float(capacity)
+    return min(float(capacity), tokens + (now - updated) * rate)
+
+
+class MemoryBackend:
+    """Token buckets kept in this process; each gunicorn worker counts on its own."""
+
+    def __init__(self, app):
+        self.max_keys = app.config.get("RATE_LIMIT_MAX_KEYS", 100000)
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, rate):
+        """Take one token from ``key``'s bucket; return 0 when allowed, else the seconds until a token is free."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (None, now))
+            tokens = _refill(tokens, updated, now, capacity, rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return 0 if allowed else (1 - tokens) / rate
+
+
+class SQLiteBackend:
+    """
+    Token buckets in a local SQLite file shared by every worker process on the host.
+
+    The file is separate from the application database, so throttling never
+    touches it. Buckets idle long enough to be full again are deleted in bulk
+    every ``RATE_LIMIT_CLEANUP_EVERY`` calls.
+    """
+
+    def __init__(self, app):
+        self.path = app.config.get("RATE_LIMIT_STORAGE", "rate_limit.db")
+        self.cleanup_every = app.config.get("RATE_LIMIT_CLEANUP_EVERY", 1000)
+        self._local = threading.local()
+        self._calls = 0
+        self._lock = threading.Lock()
+        with self._connection() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit_bucket "
+                "(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL, idle_after REAL NOT NULL)"
+            )
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            self._local.connection = connection
+        return connection
+
+    def take(self, key, capacity, rate):
+        now = time.time()
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute("SELECT tokens, updated FROM rate_limit_bucket WHERE key = ?", (key,)).fetchone()
+            tokens = _refill(row[0] if row else None, row[1] if row else now, now, capacity, rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            connection.execute(
+                "INSERT INTO rate_limit_bucket (key, tokens, updated, idle_after) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated, "
+                "idle_after = excluded.idle_after",
+                (key, tokens, now, now + (capacity - tokens) / rate),
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+        with self._lock:
+            self._calls += 1
+            cleanup = self._calls % self.cleanup_every == 0
+        if cleanup:
+            connection.execute("DELETE FROM rate_limit_bucket WHERE idle_after < ?", (now,))
+        return 0 if allowed else (1 - tokens) / rate
+
+
+class RateLimiter:
+    """
+    Token-bucket throttling for endpoints that cost bcrypt work or an email.
+
+    ``limit(name)`` decorates a view with the buckets configured for ``name``
+    in ``RATE_LIMITS``. The check runs before the view, so a rejected request
+    is a 429 with ``Retry-After`` that never reaches the database or the
+    password hasher.
+
+    Configuration:
+        RATE_LIMIT_ENABLED: Set to False to turn throttling off.
+        RATE_LIMITS: Limits per name, see ``parse_limits()``.
+        RATE_LIMIT_BACKEND: Import path of the bucket store, ``utils.rate_limit.MemoryBackend``
+            (per process) by default or ``utils.rate_limit.SQLiteBackend`` (per host).
+        RATE_LIMIT_STORAGE: File of the SQLite backend.
+        RATE_LIMIT_PROXY_COUNT: Reverse proxies in front of the app whose ``X-Forwarded-For`` is trusted.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.backend = None
+        self.limits = {}
+
+    def init_app(self, app):
+        self.app = app
+        app.extensions["rate_limiter"] = self
+        self.limits = {name: parse_limits(spec) for name, spec in app.config.get("RATE_LIMITS", {}).items()}
+        backend = import_string(app.config.get("RATE_LIMIT_BACKEND", "utils.rate_limit.MemoryBackend"))
+        self.backend = backend(app)
+
+    def client_ip(self):
+        proxies = current_app.config.get("RATE_LIMIT_PROXY_COUNT", 0)
+        route = request.access_route
+        if proxies and len(route) >= proxies:
+            return route[-proxies]
+        return request.remote_addr
+
+    def check(self, name):
+        """Take a token from every bucket of ``name``; return the seconds to wait, 0 when allowed."""
+        body = None
+        wait = 0
+        for key, capacity, rate in self.limits.get(name, ()):
+            if key == "ip":
+                value = self.client_ip()
+            else:
+                if body is None:
+                    body = request.get_json(silent=True)
+                    body = body if isinstance(body, dict) else {}
+                value = body.get(key)
+                if not isinstance(value, str) or not value:
+                    continue
+                value = value.strip().lower()
+            wait = max(wait, self.backend.take(f"{name}:{key}:{value}", capacity, rate))
+        return wait
+
+    def limit(self, name):
+        """Decorate a view with the limits configured for ``name``."""
+
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapper(*args, **kwargs):
+                if current_app.config.get("RATE_LIMIT_ENABLED", True):
+                    wait = self.check(name)
+                    if wait:
+                        response = make_response(jsonify({"error": "Too many requests, please try again later"}), 429)
+                        response.headers["Retry-After"] = str(math.ceil(wait))
+                        return response
+                return view(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+
+rate_limiter = RateLimiter()
@@ -0,0 +1,129 @@
+import threading
+import uuid
+from datetime import datetime, timedelta
+import click
+from flask.cli import with_appcontext
+from flask_jwt_extended import create_refresh_token
+from sqlalchemy import delete, or_, update
+from models import db
+from models.refresh_token import RefreshToken
+
+
+@click.command("purge-refresh-tokens")
+@with_appcontext
+def purge_refresh_tokens_command():
+    """Delete expired refresh tokens."""
+    deleted = refresh_tokens.purge_expired()
+    db.session.commit()
+    click.echo(f"Deleted {deleted} expired refresh tokens.")
+
+
+class RefreshTokenStore:
+    """
+    Rotating refresh tokens backed by the ``refresh_token`` table.
+
+    ``issue()`` signs a refresh token and records its ``jti``. ``rotate()``
+    marks that row as replaced by the ``jti`` of a new token, so each refresh
+    token is exchanged once. Two tabs often refresh with the same token at
+    the same moment, so for ``REFRESH_TOKEN_GRACE`` seconds after a rotation
+    the old token gets the same successor re-signed instead of a new one.
+    Presenting a token after that, or one whose row is gone, means it was
+    stolen and replayed, or the session was logged out, and every refresh
+    token of the user is revoked.
+
+    Only ``/auth/refresh`` and logout read the table. Access tokens are
+    checked from their signature, expiry and the cached token version alone.
+
+    Expired rows, and replaced ones past the grace window, are deleted in
+    one statement every ``REFRESH_TOKEN_CLEANUP_EVERY`` issued tokens per
+    process, and by ``flask purge-refresh-tokens``. The purge joins the
+    transaction of the token being issued, so it never commits half of a
+    rotation on its own.
+
+    Configuration:
+        JWT_REFRESH_TOKEN_EXPIRES: Lifetime of a refresh token.
+        REFRESH_TOKEN_GRACE: Seconds a replaced token may still fetch its successor.
+        REFRESH_TOKEN_CLEANUP_EVERY: Issued tokens between two purges of expired ones.
+    """
+
+    def __init__(self):
+        self.app = None
+        self._issued = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.app = app
+        app.extensions["refresh_tokens"] = self
+        app.cli.add_command(purge_refresh_tokens_command)
+
+    def _grace(self):
+        return timedelta(seconds=self.app.config.get("REFRESH_TOKEN_GRACE", 30))
+
+    def _sign(self, user, jti, expires_delta):
+        return create_refresh_token(
+            identity=user.id,
+            expires_delta=expires_delta,
+            additional_claims={"jti": jti, "role": user.role, "ver": user.token_version or 0},
+        )
+
+    def issue(self, user, jti=None):
+        """Return a new refresh token for ``user``; the caller commits the session."""
+        with self._lock:
+            self._issued += 1
+            purge = self._issued % self.app.config.get("REFRESH_TOKEN_CLEANUP_EVERY", 100) == 0
+        if purge:
+            self.purge_expired()
+
+        jti = jti or str(uuid.uuid4())
+        expires_delta = self.app.config["JWT_REFRESH_TOKEN_EXPIRES"]
+        db.session.add(RefreshToken(jti=jti, user_id=user.id, expires_at=datetime.utcnow() + expires_delta))
+        return self._sign(user, jti, expires_delta)
+
+    def rotate(self, jwt_payload, user):
+        """
+        Exchange the refresh token of ``jwt_payload`` for a new one; the caller commits the session.
+
+        Returns:
+            str: The new refresh token, or the already issued successor when the
+            token was rotated less than ``REFRESH_TOKEN_GRACE`` seconds ago.
+            None when the token was replayed later or revoked; every refresh
+            token of the user is then revoked and committed.
+        """
+        now = datetime.utcnow()
+        successor = str(uuid.uuid4())
+        claimed = db.session.execute(
+            update(RefreshToken)
+            .where(RefreshToken.jti == jwt_payload["jti"], RefreshToken.replaced_by.is_(None))
+            .values(replaced_by=successor, rotated_at=now)
+        ).rowcount
+        if claimed:
+            return self.issue(user, jti=successor)
+
+        replaced = db.session.get(RefreshToken, jwt_payload["jti"])
+        if replaced is not None and replaced.rotated_at > now - self._grace():
+            current = db.session.get(RefreshToken, replaced.replaced_by)
+            if current is not None and current.expires_at > now:
+                return self._sign(user, current.jti, current.expires_at - now)
+
+        self.revoke_user(jwt_payload["sub"])
+        db.session.commit()
+        return None
+
+    def revoke(self, jti):
+        db.session.execute(delete(RefreshToken).where(RefreshToken.jti == jti))
+
+    def revoke_user(self, user_id):
+        db.session.execute(delete(RefreshToken).where(RefreshToken.user_id == user_id))
+
+    def purge_expired(self):
+        """Delete every expired or replaced refresh token and return how many were deleted; the caller commits."""
+        now = datetime.utcnow()
+        return db.session.execute(
+            delete(RefreshToken).where(or_(
+                RefreshToken.expires_at <= now,
+                RefreshToken.rotated_at <= now - self._grace(),
+            ))
+        ).rowcount
+
+
+refresh_tokens = RefreshTokenStore()
@@ -0,0 +1,121 @@
+import logging
+import threading
+import time
+from flask import has_request_context, request
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import event, text
+from sqlalchemy.sql.dml import UpdateBase
+from models import db
+from utils.identity import TTLCache
+
+logger = logging.getLogger(__name__)
+
+PG_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+class ReplicaRouter:
+    """
+    Sends the queries of read-only requests to a read replica.
+
+    When ``SQLALCHEMY_BINDS`` has a ``replica`` entry, queries made while
+    serving a GET or HEAD request run on the replica. Everything else stays on
+    the primary: other methods, work outside a request (CLI, mail queue),
+    ``SELECT ... FOR UPDATE``, queries inside a ``primary()`` block, and any
+    query after the request's session has written, so a request always reads
+    its own writes. A user who committed a write also reads from the primary
+    for ``REPLICA_STICKY_SECONDS`` afterwards, which covers the GET a client
+    usually sends right after a change. That memory is per worker process, so
+    with several workers the lag limit below bounds what such a GET can miss.
+
+    Every ``REPLICA_LAG_CHECK_INTERVAL`` seconds the replica's lag is measured
+    (on PostgreSQL, from its replay position), and while it is above
+    ``REPLICA_MAX_LAG`` or the replica cannot be reached all reads go to the
+    primary. Other databases, such as a SQLite copy used as a local stand-in,
+    are assumed to be in sync.
+
+    Configuration:
+        REPLICA_MAX_LAG: Seconds of lag after which the replica is skipped.
+        REPLICA_LAG_CHECK_INTERVAL: Seconds between two lag measurements.
+        REPLICA_STICKY_SECONDS: Seconds a user's reads stay on the primary after they wrote, 0 to disable.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.recent_writers = TTLCache()
+        self._lag = 0.0
+        self._lag_checked_at = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.app = app
+        if "replica" not in (app.config.get("SQLALCHEMY_BINDS") or {}):
+            return
+        app.extensions["replica_router"] = self
+        self.recent_writers = TTLCache(maxsize=10000, ttl=app.config.get("REPLICA_STICKY_SECONDS", 5))
+        for name, listener in (("after_flush", _after_flush), ("after_commit", _after_commit)):
+            if not event.contains(db.session, name, listener):
+                event.listen(db.session, name, listener)
+
+    @property
+    def engine(self):
+        return db.engines["replica"]
+
+    def use_replica(self, session, clause=None):
+        """Decide whether the next query of ``session`` may run on the replica."""
+        if session.new or session.dirty or session.deleted or isinstance(clause, UpdateBase):
+            # pending changes are flushed to the primary before this query runs
+            session.info["wrote"] = True
+        if session.info.get("wrote") or session.info.get("primary"):
+            return False
+        if getattr(clause, "_for_update_arg", None) is not None:
+            return False
+        if not has_request_context() or request.method not in ("GET", "HEAD"):
+            return False
+        if self.recent_writers.get(_identity()):
+            return False
+        return self.lag() <= self.app.config.get("REPLICA_MAX_LAG", 5)
+
+    def lag(self):
+        """Return the replica lag in seconds as last measured, measuring again when it is due."""
+        interval = self.app.config.get("REPLICA_LAG_CHECK_INTERVAL", 1)
+        with self._lock:
+            now = time.monotonic()
+            if self._lag_checked_at is not None and now - self._lag_checked_at < interval:
+                return self._lag
+            self._lag_checked_at = now
+
+        try:
+            if self.engine.dialect.name == "postgresql":
+                with self.engine.connect() as connection:
+                    lag = float(connection.execute(PG_LAG_QUERY).scalar() or 0)
+            else:
+                lag = 0.0
+        except Exception:
+            logger.exception("Could not measure the replica lag, reading from the primary")
+            lag = float("inf")
+        self._lag = lag
+        return lag
+
+
+replica_router = ReplicaRouter()
+
+
+def _identity():
+    try:
+        return get_jwt_identity()
+    except RuntimeError:
+        return None
+
+
+def _after_flush(session, flush_context):
+    session.info["wrote"] = True
+
+
+def _after_commit(session):
+    if session.info.get("wrote") and has_request_context():
+        user_id = _identity()
+        if user_id is not None:
+            replica_router.recent_writers.set(user_id, True)
@@ -0,0 +1,49 @@
+import re
+from sqlalchemy import column, false, func, literal_column, table
+from models import db
+
+SEARCH_CONFIG = "english"
+# bm25 weights of the title and body columns, the same 1 : 0.4 ratio that
+# ts_rank gives to the A and B weighted parts of ``search_vector``
+FTS5_WEIGHTS = (2.5, 1.0)
+
+
+def _fts5_query(term):
+    """Turn free text into an FTS5 query matching every word, so user input cannot be a syntax error."""
+    return " ".join(f'"{word}"' for word in re.findall(r"\w+", term))
+
+
+def full_text_search(query, model, term):
+    """
+    Restrict ``query`` to the rows of ``model`` that match ``term`` and rank them.
+
+    On PostgreSQL the table's generated ``search_vector`` column, backed by a
+    GIN index, is matched with ``websearch_to_tsquery`` and ranked with
+    ``ts_rank``. On SQLite the ``<table>_fts`` FTS5 index kept in sync by
+    triggers is matched and ranked with ``bm25``. Both are created by the
+    full-text search migration and are not part of the models.
+
+    Args:
+        query (Query): A query selecting ``model``.
+        model: ``Task`` or ``Project``.
+        term (str): The text the user searched for.
+
+    Returns:
+        tuple: The filtered query with an added ``score`` column, and that
+        column; a lower score is a better match.
+    """
+    name = model.__table__.name
+    if db.engine.dialect.name == "postgresql":
+        tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, term)
+        vector = column("search_vector", _selectable=model.__table__)
+        score = (-func.ts_rank(vector, tsquery)).label("score")
+        return query.add_columns(score).filter(vector.op("@@")(tsquery)), score
+
+    fts_name = f"{name}_fts"
+    fts = table(fts_name, column("rowid"))
+    score = func.bm25(literal_column(fts_name), *FTS5_WEIGHTS).label("score")
+    match = _fts5_query(term)
+    query = query.add_columns(score).join(fts, fts.c.rowid == model.id)
+    if not match:
+        return query.filter(false()), score
+    return query.filter(literal_column(fts_name).op("MATCH")(match)), score
@@ -1,25 +1,78 @@
-from flask_bcrypt import Bcrypt
-from flask_jwt_extended import create_access_token, decode_token
-
-bcrypt = Bcrypt()
+from functools import wraps
+from flask import current_app, jsonify
+from flask_jwt_extended import create_access_token, get_jwt, verify_jwt_in_request
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+from utils.password_hasher import password_hasher
 
 
 def hash_password(password):
-    return bcrypt.generate_password_hash(password).decode("utf-8")
+    return password_hasher.hash(password)
 
 
 def verify_password(hashed_password, password):
-    return bcrypt.check_password_hash(hashed_password, password)
+    return password_hasher.verify(hashed_password, password)
+
+
+def password_needs_rehash(hashed_password):
+    """Return True when ``hashed_password`` was made with another cost than ``BCRYPT_LOG_ROUNDS``."""
+    return password_hasher.needs_rehash(hashed_password)
+
+
+def generate_token(user, expires_delta=None):
+    """Issue an access token carrying the user's role and token version as claims."""
+    return create_access_token(
+        identity=user.id,
+        additional_claims={"role": user.role, "ver": user.token_version or 0},
+        expires_delta=expires_delta,
+    )
+
+
+def _reset_serializer():
+    return URLSafeTimedSerializer(current_app.config["SECRET_KEY"] or current_app.config["JWT_SECRET_KEY"], salt="password-reset")
 
 
-def generate_token(user_id):
-    return create_access_token(identity=user_id)
+def generate_reset_token(user):
+    """Sign a password reset token bound to the user's token version, so it stops working once the password changes."""
+    return _reset_serializer().dumps({"id": user.id, "ver": user.token_version or 0})
 
 
-def decoded_token(token):
+def load_reset_token(token):
+    """
+    Verify a password reset token.
+
+    Returns:
+        tuple: The user ID and the token version the token was issued for.
+    """
     try:
-        decoded = decode_token(token)
-        return decoded['identity']
-    except Exception as e:
+        data = _reset_serializer().loads(token, max_age=current_app.config.get("RESET_TOKEN_MAX_AGE", 3600))
+    except BadSignature as e:
 # sourcery skip: raise-specific-error
-        raise Exception(f"Invalid token: {str(e)}") from e
+        raise Exception("Invalid or expired reset token") from e
+    return data["id"], data["ver"]
+
+
+def current_role():
+    """Return the role claim of the JWT in the current request."""
+    return get_jwt().get("role")
+
+
+def require_role(*roles):
+    """
+    Restrict a view to JWTs whose role claim is one of ``roles``.
+
+    Authorization is decided from the token claims alone, without loading the
+    user. Revoked tokens are already rejected by the blocklist check that
+    ``verify_jwt_in_request`` runs.
+
+    Args:
+        *roles (str): The roles allowed to call the view.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            verify_jwt_in_request()
+            if current_role() not in roles:
+                return jsonify({"error": "Unauthorized"}), 403
+            return fn(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,143 @@
+import operator
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy.orm import aliased
+from models.archive import ArchivedTask
+from models.task import Task
+from models.user import User
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class RowSchema:
+    """
+    The fields of a JSON object and the columns they are read from, compiled once.
+
+    ``select()`` narrows a query to exactly these columns, so it returns plain
+    ``Row`` tuples instead of ORM instances, and ``dump_all()`` zips each row
+    with the field names. ``dump_object()`` builds the same object from an
+    instance that is already loaded.
+
+    Args:
+        fields (dict): Field name to column, in output order.
+        joins (tuple): ``(target, onclause)`` pairs outer-joined by ``select()``
+            for columns of other tables.
+    """
+
+    def __init__(self, fields, joins=()):
+        self.keys = tuple(fields)
+        self.columns = tuple(fields.values())
+        self.joins = joins
+        self._attributes = operator.attrgetter(*(column.key for column in self.columns))
+
+    def select(self, query, *key_columns):
+        """
+        Make ``query`` return the schema's columns.
+
+        Key columns the schema does not output, such as a sort key needed by
+        keyset pagination, are selected after them and ignored by ``dump()``.
+        """
+        extra = [column for column in key_columns if not any(column is own for own in self.columns)]
+        query = query.with_entities(*self.columns, *extra)
+        for target, onclause in self.joins:
+            query = query.outerjoin(target, onclause)
+        return query
+
+    def dump(self, row):
+        return dict(zip(self.keys, row))
+
+    def dump_all(self, rows):
+        keys = self.keys
+        return [dict(zip(keys, row)) for row in rows]
+
+    def dump_object(self, obj):
+        return dict(zip(self.keys, self._attributes(obj)))
+
+
+_assignee = aliased(User, name="assignee")
+
+TASK = RowSchema(
+    {
+        "id": Task.id,
+        "title": Task.title,
+        "status": Task.status,
+        "priority": Task.priority,
+        "assigned_to": _assignee.username,
+        "description": Task.description,
+        "due_date": Task.due_date,
+        "project_id": Task.project_id,
+    },
+    joins=((_assignee, _assignee.id == Task.assigned_to),),
+)
+
+ARCHIVED_TASK = RowSchema(
+    {
+        "id": ArchivedTask.task_id,
+        "title": ArchivedTask.title,
+        "status": ArchivedTask.status,
+        "priority": ArchivedTask.priority,
+        "assigned_to": _assignee.username,
+        "deleted_by": ArchivedTask.deleted_by,
+        "description": ArchivedTask.description,
+        "due_date": ArchivedTask.due_date,
+        "project_id": ArchivedTask.project_id,
+    },
+    joins=((_assignee, _assignee.id == ArchivedTask.assigned_to),),
+)
+
+_PROFILE_FIELDS = {
+    "username": User.username,
+    "email": User.email,
+    "role": User.role,
+    "phone": User.phone,
+    "location": User.location,
+    "gender": User.gender,
+    "primary_email": User.primary_email,
+    "verified": User.verified,
+}
+PROFILE = RowSchema(_PROFILE_FIELDS)
+USER = RowSchema({"id": User.id, **_PROFILE_FIELDS})
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that encodes and decodes with orjson.
+
+    The output decodes to the same values as with ``DefaultJSONProvider``:
+    dates, decimals and other types orjson leaves to ``default`` are converted
+    the same way, keys are sorted unless ``sort_keys`` is turned off, and
+    responses are indented in debug mode. Non-ASCII text is written as UTF-8
+    instead of ``\\u`` escapes. Calls with extra ``json.dumps`` arguments fall
+    back to the default provider.
+    """
+
+    def _options(self):
+        options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if self.compact is False or (self.compact is None and self._app.debug):
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._options()).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self._options() | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def init_json(app):
+    """Use orjson for ``jsonify`` and ``request.get_json`` when it is installed."""
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
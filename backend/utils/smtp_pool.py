@@ -0,0 +1,141 @@
+import logging
+import os
+import smtplib
+import threading
+import time
+from flask_mail import Connection
+
+logger = logging.getLogger(__name__)
+
+
+class PooledConnection(Connection):
+    """A ``flask_mail.Connection`` that stays open between messages."""
+
+    def __init__(self, mail):
+        super().__init__(mail)
+        self.host = None if mail.suppress else self.configure_host()
+        self.last_used = time.monotonic()
+
+    def is_alive(self):
+        if self.host is None:
+            return True
+        try:
+            return self.host.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def close(self):
+        if self.host is None:
+            return
+        try:
+            self.host.quit()
+        except (smtplib.SMTPException, OSError):
+            self.host.close()
+        self.host = None
+
+
+class SMTPConnectionPool:
+    """
+    Pool of long-lived SMTP connections.
+
+    Each ``mail.send()`` in Flask-Mail opens a new connection, which means a
+    new TCP and TLS handshake and login for every message. The pool keeps up
+    to ``MAIL_POOL_SIZE`` authenticated connections open. A connection that has
+    been idle longer than ``MAIL_KEEPALIVE_INTERVAL`` seconds is checked with a
+    NOOP before reuse, and a new one is opened if the server dropped it.
+
+    Configuration:
+        MAIL_POOL_SIZE: Maximum number of idle connections kept open.
+        MAIL_KEEPALIVE_INTERVAL: Idle seconds after which a connection is checked before reuse.
+    """
+
+    def __init__(self):
+        self.app = None
+        self._idle = []
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def init_app(self, app):
+        self.app = app
+        app.extensions["smtp_pool"] = self
+
+    @property
+    def mail(self):
+        return self.app.extensions["mail"]
+
+    def _checkout(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._idle = []
+            conn = self._idle.pop() if self._idle else None
+
+        if conn is not None:
+            keepalive = self.app.config.get("MAIL_KEEPALIVE_INTERVAL", 60)
+            if time.monotonic() - conn.last_used < keepalive or conn.is_alive():
+                return conn
+            conn.close()
+        return PooledConnection(self.mail)
+
+    def _checkin(self, conn):
+        conn.last_used = time.monotonic()
+        with self._lock:
+            if len(self._idle) < self.app.config.get("MAIL_POOL_SIZE", 2):
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def _discard(self, conn, error):
+        logger.info("SMTP connection lost: %s", error)
+        if conn is not None:
+            conn.close()
+        return None
+
+    def send_many(self, messages):
+        """
+        Send several messages over a single pooled connection.
+
+        A message that fails because the server dropped the connection is
+        retried once on a fresh connection. Any other failure, including an
+        error reply from the server, is recorded and does not stop the rest of
+        the batch.
+
+        Args:
+            messages (list[flask_mail.Message]): The messages to send.
+
+        Returns:
+            list: One entry per message, None when it was sent or the exception raised otherwise.
+        """
+        results = []
+        conn = None
+        for msg in messages:
+            for attempt in (1, 2):
+                try:
+                    if conn is None:
+                        conn = self._checkout()
+                    conn.send(msg)
+                    results.append(None)
+                    break
+                except smtplib.SMTPServerDisconnected as e:
+                    conn = self._discard(conn, e)
+                    if attempt == 2:
+                        results.append(e)
+                except smtplib.SMTPException as e:
+                    # the server answered; retrying right away would deliver a
+                    # message it may have accepted or send one it refused
+                    results.append(e)
+                    break
+                except OSError as e:
+                    conn = self._discard(conn, e)
+                    if attempt == 2:
+                        results.append(e)
+                except Exception as e:
+                    results.append(e)
+                    break
+
+        if conn is not None:
+            self._checkin(conn)
+        return results
+
+
+smtp_pool = SMTPConnectionPool()
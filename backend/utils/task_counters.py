@@ -0,0 +1,170 @@
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import case, event, func, insert, inspect, literal, select
+from models import db
+from models.counter import TaskCounter
+from models.task import Task
+
+SCOPES = (("user", Task.assigned_to), ("project", Task.project_id))
+COUNTED_ATTRIBUTES = ("assigned_to", "project_id", "status")
+
+
+def add_task(deltas, assigned_to, project_id, status, sign=1):
+    """
+    Record that a task was added (``sign=1``) to or removed (``sign=-1``) from its scopes.
+
+    Args:
+        deltas (dict): Accumulated ``(scope, scope_id) -> [total, completed, pending]`` changes.
+        assigned_to (int, optional): The assignee of the task.
+        project_id (int, optional): The project of the task.
+        status (str): The status of the task.
+        sign (int): 1 when the task enters the scopes, -1 when it leaves them.
+    """
+    completed = sign if status == "Completed" else 0
+    pending = sign if status == "Pending" else 0
+    for scope, scope_id in (("user", assigned_to), ("project", project_id)):
+        if scope_id is None:
+            continue
+        counts = deltas.setdefault((scope, scope_id), [0, 0, 0])
+        counts[0] += sign
+        counts[1] += completed
+        counts[2] += pending
+
+
+def move_task(deltas, old, new):
+    """Record a task whose ``(assigned_to, project_id, status)`` changed from ``old`` to ``new``."""
+    if old != new:
+        add_task(deltas, *old, sign=-1)
+        add_task(deltas, *new)
+
+
+def apply_deltas(deltas, connection=None):
+    """
+    Add the accumulated changes to the counters in the current transaction.
+
+    Every counter is changed with ``total = total + :delta`` so concurrent
+    writers never overwrite each other. On PostgreSQL and SQLite all the
+    counters are upserted with a single executemany statement.
+    """
+    rows = [
+        {"scope": scope, "scope_id": scope_id, "total": total, "completed": completed, "pending": pending}
+        for (scope, scope_id), (total, completed, pending) in sorted(deltas.items())
+        if total or completed or pending
+    ]
+    if not rows:
+        return
+
+    connection = connection or db.session.connection()
+    table = TaskCounter.__table__
+    counts = ("total", "completed", "pending")
+
+    if connection.dialect.name in ("postgresql", "sqlite"):
+        if connection.dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as upsert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as upsert
+        statement = upsert(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=["scope", "scope_id"],
+            set_={name: table.c[name] + statement.excluded[name] for name in counts},
+        )
+        connection.execute(statement, rows)
+        return
+
+    for row in rows:
+        result = connection.execute(
+            table.update()
+            .where(table.c.scope == row["scope"], table.c.scope_id == row["scope_id"])
+            .values({name: table.c[name] + row[name] for name in counts})
+        )
+        if result.rowcount == 0:
+            connection.execute(table.insert(), row)
+
+
+def _counted_state(task, committed):
+    state = inspect(task)
+    values = []
+    for name in COUNTED_ATTRIBUTES:
+        history = state.attrs[name].history
+        if committed and history.deleted:
+            values.append(history.deleted[0])
+        else:
+            values.append(getattr(task, name))
+    return tuple(values)
+
+
+def _after_flush(session, flush_context):
+    deltas = {}
+    for task in session.new:
+        if isinstance(task, Task):
+            add_task(deltas, *_counted_state(task, committed=False))
+    for task in session.deleted:
+        if isinstance(task, Task):
+            add_task(deltas, *_counted_state(task, committed=True), sign=-1)
+    for task in session.dirty:
+        if isinstance(task, Task):
+            move_task(deltas, _counted_state(task, committed=True), _counted_state(task, committed=False))
+    apply_deltas(deltas, session.connection())
+
+
+def _load_previous_value(target, value, oldvalue, initiator):
+    pass
+
+
+# active_history makes SQLAlchemy load the old value before an assignment, so
+# the flush listener can always tell which counters a changed task is leaving.
+for _name in COUNTED_ATTRIBUTES:
+    event.listen(getattr(Task, _name), "set", _load_previous_value, active_history=True)
+
+
+def rebuild():
+    """Recompute every counter from the task table in one transaction."""
+    if db.session.connection().dialect.name == "postgresql":
+        db.session.execute(db.text("LOCK TABLE task IN SHARE MODE"))
+
+    db.session.query(TaskCounter).delete()
+    for scope, column in SCOPES:
+        db.session.execute(
+            insert(TaskCounter).from_select(
+                ["scope", "scope_id", "total", "completed", "pending"],
+                select(
+                    literal(scope),
+                    column,
+                    func.count(),
+                    func.sum(case((Task.status == "Completed", 1), else_=0)),
+                    func.sum(case((Task.status == "Pending", 1), else_=0)),
+                )
+                .where(column.isnot(None))
+                .group_by(column),
+            )
+        )
+    db.session.commit()
+
+
+@click.command("rebuild-task-counters")
+@with_appcontext
+def rebuild_task_counters_command():
+    """Rebuild the task_counter table from the task table."""
+    rebuild()
+    click.echo("Task counters rebuilt.")
+
+
+class TaskCounters:
+    """
+    Keeps ``task_counter`` in step with the task table.
+
+    ORM writes to ``Task`` (add, attribute change, delete) are picked up by an
+    ``after_flush`` listener and applied in the same transaction. Bulk
+    statements bypass the ORM, so the bulk endpoints call ``add_task`` /
+    ``move_task`` and ``apply_deltas`` themselves. ``flask rebuild-task-counters``
+    recomputes everything from scratch if the counters ever drift.
+    """
+
+    def init_app(self, app):
+        app.extensions["task_counters"] = self
+        app.cli.add_command(rebuild_task_counters_command)
+        if not event.contains(db.session, "after_flush", _after_flush):
+            event.listen(db.session, "after_flush", _after_flush)
+
+
+task_counters = TaskCounters()
@@ -0,0 +1,96 @@
+from datetime import date
+from flask import abort, jsonify, make_response, request
+from models.task import Task
+
+# filters taking one value or a comma separated list of values
+LIST_FILTERS = {
+    "status": Task.status,
+    "priority": Task.priority,
+    "project_id": Task.project_id,
+    "assigned_to": Task.assigned_to,
+}
+INT_FILTERS = {"project_id", "assigned_to"}
+MAX_FILTER_VALUES = 20
+SORT_KEYS = {
+    "id": (Task.id,),
+    "due_date": (Task.due_date, Task.id),
+}
+
+
+def _bad_request(message):
+    abort(make_response(jsonify({"error": message}), 400))
+
+
+def _parse_values(name, raw):
+    values = [value.strip() for value in raw.split(",") if value.strip()]
+    if not values or len(values) > MAX_FILTER_VALUES:
+        _bad_request(f"{name} takes 1 to {MAX_FILTER_VALUES} comma separated values")
+    if name not in INT_FILTERS:
+        return values
+    parsed = []
+    for value in values:
+        if value == "none":
+            parsed.append(None)
+            continue
+        try:
+            parsed.append(int(value))
+        except ValueError:
+            _bad_request(f"{name} must be an integer or 'none'")
+    return parsed
+
+
+def _parse_date(name):
+    try:
+        return date.fromisoformat(request.args[name])
+    except ValueError:
+        _bad_request(f"{name} must be a date like 2025-01-31")
+
+
+def task_list_params():
+    """
+    Parse the filter and sort arguments of the task list endpoints.
+
+    Grammar, every part optional:
+        status, priority, project_id, assigned_to: one value or a comma
+            separated list; ``none`` matches unassigned tasks or tasks without a project.
+        due_after, due_before: inclusive bounds on ``due_date`` (YYYY-MM-DD).
+        sort: ``id`` (creation order) or ``due_date``, prefixed with ``-`` for
+            descending order; ties are broken by id.
+
+    Every combination can be answered from an index: the equality filters
+    lead ``ix_task_assigned_to_status``, ``ix_task_assigned_to_due_date``,
+    ``ix_task_project_id_due_date`` or ``ix_task_status_due_date``, and any
+    other combination walks the primary key or ``ix_task_due_date`` in sort
+    order and stops once a page is filled.
+
+    Invalid arguments abort with 400.
+
+    Returns:
+        tuple: The filter criteria, the sort key columns and whether the sort is descending.
+    """
+    criteria = []
+    for name, column in LIST_FILTERS.items():
+        if name not in request.args:
+            continue
+        values = _parse_values(name, request.args[name])
+        present = [value for value in values if value is not None]
+        condition = column.in_(present) if len(present) > 1 else column == present[0] if present else None
+        if None in values:
+            condition = column.is_(None) if condition is None else condition | column.is_(None)
+        criteria.append(condition)
+
+    due_after = _parse_date("due_after") if "due_after" in request.args else None
+    due_before = _parse_date("due_before") if "due_before" in request.args else None
+    if due_after and due_before and due_after > due_before:
+        _bad_request("due_after must not be later than due_before")
+    if due_after:
+        criteria.append(Task.due_date >= due_after)
+    if due_before:
+        criteria.append(Task.due_date <= due_before)
+
+    sort = request.args.get("sort", "id")
+    descending = sort.startswith("-")
+    key_columns = SORT_KEYS.get(sort.lstrip("-"))
+    if key_columns is None:
+        _bad_request(f"sort must be one of {', '.join(SORT_KEYS)}, optionally prefixed with '-'")
+    return criteria, key_columns, descending
@@ -0,0 +1,132 @@
+from datetime import date, datetime, timedelta
+from flask import abort, current_app, jsonify, make_response, request
+from sqlalchemy import func
+from utils.identity import TTLCache
+
+INTERVALS = {"day": timedelta(days=1), "week": timedelta(weeks=1)}
+DEFAULT_SPAN = {"day": 30, "week": 12}
+MAX_BUCKETS = 366
+
+
+class BucketCache(TTLCache):
+    """Per-process cache of closed time buckets, sized and timed by the ``ANALYTICS_CACHE_*`` settings."""
+
+    def init_app(self, app):
+        self.maxsize = app.config.get("ANALYTICS_CACHE_SIZE", self.maxsize)
+        self.ttl = app.config.get("ANALYTICS_CACHE_TTL", self.ttl)
+
+
+bucket_cache = BucketCache()
+
+
+def _bad_request(message):
+    abort(make_response(jsonify({"error": message}), 400))
+
+
+def align(day, interval):
+    """Return the first day of the bucket containing ``day`` (weeks start on Monday)."""
+    return day - timedelta(days=day.weekday()) if interval == "week" else day
+
+
+def parse_range():
+    """
+    Read ``interval``, ``start`` and ``end`` from the query string.
+
+    Returns:
+        tuple: The interval name and the list of bucket start dates, oldest first.
+    """
+    interval = request.args.get("interval", "day")
+    if interval not in INTERVALS:
+        _bad_request(f"Invalid interval, expected one of: {', '.join(INTERVALS)}")
+
+    try:
+        end = date.fromisoformat(request.args["end"]) if "end" in request.args else datetime.utcnow().date()
+        start = (
+            date.fromisoformat(request.args["start"]) if "start" in request.args
+            else end - INTERVALS[interval] * (DEFAULT_SPAN[interval] - 1)
+        )
+    except ValueError:
+        _bad_request("Invalid date, expected YYYY-MM-DD")
+
+    buckets = []
+    bucket = align(start, interval)
+    while bucket <= end:
+        buckets.append(bucket)
+        if len(buckets) > MAX_BUCKETS:
+            _bad_request(f"Range too large, at most {MAX_BUCKETS} buckets are allowed")
+        bucket += INTERVALS[interval]
+    if not buckets:
+        _bad_request("start must not be after end")
+    return interval, buckets
+
+
+def bucket_expression(column, interval, dialect):
+    """SQL expression truncating a timestamp column to the start of its bucket."""
+    if dialect == "sqlite":
+        if interval == "week":
+            return func.date(column, "weekday 0", "-6 days")
+        return func.date(column)
+    return func.date_trunc(interval, column)
+
+
+def seconds_between(start, end, dialect):
+    """SQL expression for the number of seconds from ``start`` to ``end``."""
+    if dialect == "sqlite":
+        return (func.julianday(end) - func.julianday(start)) * 86400
+    return func.extract("epoch", end - start)
+
+
+def as_date(value):
+    """Normalize a bucket value returned by the database to a ``date``."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    return value
+
+
+def bucket_start(bucket):
+    return datetime.combine(bucket, datetime.min.time())
+
+
+def cached_buckets(key, interval, buckets, compute):
+    """
+    Return one value per bucket, computing only the buckets that are not cached.
+
+    Buckets that ended more than ``ANALYTICS_BUCKET_GRACE`` seconds ago can no
+    longer receive history rows, so their values are cached and never
+    recomputed. ``compute(first)`` is called once with the oldest bucket that
+    is missing from the cache and must return a value for every requested
+    bucket from there on.
+
+    Args:
+        key (tuple): Identifies the metric and its filters.
+        interval (str): "day" or "week".
+        buckets (list[date]): The requested bucket start dates, oldest first.
+        compute (callable): Computes ``{bucket: value}`` starting at a given bucket.
+
+    Returns:
+        dict: ``{bucket: value}`` for every requested bucket.
+    """
+    values = {}
+    missing = []
+    for bucket in buckets:
+        value = bucket_cache.get((key, interval, bucket))
+        if value is None:
+            missing.append(bucket)
+        else:
+            values[bucket] = value
+
+    if not missing:
+        return values
+
+    grace = timedelta(seconds=current_app.config.get("ANALYTICS_BUCKET_GRACE", 300))
+    closed_before = datetime.utcnow() - grace
+    computed = compute(missing[0])
+    for bucket in buckets:
+        if bucket < missing[0]:
+            continue
+        values[bucket] = computed[bucket]
+        if bucket_start(bucket) + INTERVALS[interval] <= closed_before:
+            bucket_cache.set((key, interval, bucket), computed[bucket])
+    return values
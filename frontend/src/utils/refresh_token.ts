@@ -13,6 +13,7 @@ const refreshAccessToken = async () => {
 
     const response = await API.post("/auth/refresh", { refresh_token: refreshToken });
     const newAccessToken = response.data.access_token;
+    const newRefreshToken = response.data.refresh_token;
 
     Cookies.set("access_token", newAccessToken, {
       expires: expireDate(newAccessToken) || 1,
@@ -21,6 +22,13 @@ const refreshAccessToken = async () => {
       secure: process.env.NODE_ENV === "production",
     });
 
+    Cookies.set("refresh_token", newRefreshToken, {
+      expires: expireDate(newRefreshToken) || 7,
+      path: "/",
+      sameSite: "Lax",
+      secure: process.env.NODE_ENV === "production",
+    });
+
     localStorage.setItem("token", newAccessToken);
     return newAccessToken;
   } catch (error) {